@@ -1,109 +1,282 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, session, jsonify
+from flask import Flask, abort, current_app, render_template, request, redirect, url_for, session, jsonify
 import os
-from datetime import datetime
 import json
 
-app = Flask(__name__)
-app.secret_key = 'selenium_testing_demo_professional_2025'
+from throttle import LoginThrottle, client_ip
+from user_store import create_user_store
+from contact_store import ContactMessageStore
+from validation import LOGIN_FORM
+from health import HealthMonitor
+from metrics import Metrics
+from sessions import create_session_interface
+from assets import Assets
+from compression import Compression
+from render_cache import RenderCache
+from spam import ContactGuard
+from errors import ErrorPages
+from flashes import FlashMessages, flash_errors, flash_message
+from warmup import TemplatePrecompiler, warm_up
+from view_helpers import (contact_client, contact_submission, dashboard_context, health_payload, inbox_links,
+                          inbox_query, is_admin, login_failed, login_retry_after, start_session, timestamp)
+from werkzeug.local import LocalProxy
 
-# Enhanced user database with roles and metadata
-users_db = {
+# Demo accounts seeded into the user store on startup
+SEED_USERS = {
     'admin': {
         'password': 'password123',
         'role': 'Administrator',
         'name': 'System Admin',
-        'email': 'admin@testingdemo.com',
-        'last_login': None
+        'email': 'admin@testingdemo.com'
     },
     'student': {
         'password': 'student123',
         'role': 'Student',
         'name': 'Test Student',
-        'email': 'student@university.edu',
-        'last_login': None
+        'email': 'student@university.edu'
     },
     'test_user': {
         'password': 'test123',
         'role': 'Test User',
         'name': 'Demo User',
-        'email': 'demo@testing.com',
-        'last_login': None
+        'email': 'demo@testing.com'
     },
     'qa_tester': {
         'password': 'qa123',
         'role': 'QA Tester',
         'name': 'Quality Assurance',
-        'email': 'qa@company.com',
-        'last_login': None
+        'email': 'qa@company.com'
     }
 }
 
-# Store contact messages
-contact_messages = []
+# Defaults for create_app(); every key can be overridden by the config argument
+DEFAULT_CONFIG = {
+    'SECRET_KEY': 'selenium_testing_demo_professional_2025',
+    # Server-side sessions: cookie (Flask default), memory or sqlite
+    'SESSION_BACKEND': 'cookie',
+    'SESSION_DB_PATH': 'sessions.db',
+    # User store: in-memory unless a SQLite path is given
+    'USER_DB_PATH': None,
+    'SEED_USERS': SEED_USERS,
+    # Append-only contact message log
+    'CONTACT_DB_PATH': 'contact_messages.db',
+    'CONTACT_MAX_MESSAGES': 100000,
+    # Contact spam control: token bucket per client (rate 0 disables it), duplicate window in seconds
+    'CONTACT_RATE_PER_MINUTE': 6,
+    'CONTACT_BURST': 5,
+    'CONTACT_DEDUP_WINDOW': 3600.0,
+    'CONTACT_DEDUP_MAX_ENTRIES': 100000,
+    # Failed-login throttling (free attempts before backoff)
+    'LOGIN_USER_FREE_ATTEMPTS': 5,
+    'LOGIN_IP_FREE_ATTEMPTS': 20,
+    # Reverse proxies (load balancers) in front of the app whose X-Forwarded-For is trusted
+    'TRUSTED_PROXIES': 0,
+    'HEALTH_REFRESH_INTERVAL': 1.0,
+    # Production start-up: compile every template at boot (no per-render mtime checks),
+    # optionally through an on-disk bytecode cache, then GET every route once
+    'TEMPLATE_PRECOMPILE': False,
+    'TEMPLATE_CACHE_DIR': None,
+    'WARM_UP': False,
+    # Pre-built instances to inject instead of building stores from the paths above
+    'USER_STORE': None,
+    'CONTACT_STORE': None
+}
+
+def env_flag(value):
+    """Parse a boolean environment variable ('1', 'true', 'yes', 'on')"""
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+# Environment variables read by config_from_env() and their types
+ENV_CONFIG = {
+    'SECRET_KEY': str,
+    'SESSION_BACKEND': str,
+    'SESSION_DB_PATH': str,
+    'USER_DB_PATH': str,
+    'CONTACT_DB_PATH': str,
+    'CONTACT_MAX_MESSAGES': int,
+    'CONTACT_RATE_PER_MINUTE': float,
+    'CONTACT_BURST': int,
+    'CONTACT_DEDUP_WINDOW': float,
+    'CONTACT_DEDUP_MAX_ENTRIES': int,
+    'LOGIN_USER_FREE_ATTEMPTS': int,
+    'LOGIN_IP_FREE_ATTEMPTS': int,
+    'TRUSTED_PROXIES': int,
+    'HEALTH_REFRESH_INTERVAL': float,
+    'TEMPLATE_PRECOMPILE': env_flag,
+    'TEMPLATE_CACHE_DIR': str,
+    'WARM_UP': env_flag
+}
+
+def config_from_env(environ=None):
+    """Config overrides taken from environment variables"""
+    environ = os.environ if environ is None else environ
+    return {key: cast(environ[key]) for key, cast in ENV_CONFIG.items() if key in environ}
+
+def _service(name):
+    """Proxy to a per-app service so views work with whichever app is active"""
+    return LocalProxy(lambda: current_app.extensions[name])
+
+users_db = _service('users_db')
+contact_messages = _service('contact_messages')
+contact_guard = _service('contact_guard')
+user_throttle = _service('user_throttle')
+ip_throttle = _service('ip_throttle')
+render_cache = _service('render_cache')
+health_monitor = _service('health_monitor')
+metrics = _service('metrics')
+compression = _service('compression')
+
+def create_app(config=None):
+    """Application factory: build a configured app with its own stores"""
+    app = Flask(__name__)
+    app.config.update(DEFAULT_CONFIG)
+    if config:
+        app.config.update(config)
+    app.secret_key = app.config['SECRET_KEY']
+
+    session_interface = create_session_interface(
+        app.config['SESSION_BACKEND'], path=app.config['SESSION_DB_PATH']
+    )
+    if session_interface is not None:
+        app.session_interface = session_interface
+
+    # Enhanced user database with roles and metadata
+    user_store = app.config['USER_STORE']
+    if user_store is None:
+        user_store = create_user_store(app.config['USER_DB_PATH'])
+    user_store.seed(app.config['SEED_USERS'])
+
+    # Store contact messages (append-only SQLite log with batched writes)
+    contact_store = app.config['CONTACT_STORE']
+    if contact_store is None:
+        contact_store = ContactMessageStore(
+            app.config['CONTACT_DB_PATH'], max_messages=app.config['CONTACT_MAX_MESSAGES']
+        )
+
+    def build_health_payload():
+        return health_payload(user_store.online_count())
+
+    # Per-endpoint latency histograms, exposed on /metrics
+    request_metrics = Metrics()
+    request_metrics.init_app(app)
+
+    # Pre-serialized health snapshot refreshed off the request path
+    monitor = HealthMonitor(build_health_payload, interval=app.config['HEALTH_REFRESH_INTERVAL'])
+    monitor.init_app(app)
+    request_metrics.add_observer(monitor.record_request)
+
+    # Per-client rate limit and duplicate filter in front of the contact store
+    guard = ContactGuard(app)
+    request_metrics.add_counter('contact_submissions_total',
+                                'Contact form submissions by outcome', guard.stats)
+
+    app.extensions.update({
+        'users_db': user_store,
+        'contact_messages': contact_store,
+        'contact_guard': guard,
+        # Failed-login throttling (per username and per client IP)
+        'user_throttle': LoginThrottle(free_attempts=app.config['LOGIN_USER_FREE_ATTEMPTS']),
+        'ip_throttle': LoginThrottle(free_attempts=app.config['LOGIN_IP_FREE_ATTEMPTS']),
+        # Fingerprinted static assets (run build_assets.py to produce static/dist)
+        'assets': Assets(app),
+        # Strong ETags / 304s and gzip or brotli for rendered responses
+        'compression': Compression(app),
+        # Rendered HTML cache for pages that only vary by nav/login state
+        'render_cache': RenderCache(app),
+        # Flash messages stored as short codes, expanded when the page renders
+        'flash_messages': FlashMessages(app),
+        'metrics': request_metrics,
+        'health_monitor': monitor
+    })
+
+    register_routes(app)
+    # Before anything renders, so every template goes through the bytecode cache
+    if app.config['TEMPLATE_PRECOMPILE']:
+        app.extensions['template_precompiler'] = TemplatePrecompiler(
+            app, cache_dir=app.config['TEMPLATE_CACHE_DIR']
+        )
+    # Error pages are prerendered once the routes they link to exist
+    app.extensions['error_pages'] = ErrorPages(app)
+
+    if app.config['WARM_UP']:
+        warm_up(app)
+        # Warm-up traffic should not show up in /metrics or the health report
+        request_metrics.reset()
+        monitor.stats.reset()
+    return app
+
+_default_app = None
+
+def __getattr__(name):
+    """Build the module-level `app` lazily so importing create_app has no side effects"""
+    global _default_app
+    if name == 'app':
+        if _default_app is None:
+            _default_app = create_app(config_from_env())
+        return _default_app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-@app.route('/')
 def index():
     """Enhanced home page with better UX"""
-    return render_template('index.html')
+    return render_cache.render('index.html')
 
-@app.route('/login', methods=['GET', 'POST'])
 def login():
     """Enhanced login with better validation and user experience"""
     if request.method == 'POST':
-        username = request.form.get('username', '').strip()
-        password = request.form.get('password', '').strip()
+        data, errors = LOGIN_FORM.validate(request.form)
+        username = data['username']
+        password = data['password']
         
         # Enhanced validation
-        if not username or not password:
-            flash('Please enter both username and password.', 'error')
+        if errors:
+            flash_errors(errors)
             return render_template('login.html')
         
+        # Reject throttled attempts immediately instead of sleeping
+        address = client_ip(request, current_app.config['TRUSTED_PROXIES'])
+        retry_after = login_retry_after(username, address, user_throttle, ip_throttle)
+        if retry_after:
+            flash_message('login_throttled', retry_after)
+            return render_template('login.html'), 429, {'Retry-After': str(retry_after)}
+        
         # Check credentials
-        if username in users_db and users_db[username]['password'] == password:
-            # Update last login
-            users_db[username]['last_login'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        user = users_db.verify(username, password)
+        if user:
+            user_throttle.reset(username)
             
-            # Set session
-            session['username'] = username
-            session['user_role'] = users_db[username]['role']
-            session['user_name'] = users_db[username]['name']
-            session['login_time'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            # Update last login
+            users_db.record_login(username, timestamp())
             
-            flash(f'Welcome back, {users_db[username]["name"]}! Login successful.', 'success')
+            start_session(session, username, user)
+            flash_message('login_ok', user['name'])
             return redirect(url_for('dashboard'))
         else:
-            flash('Invalid username or password. Please check your credentials and try again.', 'error')
-            # Add small delay for security
-            import time
-            time.sleep(1)
+            # Back off repeated failures without blocking the worker
+            backoff = login_failed(username, address, user_throttle, ip_throttle)
+            if backoff:
+                flash_message('login_throttled', backoff)
+                return render_template('login.html'), 429, {'Retry-After': str(backoff)}
+            flash_message('login_failed')
     
     return render_template('login.html')
 
-@app.route('/dashboard')
 def dashboard():
     """Enhanced dashboard with user analytics"""
     if 'username' not in session:
-        flash('Please login to access the dashboard.', 'warning')
+        flash_message('dashboard_login')
         return redirect(url_for('login'))
     
     username = session['username']
-    user_data = users_db[username]
-    
-    # Dashboard analytics
-    dashboard_data = {
-        'total_users': len(users_db),
-        'user_role': session.get('user_role', 'User'),
-        'login_time': session.get('login_time', 'Unknown'),
-        'last_login': user_data.get('last_login', 'First login'),
-        'session_duration': 'Active'
-    }
+    user_data = users_db.get(username)
+    if user_data is None:
+        session.clear()
+        flash_message('dashboard_login')
+        return redirect(url_for('login'))
     
     return render_template('dashboard.html', 
                          username=session['username'],
                          user_data=user_data,
-                         dashboard_data=dashboard_data)
+                         dashboard_data=dashboard_context(session, user_data, len(users_db)))
 
-@app.route('/logout')
 def logout():
     """Enhanced logout with session cleanup"""
     username = session.get('username', 'User')
@@ -112,101 +285,116 @@ def logout():
     # Clear session
     session.clear()
     
-    flash(f'Goodbye {user_name}! You have been securely logged out. Thank you for using our platform.', 'info')
+    flash_message('logout', user_name)
     return redirect(url_for('index'))
 
-@app.route('/contact', methods=['GET', 'POST'])
 def contact():
     """Enhanced contact form with better validation"""
     if request.method == 'POST':
-        name = request.form.get('name', '').strip()
-        email = request.form.get('email', '').strip()
-        subject = request.form.get('subject', '').strip()
-        message = request.form.get('message', '').strip()
-        
-        # Enhanced validation
-        errors = []
+        # Spend a rate-limit token before any parsing or storage work
+        address = client_ip(request, current_app.config['TRUSTED_PROXIES'])
+        retry_after = contact_guard.retry_after(contact_client(session, address))
+        if retry_after:
+            flash_message('contact_rate_limited', retry_after)
+            return render_template('contact.html'), 429, {'Retry-After': str(retry_after)}
         
-        if not name or len(name) < 2:
-            errors.append('Name must be at least 2 characters long.')
-        
-        if not email:
-            errors.append('Email address is required.')
-        elif '@' not in email or '.' not in email.split('@')[-1]:
-            errors.append('Please enter a valid email address.')
-        elif len(email.split('@')[0]) < 1 or len(email.split('@')[1]) < 4:
-            errors.append('Please enter a valid email address.')
-        
-        if not subject or len(subject) < 5:
-            errors.append('Subject must be at least 5 characters long.')
-        
-        if not message or len(message) < 10:
-            errors.append('Message must be at least 10 characters long.')
-        
-        if errors:
-            for error in errors:
-                flash(error, 'error')
+        # Validation, then the duplicate check (view_helpers.contact_submission)
+        outcome, detail = contact_submission(request.form, contact_guard, session)
+        if outcome == 'invalid':
+            flash_errors(detail)
+        elif outcome == 'duplicate':
+            # A resubmitted or replayed message is acknowledged but not stored again
+            flash_message('contact_duplicate')
+            return redirect(url_for('contact'))
         else:
-            # Save message
-            message_data = {
-                'id': len(contact_messages) + 1,
-                'name': name,
-                'email': email,
-                'subject': subject,
-                'message': message,
-                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'user': session.get('username', 'Anonymous')
-            }
-            contact_messages.append(message_data)
-            
-            flash(f'Thank you {name}! Your message "{subject}" has been sent successfully. We will respond within 24 hours.', 'success')
+            contact_messages.add(detail)
+            flash_message('contact_sent', detail['name'], detail['subject'])
             return redirect(url_for('contact'))
     
     return render_template('contact.html')
 
-@app.route('/about')
 def about():
     """Enhanced about page with more details"""
-    return render_template('about.html')
+    return render_cache.render('about.html')
 
-@app.route('/features')
 def features():
     """New features showcase page"""
-    return render_template('features.html')
+    return render_cache.render('features.html')
 
-@app.route('/api/health')
 def api_health():
-    """API endpoint for testing"""
-    return jsonify({
-        'status': 'healthy',
-        'timestamp': datetime.now().isoformat(),
-        'version': '2.0.0',
-        'users_online': len([u for u in users_db if users_db[u].get('last_login')])
-    })
+    """API endpoint for testing (served from the cached snapshot)"""
+    return health_monitor.response()
+
+def api_health_deep():
+    """Detailed health: process RSS, request rate and latency percentiles"""
+    return health_monitor.deep_response()
+
+def metrics_endpoint():
+    """Prometheus scrape endpoint for request latency histograms"""
+    return metrics.response()
 
-@app.route('/profile')
 def profile():
     """User profile page"""
     if 'username' not in session:
-        flash('Please login to view your profile.', 'warning')
+        flash_message('profile_login')
         return redirect(url_for('login'))
     
     username = session['username']
-    user_data = users_db[username]
+    user_data = users_db.get(username)
+    if user_data is None:
+        session.clear()
+        flash_message('profile_login')
+        return redirect(url_for('login'))
     
     return render_template('profile.html', 
                          username=username, 
                          user_data=user_data)
 
-@app.errorhandler(404)
-def page_not_found(e):
-    """Custom 404 error page"""
-    return render_template('404.html'), 404
+def admin_messages():
+    """Contact message inbox for administrators"""
+    if 'username' not in session:
+        flash_message('admin_login')
+        return redirect(url_for('login'))
+    if not is_admin(session):
+        abort(403)
+
+    filters, page_args = inbox_query(request.args)
+    messages, next_cursor = contact_messages.page(**page_args)
+    newest_url, older_url = inbox_links(filters, next_cursor, url_for)
+    return render_template('admin_messages.html',
+                         messages=messages,
+                         filters=filters,
+                         total=len(contact_messages),
+                         newest_url=newest_url,
+                         older_url=older_url)
+
+def api_admin_messages():
+    """JSON contact inbox: ?q=&user=&since=&until=&before=&limit="""
+    if not is_admin(session):
+        abort(403)
+    _, page_args = inbox_query(request.args)
+    messages, next_cursor = contact_messages.page(**page_args)
+    return jsonify({
+        'messages': messages,
+        'next_cursor': next_cursor,
+        'total': len(contact_messages)
+    })
 
-@app.errorhandler(500)
-def internal_error(e):
-    """Custom 500 error page"""
-    return render_template('500.html'), 500
+def register_routes(app):
+    """Attach every view and error handler to app"""
+    app.add_url_rule('/', 'index', index)
+    app.add_url_rule('/login', 'login', login, methods=['GET', 'POST'])
+    app.add_url_rule('/dashboard', 'dashboard', dashboard)
+    app.add_url_rule('/logout', 'logout', logout)
+    app.add_url_rule('/contact', 'contact', contact, methods=['GET', 'POST'])
+    app.add_url_rule('/about', 'about', about)
+    app.add_url_rule('/features', 'features', features)
+    app.add_url_rule('/api/health', 'api_health', api_health)
+    app.add_url_rule('/api/health/deep', 'api_health_deep', api_health_deep)
+    app.add_url_rule('/metrics', 'metrics_endpoint', metrics_endpoint)
+    app.add_url_rule('/profile', 'profile', profile)
+    app.add_url_rule('/admin/messages', 'admin_messages', admin_messages)
+    app.add_url_rule('/api/admin/messages', 'api_admin_messages', api_admin_messages)
 
 if __name__ == '__main__':
     print("🌐 PROFESSIONAL SELENIUM TESTING DEMO")
@@ -227,6 +415,10 @@ if __name__ == '__main__':
     print("   • API Endpoints")
     print("   • Error Handling")
     print("🧪 Ready for comprehensive Selenium testing!")
+    print("💡 Production: USER_DB_PATH=users.db python serve.py --bind 0.0.0.0:8000 --workers 4")
     print("=" * 50)
     
-    app.run(debug=True, host='127.0.0.1', port=5000)
+    # Same launcher as serve.py, defaulting to the URL the Selenium suite expects and
+    # one worker, since the default stores and throttles live in process memory
+    from serve import main
+    main(default_bind='127.0.0.1:5000', default_workers=1)
@@ -0,0 +1,184 @@
+"""
+Screenshot/artifact pipeline for the Selenium suite.
+
+Screenshots are captured on the test thread (WebDriver is not thread-safe)
+but hashed, optionally re-encoded and written on a background thread into
+a per-run directory under artifacts/. Identical images are stored once:
+the file name carries a content hash, and later captures of the same bytes
+just point at the existing file. Old runs are pruned to a retention budget
+when a new run starts.
+
+Environment:
+
+    ARTIFACT_DIR=path        root directory (default: artifacts)
+    ARTIFACT_FORMAT=webp     re-encode screenshots as WebP (needs Pillow)
+    ARTIFACT_MAX_WIDTH=N     downscale screenshots wider than N pixels (needs Pillow)
+    ARTIFACT_KEEP_RUNS=N     run directories to keep (default 10)
+    ARTIFACT_MAX_MB=N        total size budget across runs (default 200)
+"""
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional; screenshots stay PNG
+    Image = None
+
+RUN_PREFIX = 'run-'
+
+
+def new_run_id():
+    return time.strftime('%Y%m%d-%H%M%S') + f'-{os.getpid()}'
+
+
+def _slug(name):
+    return re.sub(r'[^A-Za-z0-9_.-]+', '_', name).strip('_') or 'artifact'
+
+
+def _tree_size(path):
+    total = 0
+    for folder, _, files in os.walk(path):
+        for filename in files:
+            try:
+                total += os.path.getsize(os.path.join(folder, filename))
+            except OSError:
+                pass
+    return total
+
+
+class ArtifactManager:
+    """Deduplicating, asynchronous writer for test screenshots and other files"""
+
+    def __init__(self, root='artifacts', run_id=None, image_format='png', max_width=None,
+                 keep_runs=10, max_bytes=200 * 1024 * 1024, workers=2):
+        self.root = root
+        self.run_id = run_id or new_run_id()
+        self.run_dir = os.path.join(root, RUN_PREFIX + self.run_id)
+        if image_format == 'webp' or max_width:
+            if Image is None:
+                print("⚠️ Pillow is not installed; screenshots are saved as PNG")
+                image_format, max_width = 'png', None
+        self.image_format = image_format
+        self.max_width = max_width
+        self.keep_runs = keep_runs
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._stored = {}  # content hash -> relative path
+        self._index = []
+        self._pending = []
+        self.saved = 0
+        self.duplicates = 0
+        self.bytes_written = 0
+
+        os.makedirs(self.run_dir, exist_ok=True)
+        self.prune()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='artifacts')
+
+    @classmethod
+    def from_env(cls, run_id=None, environ=None):
+        environ = os.environ if environ is None else environ
+        max_width = environ.get('ARTIFACT_MAX_WIDTH')
+        return cls(
+            root=environ.get('ARTIFACT_DIR', 'artifacts'),
+            run_id=run_id,
+            image_format=environ.get('ARTIFACT_FORMAT', 'png').lower(),
+            max_width=int(max_width) if max_width else None,
+            keep_runs=int(environ.get('ARTIFACT_KEEP_RUNS', '10')),
+            max_bytes=int(float(environ.get('ARTIFACT_MAX_MB', '200')) * 1024 * 1024)
+        )
+
+    def screenshot(self, driver, name, test_id=None):
+        """Capture a screenshot now and store it in the background; returns its path"""
+        png = driver.get_screenshot_as_png()
+        suffix = '.webp' if self.image_format == 'webp' else '.png'
+        return self.add_bytes(png, name, suffix, test_id, encode=self._encode_image)
+
+    def add_bytes(self, data, name, suffix, test_id=None, encode=None):
+        """Store data under name unless identical bytes were already stored this run"""
+        digest = hashlib.blake2b(data, digest_size=8).hexdigest()
+        with self._lock:
+            existing = self._stored.get(digest)
+            if existing is None:
+                existing = self._stored[digest] = f'{_slug(name)}-{digest}{suffix}'
+                is_new = True
+            else:
+                self.duplicates += 1
+                is_new = False
+            self._index.append({'name': name, 'test': test_id, 'file': existing,
+                                'duplicate': not is_new, 'time': time.time()})
+        if is_new:
+            future = self._executor.submit(self._write, existing, data, encode)
+            with self._lock:
+                self._pending.append(future)
+        return os.path.join(self.run_dir, existing)
+
+    def _encode_image(self, png):
+        if Image is None or (self.image_format == 'png' and not self.max_width):
+            return png
+        image = Image.open(io.BytesIO(png))
+        if self.max_width and image.width > self.max_width:
+            height = round(image.height * self.max_width / image.width)
+            image = image.resize((self.max_width, height), Image.LANCZOS)
+        output = io.BytesIO()
+        if self.image_format == 'webp':
+            image.save(output, 'WEBP', quality=80, method=4)
+        else:
+            image.save(output, 'PNG', optimize=True)
+        return output.getvalue()
+
+    def _write(self, filename, data, encode):
+        try:
+            if encode is not None:
+                data = encode(data)
+            path = os.path.join(self.run_dir, filename)
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'wb') as output:
+                output.write(data)
+            os.replace(tmp_path, path)
+            with self._lock:
+                self.saved += 1
+                self.bytes_written += len(data)
+        except Exception as e:
+            print(f"⚠️ Artifact write failed for {filename}: {e}")
+
+    def flush(self):
+        """Block until every queued write has finished"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for future in pending:
+            future.result()
+
+    def close(self, worker_id=None):
+        """Finish writes and record this process's artifacts in an index file"""
+        self.flush()
+        self._executor.shutdown(wait=True)
+        index_name = f'index-{worker_id}.json' if worker_id else 'index.json'
+        with open(os.path.join(self.run_dir, index_name), 'w') as index_file:
+            json.dump(self._index, index_file, indent=2)
+
+    def prune(self):
+        """Delete the oldest run directories beyond keep_runs or the size budget"""
+        try:
+            runs = sorted(entry for entry in os.listdir(self.root) if entry.startswith(RUN_PREFIX))
+        except OSError:
+            return
+        current = RUN_PREFIX + self.run_id
+        older = [run for run in runs if run != current]
+        sizes = {run: _tree_size(os.path.join(self.root, run)) for run in older}
+        total = sum(sizes.values())
+        while older and (len(older) >= self.keep_runs or total > self.max_bytes):
+            oldest = older.pop(0)
+            shutil.rmtree(os.path.join(self.root, oldest), ignore_errors=True)
+            total -= sizes[oldest]
+
+    def summary(self):
+        return (f"📸 Artifacts: {self.saved} saved, {self.duplicates} duplicate(s) skipped, "
+                f"{self.bytes_written / 1024:.0f} KiB in {self.run_dir}")
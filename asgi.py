@@ -0,0 +1,378 @@
+"""
+ASGI variant of the Selenium testing demo.
+
+The same routes, templates, validation rules and config as app.py, served
+by Quart on an event loop. Store calls that can block are awaited through
+async_stores, so one process can hold thousands of concurrent slow clients
+instead of one thread per request. SESSION_BACKEND picks the same session
+storage as in app.py: signed cookies (same scheme, so both variants can
+share a SECRET_KEY) or server-side records, whose lookups run off the loop.
+Stopping the server (after_serving) stops the health monitor, flushes
+pending contact messages and closes the stores.
+
+The views only await and render: request decisions come from view_helpers,
+flashes from flashes, /assets from assets and /metrics from metrics, all
+shared with app.py. test_asgi.py checks that both apps answer every route
+the same way.
+
+Usage:
+
+    python asgi.py --bind 127.0.0.1:8001 --workers 2
+    hypercorn 'asgi:create_asgi_app(config_from_env())' --bind 127.0.0.1:8001
+"""
+import argparse
+import os
+import time
+
+from quart import (Quart, Response, g, jsonify, redirect, render_template, request, send_from_directory, session,
+                   url_for)
+from quart import get_flashed_messages as get_quart_flashed_messages
+from quart.signals import before_render_template, template_rendered
+
+from app import DEFAULT_CONFIG, config_from_env
+from assets import choose_variant, immutable_headers, load_manifest, resolve_asset
+from async_stores import AsyncContactMessageStore, AsyncSessionInterface, AsyncUserStore
+from contact_store import ContactMessageStore
+from errors import ERROR_PAGES, PRERENDER_PATH, error_json, prefers_json
+from flashes import add_flash, add_flash_errors, flashed_messages_reader
+from health import HealthMonitor
+from metrics import Metrics
+from sessions import create_session_interface
+from spam import ContactGuard
+from throttle import LoginThrottle, client_ip
+from user_store import create_user_store
+from validation import LOGIN_FORM
+from view_helpers import (contact_client, contact_submission, dashboard_context, health_payload, inbox_links,
+                          inbox_query, is_admin, login_failed, login_retry_after, start_session, timestamp)
+
+
+def create_asgi_app(config=None):
+    """Application factory for the ASGI (Quart) variant"""
+    app = Quart(__name__)
+    app.config.update(DEFAULT_CONFIG)
+    if config:
+        app.config.update(config)
+    app.secret_key = app.config['SECRET_KEY']
+
+    session_interface = create_session_interface(
+        app.config['SESSION_BACKEND'], path=app.config['SESSION_DB_PATH']
+    )
+    if session_interface is not None:
+        app.session_interface = AsyncSessionInterface(session_interface)
+
+    user_store = app.config['USER_STORE']
+    if user_store is None:
+        user_store = create_user_store(app.config['USER_DB_PATH'])
+    user_store.seed(app.config['SEED_USERS'])
+
+    contact_store = app.config['CONTACT_STORE']
+    if contact_store is None:
+        contact_store = ContactMessageStore(
+            app.config['CONTACT_DB_PATH'], max_messages=app.config['CONTACT_MAX_MESSAGES']
+        )
+
+    users_db = AsyncUserStore(user_store)
+    contact_messages = AsyncContactMessageStore(contact_store)
+    user_throttle = LoginThrottle(free_attempts=app.config['LOGIN_USER_FREE_ATTEMPTS'])
+    ip_throttle = LoginThrottle(free_attempts=app.config['LOGIN_IP_FREE_ATTEMPTS'])
+    # In-memory O(1) checks, safe to run on the event loop
+    contact_guard = ContactGuard(app)
+
+    # Rebuilt on the monitor's own thread, so the store is called directly
+    health_monitor = HealthMonitor(lambda: health_payload(user_store.online_count()),
+                                   interval=app.config['HEALTH_REFRESH_INTERVAL'])
+    # Same histograms and counters as the WSGI app, fed by the hooks below
+    request_metrics = Metrics()
+    request_metrics.add_observer(health_monitor.record_request)
+    request_metrics.add_counter('contact_submissions_total',
+                                'Contact form submissions by outcome', contact_guard.stats)
+
+    dist_folder = os.path.join(app.static_folder, 'dist')
+    manifest = load_manifest(dist_folder)
+    # Compact flash codes in the session, expanded when base.html renders
+    app.jinja_env.globals['get_flashed_messages'] = flashed_messages_reader(session, g, get_quart_flashed_messages)
+
+    error_pages = {}
+
+    @app.before_serving
+    async def start_background_tasks():
+        health_monitor.init_app(app)
+        # Same prerendered error pages as the WSGI app (see errors.py)
+        async with app.test_request_context(PRERENDER_PATH):
+            for status, (template, _, _) in ERROR_PAGES.items():
+                error_pages[status] = (await render_template(template)).encode('utf-8')
+
+    @app.after_serving
+    async def close_stores():
+        """Stop the health monitor, flush pending contact messages, close the pools"""
+        health_monitor.stop()
+        await contact_messages.close()
+        await users_db.close()
+
+    @app.template_global()
+    def asset_url(name, fallback=None):
+        """Resolve a source asset through the build manifest (see assets.py)"""
+        return resolve_asset(manifest, name, fallback, url_for)
+
+    @app.route('/assets/<path:filename>', endpoint='dist_asset')
+    async def dist_asset(filename):
+        """Serve a hashed asset, preferring a pre-compressed variant"""
+        chosen, encoding, mimetype = choose_variant(dist_folder, filename, request.accept_encodings)
+        response = await send_from_directory(dist_folder, chosen, mimetype=mimetype)
+        return immutable_headers(response, encoding)
+
+    @app.before_request
+    async def start_timer():
+        g.request_started = time.perf_counter()
+        g.render_time = 0.0
+
+    async def render_started(sender, template, context, **extra):
+        g.render_started = time.perf_counter()
+
+    async def render_finished(sender, template, context, **extra):
+        started = g.pop('render_started', None)
+        if started is not None:
+            g.render_time = g.get('render_time', 0.0) + time.perf_counter() - started
+
+    before_render_template.connect(render_started, app)
+    template_rendered.connect(render_finished, app)
+
+    @app.after_request
+    async def finish_request(response):
+        started = g.pop('request_started', None)
+        if started is not None:
+            request_metrics.record(request.endpoint, time.perf_counter() - started, g.pop('render_time', 0.0))
+        return response
+
+    @app.route('/')
+    async def index():
+        """Enhanced home page with better UX"""
+        return await render_template('index.html')
+
+    @app.route('/login', methods=['GET', 'POST'])
+    async def login():
+        """Enhanced login with better validation and user experience"""
+        if request.method == 'POST':
+            data, errors = LOGIN_FORM.validate(await request.form)
+            username = data['username']
+            password = data['password']
+
+            if errors:
+                add_flash_errors(session, errors)
+                return await render_template('login.html')
+
+            address = client_ip(request, app.config['TRUSTED_PROXIES'])
+            retry_after = login_retry_after(username, address, user_throttle, ip_throttle)
+            if retry_after:
+                add_flash(session, 'login_throttled', retry_after)
+                return await render_template('login.html'), 429, {'Retry-After': str(retry_after)}
+
+            # Password hashing runs on a worker thread, not the event loop
+            user = await users_db.verify(username, password)
+            if user:
+                user_throttle.reset(username)
+                await users_db.record_login(username, timestamp())
+                start_session(session, username, user)
+                add_flash(session, 'login_ok', user['name'])
+                return redirect(url_for('dashboard'))
+
+            backoff = login_failed(username, address, user_throttle, ip_throttle)
+            if backoff:
+                add_flash(session, 'login_throttled', backoff)
+                return await render_template('login.html'), 429, {'Retry-After': str(backoff)}
+            add_flash(session, 'login_failed')
+
+        return await render_template('login.html')
+
+    @app.route('/dashboard')
+    async def dashboard():
+        """Enhanced dashboard with user analytics"""
+        if 'username' not in session:
+            add_flash(session, 'dashboard_login')
+            return redirect(url_for('login'))
+
+        username = session['username']
+        user_data = await users_db.get(username)
+        if user_data is None:
+            session.clear()
+            add_flash(session, 'dashboard_login')
+            return redirect(url_for('login'))
+
+        return await render_template('dashboard.html',
+                                     username=username,
+                                     user_data=user_data,
+                                     dashboard_data=dashboard_context(session, user_data, await users_db.count()))
+
+    @app.route('/logout')
+    async def logout():
+        """Enhanced logout with session cleanup"""
+        username = session.get('username', 'User')
+        user_name = session.get('user_name', username)
+        session.clear()
+        add_flash(session, 'logout', user_name)
+        return redirect(url_for('index'))
+
+    @app.route('/contact', methods=['GET', 'POST'])
+    async def contact():
+        """Enhanced contact form with better validation"""
+        if request.method == 'POST':
+            address = client_ip(request, app.config['TRUSTED_PROXIES'])
+            retry_after = contact_guard.retry_after(contact_client(session, address))
+            if retry_after:
+                add_flash(session, 'contact_rate_limited', retry_after)
+                return await render_template('contact.html'), 429, {'Retry-After': str(retry_after)}
+
+            outcome, detail = contact_submission(await request.form, contact_guard, session)
+            if outcome == 'invalid':
+                add_flash_errors(session, detail)
+            elif outcome == 'duplicate':
+                add_flash(session, 'contact_duplicate')
+                return redirect(url_for('contact'))
+            else:
+                await contact_messages.add(detail)
+                add_flash(session, 'contact_sent', detail['name'], detail['subject'])
+                return redirect(url_for('contact'))
+
+        return await render_template('contact.html')
+
+    @app.route('/about')
+    async def about():
+        """Enhanced about page with more details"""
+        return await render_template('about.html')
+
+    @app.route('/features')
+    async def features():
+        """New features showcase page"""
+        return await render_template('features.html')
+
+    @app.route('/api/health')
+    async def api_health():
+        """API endpoint for testing (served from the cached snapshot)"""
+        return health_monitor.response(request, Response)
+
+    @app.route('/api/health/deep')
+    async def api_health_deep():
+        """Detailed health: process RSS, request rate and latency percentiles"""
+        report = health_monitor.deep_report()
+        report['server'] = 'asgi'
+        return jsonify(report)
+
+    @app.route('/metrics', endpoint='metrics_endpoint')
+    async def metrics_endpoint():
+        """Prometheus scrape endpoint for request latency histograms"""
+        return Response(request_metrics.render(), content_type='text/plain; version=0.0.4')
+
+    @app.route('/profile')
+    async def profile():
+        """User profile page"""
+        if 'username' not in session:
+            add_flash(session, 'profile_login')
+            return redirect(url_for('login'))
+
+        username = session['username']
+        user_data = await users_db.get(username)
+        if user_data is None:
+            session.clear()
+            add_flash(session, 'profile_login')
+            return redirect(url_for('login'))
+
+        return await render_template('profile.html', username=username, user_data=user_data)
+
+    @app.route('/admin/messages')
+    async def admin_messages():
+        """Contact message inbox for administrators"""
+        if 'username' not in session:
+            add_flash(session, 'admin_login')
+            return redirect(url_for('login'))
+        if not is_admin(session):
+            return error_response(403)
+
+        filters, page_args = inbox_query(request.args)
+        messages, next_cursor = await contact_messages.page(**page_args)
+        newest_url, older_url = inbox_links(filters, next_cursor, url_for)
+        return await render_template('admin_messages.html',
+                                     messages=messages,
+                                     filters=filters,
+                                     total=await contact_messages.count(),
+                                     newest_url=newest_url,
+                                     older_url=older_url)
+
+    @app.route('/api/admin/messages')
+    async def api_admin_messages():
+        """JSON contact inbox: ?q=&user=&since=&until=&before=&limit="""
+        if not is_admin(session):
+            return error_response(403)
+        _, page_args = inbox_query(request.args)
+        messages, next_cursor = await contact_messages.page(**page_args)
+        return jsonify({
+            'messages': messages,
+            'next_cursor': next_cursor,
+            'total': await contact_messages.count()
+        })
+
+    def error_response(status):
+        if prefers_json(request.path, request.accept_mimetypes):
+            return Response(error_json(status), status=status, content_type='application/json')
+        return Response(error_pages[status], status=status, content_type='text/html; charset=utf-8')
+
+    @app.errorhandler(403)
+    async def forbidden(e):
+        """Prerendered 403 page, or JSON for /api/*"""
+        return error_response(403)
+
+    @app.errorhandler(404)
+    async def page_not_found(e):
+        """Prerendered 404 page, or JSON for /api/*"""
+        return error_response(404)
+
+    @app.errorhandler(500)
+    async def internal_error(e):
+        """Prerendered 500 page, or JSON for /api/*"""
+        return error_response(500)
+
+    app.extensions.update({
+        'users_db': users_db,
+        'contact_messages': contact_messages,
+        'contact_guard': contact_guard,
+        'user_throttle': user_throttle,
+        'ip_throttle': ip_throttle,
+        'health_monitor': health_monitor,
+        'metrics': request_metrics
+    })
+    return app
+
+
+_default_app = None
+
+
+def __getattr__(name):
+    """Build the module-level `app` lazily, on first import of asgi.app"""
+    global _default_app
+    if name == 'app':
+        if _default_app is None:
+            _default_app = create_asgi_app(config_from_env())
+        return _default_app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def main(argv=None):
+    from hypercorn.config import Config
+    from hypercorn.run import run
+
+    parser = argparse.ArgumentParser(description='Run the ASGI variant with Hypercorn')
+    parser.add_argument('--bind', default='127.0.0.1:8001', help='host:port to listen on')
+    parser.add_argument('--workers', type=int, default=1, help='worker processes')
+    args = parser.parse_args(argv)
+
+    config = Config()
+    config.bind = [args.bind]
+    config.workers = args.workers
+    # Hypercorn evaluates this in each worker, so every worker builds its own app
+    config.application_path = 'asgi:create_asgi_app(config_from_env())'
+    config.accesslog = '-'
+    print(f"🚀 ASGI server on http://{args.bind} with {args.workers} worker(s)")
+    run(config)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Fingerprinted static asset serving for the Selenium testing demo.
+
+build_assets.py writes content-hashed copies of the CSS/JS (and an optional
+vendored Font Awesome subset) to static/dist together with a manifest and
+pre-compressed .gz/.br variants. This module resolves template asset names
+through that manifest and serves the hashed files with an immutable
+Cache-Control header, so repeat page views only transfer the HTML. The
+ASGI app serves /assets through the same module-level helpers.
+"""
+import json
+import mimetypes
+import os
+
+from flask import request, send_from_directory, url_for
+
+IMMUTABLE_MAX_AGE = 31536000
+
+# Pre-compressed variants in preference order
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+def load_manifest(dist_folder):
+    """Read dist/manifest.json; an empty mapping means serve source files as-is"""
+    try:
+        with open(os.path.join(dist_folder, 'manifest.json')) as manifest_file:
+            return json.load(manifest_file)
+    except (OSError, ValueError):
+        return {}
+
+
+def resolve_asset(manifest, name, fallback, url_for):
+    """URL for a source asset: its hashed build output, else the fallback or the source file"""
+    hashed = manifest.get(name)
+    if hashed:
+        return url_for('dist_asset', filename=hashed)
+    if fallback:
+        return fallback
+    return url_for('static', filename=name)
+
+
+def choose_variant(dist_folder, filename, accept_encodings):
+    """(file to send, Content-Encoding or None, mimetype) for a hashed asset"""
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    for encoding, suffix in ENCODINGS:
+        if encoding in accept_encodings and os.path.isfile(os.path.join(dist_folder, filename + suffix)):
+            return filename + suffix, encoding, mimetype
+    return filename, None, mimetype
+
+
+def immutable_headers(response, encoding):
+    """Cache headers (and encoding) for a fingerprinted asset response"""
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    response.cache_control.max_age = IMMUTABLE_MAX_AGE
+    response.cache_control.immutable = True
+    return response
+
+
+class Assets:
+    """Manifest lookup plus the /assets route for hashed build output"""
+
+    def __init__(self, app=None):
+        self.manifest = {}
+        self.dist_folder = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.dist_folder = os.path.join(app.static_folder, 'dist')
+        self.reload()
+        app.add_template_global(self.asset_url, 'asset_url')
+        app.add_url_rule('/assets/<path:filename>', 'dist_asset', self.serve)
+
+    def reload(self):
+        self.manifest = load_manifest(self.dist_folder)
+
+    def asset_url(self, name, fallback=None):
+        """URL for a source asset name such as 'css/app.css'"""
+        return resolve_asset(self.manifest, name, fallback, url_for)
+
+    def serve(self, filename):
+        """Serve a hashed asset, preferring a pre-compressed variant"""
+        chosen, encoding, mimetype = choose_variant(self.dist_folder, filename, request.accept_encodings)
+        response = send_from_directory(self.dist_folder, chosen, mimetype=mimetype,
+                                       max_age=IMMUTABLE_MAX_AGE)
+        return immutable_headers(response, encoding)
@@ -0,0 +1,82 @@
+"""
+Async adapters over the user and contact message stores and the
+server-side session interface.
+
+The ASGI app must never block its event loop. Every call that may touch
+disk, take a pooled SQLite connection or burn CPU (queries and counts,
+password hash checks, flushes, session records) runs on the default thread
+pool via asyncio.to_thread. Only queueing a message for the background
+flusher, an append to an in-memory list, runs inline.
+"""
+import asyncio
+
+from quart.sessions import SessionInterface
+
+
+class AsyncUserStore:
+    """Awaitable view of a UserStore"""
+
+    def __init__(self, store):
+        self.store = store
+
+    async def get(self, username):
+        return await asyncio.to_thread(self.store.get, username)
+
+    async def verify(self, username, password):
+        return await asyncio.to_thread(self.store.verify, username, password)
+
+    async def record_login(self, username, when):
+        await asyncio.to_thread(self.store.record_login, username, when)
+
+    async def count(self):
+        # SQLite stores keep their counters in a table
+        return await asyncio.to_thread(len, self.store)
+
+    async def close(self):
+        close = getattr(self.store, 'close', None)
+        if close is not None:
+            await asyncio.to_thread(close)
+
+
+class AsyncContactMessageStore:
+    """Awaitable view of a ContactMessageStore"""
+
+    def __init__(self, store):
+        self.store = store
+
+    async def add(self, message_data):
+        # Only appends to the pending batch; the flusher thread does the I/O
+        self.store.add(message_data)
+
+    async def recent(self, limit=20):
+        return await asyncio.to_thread(self.store.recent, limit)
+
+    async def page(self, **filters):
+        return await asyncio.to_thread(self.store.page, **filters)
+
+    async def count(self):
+        # A COUNT(*) over the shared database file
+        return await asyncio.to_thread(len, self.store)
+
+    async def close(self):
+        # Joins the flusher thread and writes the last batch
+        await asyncio.to_thread(self.store.close)
+
+
+class AsyncSessionInterface(SessionInterface):
+    """Quart session interface over a sessions.ServerSideSessionInterface"""
+
+    def __init__(self, interface):
+        self.interface = interface
+
+    @property
+    def backend(self):
+        return self.interface.backend
+
+    async def open_session(self, app, request):
+        return await asyncio.to_thread(self.interface.open_session, app, request)
+
+    async def save_session(self, app, session, response):
+        # No response to carry a cookie during websocket handling
+        if response is not None:
+            await asyncio.to_thread(self.interface.save_session, app, session, response)
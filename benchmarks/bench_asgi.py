@@ -0,0 +1,151 @@
+"""
+Benchmark: WSGI (serve.py thread pool) vs ASGI (asgi.py on Hypercorn).
+
+Starts both servers as single-worker subprocesses on ephemeral ports and
+drives them over real sockets with an asyncio client:
+
+  * throughput - concurrent GETs per route, reporting RPS and p50/p99
+  * slow clients - N connections that send half a request and stall,
+    then the latency of ordinary requests made while they are held open
+
+Run from the repository root:
+
+    python benchmarks/bench_asgi.py [requests-per-route] [slow-clients]
+"""
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ROUTES = ['/', '/login', '/contact', '/api/health']
+CONCURRENCY = 32
+PROBE_TIMEOUT = 10.0
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def percentile(samples, p):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+async def fetch(port, path):
+    """One GET on a fresh connection; returns the status code"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    try:
+        writer.write(f'GET {path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n'.encode())
+        await writer.drain()
+        status_line = await reader.readline()
+        await reader.read()
+        return int(status_line.split()[1])
+    finally:
+        writer.close()
+
+
+async def wait_ready(port, timeout=20.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if await fetch(port, '/api/health') == 200:
+                return
+        except OSError:
+            pass
+        await asyncio.sleep(0.1)
+    raise RuntimeError(f'server on port {port} did not come up')
+
+
+async def throughput(port, path, count):
+    """Return (requests/sec, p50 ms, p99 ms) for count GETs at CONCURRENCY"""
+    latencies = []
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            await fetch(port, path)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(count)))
+    elapsed = time.perf_counter() - started
+    return count / elapsed, percentile(latencies, 50) * 1000, percentile(latencies, 99) * 1000
+
+
+async def slow_clients(port, held, probes=20):
+    """Hold `held` half-sent requests open; return (ok probes, p50 ms) for normal GETs"""
+    stalled = []
+    for _ in range(held):
+        try:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(b'GET / HTTP/1.1\r\nHost: localhost\r\n')
+            await writer.drain()
+            stalled.append(writer)
+        except OSError:
+            break
+    await asyncio.sleep(0.5)
+
+    latencies = []
+    for _ in range(probes):
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(fetch(port, '/api/health'), PROBE_TIMEOUT / probes)
+        except (asyncio.TimeoutError, OSError):
+            continue
+        latencies.append(time.perf_counter() - started)
+
+    for writer in stalled:
+        writer.close()
+    p50 = percentile(latencies, 50) * 1000 if latencies else float('nan')
+    return len(latencies), p50
+
+
+def start_server(name, port, data_dir):
+    env = dict(os.environ, CONTACT_DB_PATH=os.path.join(data_dir, f'{name}.db'))
+    if name == 'wsgi':
+        command = [sys.executable, 'serve.py', '--bind', f'127.0.0.1:{port}', '--workers', '1', '--threads', '8']
+    else:
+        command = [sys.executable, 'asgi.py', '--bind', f'127.0.0.1:{port}', '--workers', '1']
+    return subprocess.Popen(command, cwd=ROOT, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+async def run_server(name, count, held, data_dir):
+    port = free_port()
+    process = start_server(name, port, data_dir)
+    try:
+        await wait_ready(port)
+        print(f"\n🔧 {name.upper()} (port {port})")
+        print(f"{'route':<14}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+        for path in ROUTES:
+            rps, p50, p99 = await throughput(port, path, count)
+            print(f"{path:<14}{rps:>10.0f}{p50:>10.2f}{p99:>10.2f}")
+        ok, p50 = await slow_clients(port, held)
+        print(f"with {held} stalled clients: {ok}/20 probes answered, p50 {p50:.2f} ms")
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+async def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    held = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+    with tempfile.TemporaryDirectory() as data_dir:
+        for name in ('wsgi', 'asgi'):
+            await run_server(name, count, held, data_dir)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
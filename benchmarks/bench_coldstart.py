@@ -0,0 +1,119 @@
+"""
+Benchmark: cold start of a serve.py worker.
+
+Starts a single-worker serve.py as a fresh process and measures
+time-to-first-byte of GET / from the moment the process was launched, then
+the latency of the first request to every other route (which is where lazy
+template compilation shows up). Three start-up modes are compared:
+
+  * lazy         --cold: templates compile on first render, no warm-up
+  * precompile   templates compiled and routes warmed before accepting traffic
+  * bytecode     as precompile, loading compiled templates from a warm
+                 on-disk Jinja bytecode cache
+
+The listening socket is bound before the app is built, so connections made
+during start-up queue in the backlog and the TTFB includes all boot work.
+
+Run from the repository root:
+
+    python benchmarks/bench_coldstart.py [runs-per-mode]
+"""
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ROUTES = ['/', '/login', '/contact', '/about', '/features', '/api/health', '/nonexistent']
+CONNECT_TIMEOUT = 30.0
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def first_byte(port, path, deadline):
+    """GET path on a new connection, retrying until the port accepts; returns (status, ttfb)"""
+    while True:
+        try:
+            sock = socket.create_connection(('127.0.0.1', port), timeout=CONNECT_TIMEOUT)
+            break
+        except OSError:
+            if time.monotonic() > deadline:
+                raise RuntimeError(f'port {port} never accepted a connection')
+            time.sleep(0.002)
+    with sock:
+        started = time.perf_counter()
+        sock.sendall(f'GET {path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n'.encode())
+        head = sock.recv(1)
+        ttfb = time.perf_counter() - started
+        head += sock.recv(64)
+        while sock.recv(65536):
+            pass
+    return int(head.split()[1]), ttfb
+
+
+def start_server(port, data_dir, flags):
+    env = dict(os.environ, CONTACT_DB_PATH=os.path.join(data_dir, 'contact.db'), SESSION_BACKEND='memory')
+    command = [sys.executable, 'serve.py', '--bind', f'127.0.0.1:{port}', '--workers', '1', *flags]
+    return subprocess.Popen(command, cwd=ROOT, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def stop_server(process):
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def cold_start(data_dir, flags):
+    """Return (ms from launch to first byte of /, {route: first-hit ms})"""
+    port = free_port()
+    launched = time.perf_counter()
+    process = start_server(port, data_dir, flags)
+    try:
+        status, _ = first_byte(port, '/', time.monotonic() + CONNECT_TIMEOUT)
+        startup_ttfb = (time.perf_counter() - launched) * 1000
+        if status != 200:
+            raise RuntimeError(f'GET / returned {status}')
+        first_hits = {}
+        for path in ROUTES[1:]:
+            _, ttfb = first_byte(port, path, time.monotonic() + CONNECT_TIMEOUT)
+            first_hits[path] = ttfb * 1000
+        return startup_ttfb, first_hits
+    finally:
+        stop_server(process)
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    with tempfile.TemporaryDirectory() as data_dir:
+        cache_dir = os.path.join(data_dir, 'jinja-cache')
+        modes = [
+            ('lazy', ['--cold']),
+            ('precompile', []),
+            ('bytecode', ['--template-cache', cache_dir])
+        ]
+        # Populate the bytecode cache so the 'bytecode' runs load rather than compile
+        cold_start(data_dir, modes[2][1])
+
+        print(f"Cold start, median of {runs} runs (ms)")
+        print(f"{'mode':<12}{'TTFB /':>10}" + ''.join(f'{path:>14}' for path in ROUTES[1:]))
+        for name, flags in modes:
+            results = [cold_start(data_dir, flags) for _ in range(runs)]
+            startup = statistics.median(ttfb for ttfb, _ in results)
+            hits = [statistics.median(hits[path] for _, hits in results) for path in ROUTES[1:]]
+            print(f"{name:<12}{startup:>10.1f}" + ''.join(f'{hit:>14.2f}' for hit in hits))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark: bytes on the wire and latency with and without compression/ETags.
+
+Runs every GET route in app.py through the Flask test client three ways:
+middleware disabled, first visit with compression, and a revalidation
+carrying the previous ETag (304). Run from the repository root:
+
+    python benchmarks/bench_compression.py [requests-per-route]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app  # noqa: E402
+
+ANONYMOUS_ROUTES = ['/', '/about', '/features', '/login', '/contact', '/api/health']
+AUTHENTICATED_ROUTES = ['/dashboard', '/profile']
+HEADERS = {'Accept-Encoding': 'gzip, deflate, br'}
+
+
+def percentile(samples, p):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+def measure(client, path, count, revalidate=False):
+    """Return (bytes on wire per response, p99 latency in ms)"""
+    headers = dict(HEADERS)
+    if revalidate:
+        etag = client.get(path, headers=HEADERS).headers.get('ETag')
+        if etag:
+            headers['If-None-Match'] = etag
+    latencies, size = [], 0
+    for _ in range(count):
+        started = time.perf_counter()
+        response = client.get(path, headers=headers)
+        latencies.append(time.perf_counter() - started)
+        size = len(response.get_data())
+    return size, percentile(latencies, 99) * 1000
+
+
+def main(count=200):
+    app = create_app({'CONTACT_DB_PATH': ':memory:'})
+    compression = app.extensions['compression']
+    client = app.test_client()
+    client.post('/login', data={'username': 'admin', 'password': 'password123'})
+    anonymous = app.test_client()
+
+    print(f"{'route':<14}{'plain B':>9}{'p99 ms':>9}{'encoded B':>11}{'p99 ms':>9}{'304 B':>7}{'p99 ms':>9}")
+    for path in ANONYMOUS_ROUTES + AUTHENTICATED_ROUTES:
+        target = client if path in AUTHENTICATED_ROUTES else anonymous
+        compression.enabled = False
+        plain = measure(target, path, count)
+        compression.enabled = True
+        encoded = measure(target, path, count)
+        revalidated = measure(target, path, count, revalidate=True)
+        print(f"{path:<14}{plain[0]:>9}{plain[1]:>9.3f}{encoded[0]:>11}{encoded[1]:>9.3f}"
+              f"{revalidated[0]:>7}{revalidated[1]:>9.3f}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
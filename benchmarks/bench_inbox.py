@@ -0,0 +1,120 @@
+"""
+Benchmark: admin inbox queries on a large contact message log.
+
+Fills a fresh ContactMessageStore with N synthetic messages (default one
+million) through the normal batched write path, so the FTS5 index is kept
+by its triggers, then times ContactMessageStore.page() for each inbox
+access pattern:
+
+  * newest        first page, no filters
+  * deep cursor   a page from the middle of the log (keyset, not OFFSET)
+  * user          one sender's messages (idx_contact_user)
+  * date range    a single day (idx_contact_timestamp)
+  * search        a word in ~30% of messages, a word in ~0.01%, a prefix,
+                  and two words limited to one sender
+  * count         the total shown above the inbox
+
+The target is every page under ~50 ms. The database is written to a
+temporary directory and removed afterwards unless --keep is given.
+
+Run from the repository root:
+
+    python benchmarks/bench_inbox.py [messages] [--keep]
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from contact_store import ContactMessageStore  # noqa: E402
+
+WORDS = ('invoice', 'login', 'password', 'report', 'testing', 'selenium', 'browser', 'timeout',
+         'account', 'feature', 'request', 'question', 'problem', 'dashboard', 'profile', 'access')
+USERS = ('Anonymous', 'admin', 'student', 'test_user', 'qa_tester')
+BATCH = 10000
+REPEAT = 20
+
+
+def fill(store, count, seed=1):
+    """Write count messages, one per 30 s starting 2024-01-01, in BATCH-sized transactions"""
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    started = time.perf_counter()
+    for number in range(count):
+        words = rng.sample(WORDS, 6)
+        if rng.random() < 0.3:
+            words.append('order')
+        if rng.random() < 0.0001:
+            words.append('quokka')
+        store.add({
+            'name': f'Sender {number % 5000}',
+            'email': f'sender{number % 5000}@example.com',
+            'subject': ' '.join(words[:3]),
+            'message': ' '.join(words) + f' reference {number}',
+            'timestamp': (start + timedelta(seconds=30 * number)).strftime('%Y-%m-%d %H:%M:%S'),
+            'user': USERS[number // 10 % len(USERS)] if number % 10 == 0 else 'Anonymous'
+        })
+        if (number + 1) % BATCH == 0:
+            store.flush()
+    store.flush()
+    return time.perf_counter() - started
+
+
+def median_ms(function):
+    function()  # first call warms the page cache
+    samples = []
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def main(argv):
+    count = int(argv[0]) if argv and argv[0].isdigit() else 1000000
+    keep = '--keep' in argv
+    directory = tempfile.mkdtemp(prefix='bench-inbox-')
+    path = os.path.join(directory, 'contact_messages.db')
+    # One big flush per batch; no background flushes while filling
+    store = ContactMessageStore(path, batch_size=BATCH * 2, flush_interval=3600)
+    try:
+        print(f"📝 Writing {count:,} messages...")
+        seconds = fill(store, count)
+        print(f"   {count / seconds:,.0f} messages/s, full text search: {store.full_text}")
+
+        middle = count // 2
+        day = (datetime(2024, 1, 1) + timedelta(seconds=30 * middle)).strftime('%Y-%m-%d')
+        cases = [
+            ('newest', {}),
+            ('deep cursor', {'before': middle}),
+            ('user', {'user': 'qa_tester'}),
+            ('date range', {'since': day, 'until': day}),
+            ('search common', {'query': 'order'}),
+            ('search rare', {'query': 'quokka'}),
+            ('search prefix', {'query': 'dash'}),
+            ('search + user', {'query': 'order invoice', 'user': 'student'})
+        ]
+        print(f"{'query':<16}{'rows':>6}{'median (ms)':>14}")
+        for label, filters in cases:
+            messages, _ = store.page(limit=25, **filters)
+            elapsed = median_ms(lambda: store.page(limit=25, **filters))
+            print(f"{label:<16}{len(messages):>6}{elapsed:>14.2f}")
+        print(f"{'count':<16}{'':>6}{median_ms(lambda: len(store)):>14.2f}")
+    finally:
+        store.close()
+        if keep:
+            print(f"💾 Database kept at {path}")
+        else:
+            for suffix in ('', '-wal', '-shm'):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+            os.rmdir(directory)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,69 @@
+"""
+Micro-benchmark: per-request cost of contact form validation.
+
+Compares the original inline validation from app.contact() with the
+prebuilt CONTACT_FORM rules (whose error codes are checked against the
+legacy texts through the flash catalog). Run from the repository root:
+
+    python benchmarks/bench_validation.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flashes import MESSAGES  # noqa: E402
+from validation import CONTACT_FORM  # noqa: E402
+
+SAMPLES = {
+    'valid': {
+        'name': 'John Doe',
+        'email': 'john.doe@example.com',
+        'subject': 'Test Message from Selenium',
+        'message': 'This is a comprehensive test message for the contact form validation system.'
+    },
+    'invalid email': {
+        'name': 'Test User',
+        'email': 'invalid-email',
+        'subject': 'Test Subject',
+        'message': 'Test message with invalid email'
+    },
+    'all invalid': {'name': '', 'email': 'a@b', 'subject': 'Hi', 'message': 'Short'}
+}
+
+
+def legacy_validate(form):
+    """The validation previously inlined in app.contact()"""
+    name = form.get('name', '').strip()
+    email = form.get('email', '').strip()
+    subject = form.get('subject', '').strip()
+    message = form.get('message', '').strip()
+    errors = []
+    if not name or len(name) < 2:
+        errors.append('Name must be at least 2 characters long.')
+    if not email:
+        errors.append('Email address is required.')
+    elif '@' not in email or '.' not in email.split('@')[-1]:
+        errors.append('Please enter a valid email address.')
+    elif len(email.split('@')[0]) < 1 or len(email.split('@')[1]) < 4:
+        errors.append('Please enter a valid email address.')
+    if not subject or len(subject) < 5:
+        errors.append('Subject must be at least 5 characters long.')
+    if not message or len(message) < 10:
+        errors.append('Message must be at least 10 characters long.')
+    return {'name': name, 'email': email, 'subject': subject, 'message': message}, errors
+
+
+def main(number=200000):
+    print(f"{'scenario':<16}{'legacy (us)':>14}{'rules (us)':>16}")
+    for label, form in SAMPLES.items():
+        data, codes = CONTACT_FORM.validate(form)
+        assert legacy_validate(form) == (data, [MESSAGES[code][1] for code in codes]), label
+        legacy = min(timeit.repeat(lambda: legacy_validate(form), number=number, repeat=3))
+        rules = min(timeit.repeat(lambda: CONTACT_FORM.validate(form), number=number, repeat=3))
+        print(f"{label:<16}{legacy / number * 1e6:>14.3f}{rules / number * 1e6:>16.3f}")
+
+
+if __name__ == '__main__':
+    main()
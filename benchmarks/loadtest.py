@@ -0,0 +1,349 @@
+"""
+Offline load generator for app.py.
+
+Virtual users run scenario scripts in a loop for a fixed duration, either
+in-process through the Flask test client or over real sockets (against a
+URL, or an app started here on an ephemeral port). Per-route RPS and
+p50/p95/p99 latencies are printed and can be saved as JSON; two result
+files can then be compared to spot regressions between commits.
+
+Scenarios:
+
+    browse    anonymous page views (/, /about, /features, /contact)
+    login     login, dashboard, profile, logout cycle
+    contact   contact form bursts
+    health    /api/health polling
+
+Run from the repository root:
+
+    python benchmarks/loadtest.py --mode inprocess --duration 10 --output before.json
+    python benchmarks/loadtest.py --mode socket --users 16 --scenarios browse,health
+    python benchmarks/loadtest.py --mode socket --url http://127.0.0.1:8000
+    python benchmarks/loadtest.py --compare before.json after.json --threshold 10
+"""
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+from http.cookies import SimpleCookie
+from urllib.parse import urlencode, urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app import SEED_USERS, create_app  # noqa: E402
+
+RESULT_FORMAT = 1
+PERCENTILES = (50, 95, 99)
+
+
+def browse(client, rng):
+    """Anonymous browsing"""
+    for path in rng.sample(['/', '/about', '/features', '/contact'], 4):
+        client.request('GET', path)
+
+
+def login(client, rng):
+    """Login/logout cycle with a random seeded account"""
+    username = rng.choice(list(SEED_USERS))
+    client.request('GET', '/login')
+    client.request('POST', '/login', {'username': username,
+                                      'password': SEED_USERS[username]['password']})
+    client.request('GET', '/dashboard')
+    client.request('GET', '/profile')
+    client.request('GET', '/logout')
+
+
+def contact(client, rng):
+    """A burst of contact form submissions"""
+    client.request('GET', '/contact')
+    for _ in range(5):
+        number = rng.randrange(1000000)
+        client.request('POST', '/contact', {
+            'name': 'Load Test',
+            'email': f'load{number}@example.com',
+            'subject': f'Load test {number}',
+            'message': 'Generated by benchmarks/loadtest.py'
+        })
+
+
+def health(client, rng):
+    """Health endpoint polling"""
+    for _ in range(10):
+        client.request('GET', '/api/health')
+
+
+SCENARIOS = {'browse': browse, 'login': login, 'contact': contact, 'health': health}
+
+
+class Recorder:
+    """Thread-safe latency samples and error counts per route"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = {}
+        self.errors = {}
+
+    def record(self, route, seconds, ok):
+        with self._lock:
+            self.samples.setdefault(route, []).append(seconds)
+            if not ok:
+                self.errors[route] = self.errors.get(route, 0) + 1
+
+
+class InProcessClient:
+    """Flask test client; one per virtual user so cookies stay separate"""
+
+    def __init__(self, app, recorder):
+        self.client = app.test_client()
+        self.recorder = recorder
+
+    def request(self, method, path, form=None):
+        started = time.perf_counter()
+        response = self.client.open(path, method=method, data=form)
+        response.get_data()
+        self.recorder.record(f'{method} {path}', time.perf_counter() - started,
+                             response.status_code < 400)
+
+
+class SocketClient:
+    """Keep-alive HTTP client with a minimal cookie jar; redirects are not followed"""
+
+    def __init__(self, base_url, recorder):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.recorder = recorder
+        self.cookies = {}
+        self.connection = None
+
+    def _send(self, method, path, body, headers):
+        if self.connection is None:
+            self.connection = http.client.HTTPConnection(self.host, self.port, timeout=30)
+        self.connection.request(method, path, body=body, headers=headers)
+        response = self.connection.getresponse()
+        response.read()
+        if response.will_close:
+            self.connection.close()
+            self.connection = None
+        return response
+
+    def request(self, method, path, form=None):
+        headers = {}
+        body = None
+        if form is not None:
+            body = urlencode(form)
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        if self.cookies:
+            headers['Cookie'] = '; '.join(f'{k}={v}' for k, v in self.cookies.items())
+
+        started = time.perf_counter()
+        try:
+            try:
+                response = self._send(method, path, body, headers)
+            except (http.client.HTTPException, ConnectionError):
+                # Stale keep-alive connection; retry once on a fresh one
+                self.connection = None
+                response = self._send(method, path, body, headers)
+        except (OSError, http.client.HTTPException):
+            self.connection = None
+            self.recorder.record(f'{method} {path}', time.perf_counter() - started, False)
+            return
+        self.recorder.record(f'{method} {path}', time.perf_counter() - started, response.status < 400)
+
+        for header in response.headers.get_all('Set-Cookie') or ():
+            for name, morsel in SimpleCookie(header).items():
+                if morsel.value and morsel['expires'] != 'Thu, 01 Jan 1970 00:00:00 GMT':
+                    self.cookies[name] = morsel.value
+                else:
+                    self.cookies.pop(name, None)
+
+
+def percentile(samples, p):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+def summarize(samples, errors, elapsed):
+    summary = {
+        'count': len(samples),
+        'errors': errors,
+        'rps': round(len(samples) / elapsed, 2),
+        'mean_ms': round(sum(samples) / len(samples) * 1000, 3)
+    }
+    for p in PERCENTILES:
+        summary[f'p{p}_ms'] = round(percentile(samples, p) * 1000, 3)
+    return summary
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_load(make_client, scenarios, users, duration, seed):
+    """Run `users` virtual users for `duration` seconds; return (recorder, elapsed)"""
+    recorder = Recorder()
+    deadline = time.monotonic() + duration
+    names = sorted(scenarios)
+
+    def virtual_user(index):
+        rng = random.Random(seed + index)
+        client = make_client(recorder)
+        while time.monotonic() < deadline:
+            SCENARIOS[rng.choice(names)](client, rng)
+
+    threads = [threading.Thread(target=virtual_user, args=(i,), daemon=True) for i in range(users)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return recorder, time.perf_counter() - started
+
+
+def start_local_server(app):
+    """Serve app on an ephemeral port in a background thread; returns (server, base URL)"""
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+
+    server = make_server('127.0.0.1', 0, app, threaded=True, request_handler=QuietHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_port}'
+
+
+def run(args):
+    scenarios = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        raise SystemExit(f"Unknown scenario(s): {', '.join(sorted(unknown))}")
+
+    server = None
+    target = args.url
+    if args.mode == 'inprocess' or not args.url:
+        # Every simulated user shares one client IP, so lift the contact rate limit
+        app = create_app({'CONTACT_DB_PATH': ':memory:',
+                          'CONTACT_RATE_PER_MINUTE': 1e9, 'CONTACT_BURST': 10 ** 9})
+        if args.mode == 'inprocess':
+            target = 'test-client'
+            make_client = lambda recorder: InProcessClient(app, recorder)  # noqa: E731
+        else:
+            server, target = start_local_server(app)
+    if args.mode == 'socket':
+        make_client = lambda recorder: SocketClient(target, recorder)  # noqa: E731
+
+    print(f"🚀 {args.users} user(s) x {args.duration}s against {target} ({', '.join(scenarios)})")
+    try:
+        recorder, elapsed = run_load(make_client, scenarios, args.users, args.duration, args.seed)
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    all_samples = [s for samples in recorder.samples.values() for s in samples]
+    result = {
+        'format': RESULT_FORMAT,
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'mode': args.mode,
+            'target': target,
+            'scenarios': scenarios,
+            'users': args.users,
+            'duration': args.duration,
+            'seed': args.seed
+        },
+        'total': summarize(all_samples, sum(recorder.errors.values()), elapsed) if all_samples else {},
+        'routes': {
+            route: summarize(samples, recorder.errors.get(route, 0), elapsed)
+            for route, samples in sorted(recorder.samples.items())
+        }
+    }
+    print_result(result)
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(result, output_file, indent=2, sort_keys=True)
+        print(f"💾 Results written to {args.output}")
+    return 0
+
+
+def print_result(result):
+    print(f"{'route':<22}{'count':>8}{'err':>6}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    rows = list(result['routes'].items())
+    if result['total']:
+        rows.append(('TOTAL', result['total']))
+    for route, s in rows:
+        print(f"{route:<22}{s['count']:>8}{s['errors']:>6}{s['rps']:>10.1f}"
+              f"{s['p50_ms']:>10.2f}{s['p95_ms']:>10.2f}{s['p99_ms']:>10.2f}")
+
+
+def compare(baseline_path, current_path, threshold):
+    """Print per-route deltas; return 1 if any route regressed beyond threshold percent"""
+    with open(baseline_path) as baseline_file:
+        baseline = json.load(baseline_file)
+    with open(current_path) as current_file:
+        current = json.load(current_file)
+
+    def delta(old, new):
+        return (new - old) / old * 100 if old else 0.0
+
+    for key in ('mode', 'scenarios', 'users'):
+        if baseline['meta'].get(key) != current['meta'].get(key):
+            print(f"⚠️ {key} differs ({baseline['meta'].get(key)} vs {current['meta'].get(key)}); results may not be comparable")
+
+    regressions = []
+    print(f"{'route':<22}{'p95 ms':>18}{'Δp95':>9}{'req/s':>18}{'Δrps':>9}")
+    for route in sorted(set(baseline['routes']) | set(current['routes'])):
+        old, new = baseline['routes'].get(route), current['routes'].get(route)
+        if old is None or new is None:
+            print(f"{route:<22}{'only in ' + ('current' if old is None else 'baseline'):>18}")
+            continue
+        p95_change = delta(old['p95_ms'], new['p95_ms'])
+        rps_change = delta(old['rps'], new['rps'])
+        flag = ''
+        if p95_change > threshold or rps_change < -threshold:
+            flag = '  ⚠️ regression'
+            regressions.append(route)
+        print(f"{route:<22}{old['p95_ms']:>8.2f} → {new['p95_ms']:>7.2f}{p95_change:>+8.1f}%"
+              f"{old['rps']:>8.1f} → {new['rps']:>7.1f}{rps_change:>+8.1f}%{flag}")
+
+    if regressions:
+        print(f"❌ {len(regressions)} route(s) regressed by more than {threshold}%")
+        return 1
+    print(f"✅ No route regressed by more than {threshold}%")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Load test the Selenium testing demo app')
+    parser.add_argument('--mode', choices=['inprocess', 'socket'], default='inprocess')
+    parser.add_argument('--url', help='base URL of a running server (socket mode; default: start one here)')
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS), help='comma-separated scenario names')
+    parser.add_argument('--users', type=int, default=8, help='concurrent virtual users')
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds to run')
+    parser.add_argument('--seed', type=int, default=0, help='random seed for scenario choice')
+    parser.add_argument('--output', help='write results as JSON to this file')
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CURRENT'), help='compare two result files')
+    parser.add_argument('--threshold', type=float, default=10.0, help='regression threshold in percent')
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        return compare(*args.compare, args.threshold)
+    return run(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
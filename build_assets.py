@@ -0,0 +1,188 @@
+"""
+Asset build step for the Selenium testing demo.
+
+Writes content-hashed copies of the stylesheet and script to static/dist,
+pre-compresses them (gzip, plus brotli when the module is installed) and
+records the mapping in static/dist/manifest.json for assets.py.
+
+Font Awesome can be vendored from a local copy of the Font Awesome 6 free
+distribution; only the icon rules actually used by the templates are kept
+and, when fontTools is installed, the webfonts are subset to match:
+
+    python build_assets.py
+    python build_assets.py --fontawesome path/to/fontawesome-free-6.0.0-web
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip variants are always built
+    brotli = None
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+STATIC = os.path.join(ROOT, 'static')
+TEMPLATES = os.path.join(ROOT, 'templates')
+DIST = os.path.join(STATIC, 'dist')
+
+SOURCES = ('css/app.css', 'js/app.js')
+COMPRESSIBLE = ('.css', '.js', '.svg')
+COMPRESS_MIN_BYTES = 512
+
+# Font Awesome classes that are styles or modifiers rather than icons
+FA_NON_ICONS = {'fa-solid', 'fa-regular', 'fa-brands', 'fa-spin', 'fa-pulse', 'fa-fw',
+                'fa-lg', 'fa-xs', 'fa-sm', 'fa-1x', 'fa-2x', 'fa-3x', 'fa-4x', 'fa-5x'}
+ICON_SELECTOR = re.compile(r'^\.(fa-[a-z0-9-]+)::?before$')
+FONT_URL = re.compile(r'url\((["\']?)\.\./webfonts/([^)"\'?#]+)([^)"\']*)\1\)')
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()[:12]
+
+
+def write_hashed(name, data):
+    """Write data to dist under a content-hashed name and return that name"""
+    stem, ext = os.path.splitext(os.path.basename(name))
+    hashed = f"{stem}.{content_hash(data)}{ext}"
+    with open(os.path.join(DIST, hashed), 'wb') as output:
+        output.write(data)
+    return hashed
+
+
+def compress(path):
+    """Write .gz (and .br) siblings for a text asset"""
+    with open(path, 'rb') as source:
+        data = source.read()
+    if len(data) < COMPRESS_MIN_BYTES:
+        return
+    with open(path + '.gz', 'wb') as output:
+        # mtime=0 keeps the output byte-identical between builds
+        output.write(gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is not None:
+        with open(path + '.br', 'wb') as output:
+            output.write(brotli.compress(data, quality=11))
+
+
+def used_icons():
+    """Every fa-* icon class referenced by the templates"""
+    icons = set()
+    for name in os.listdir(TEMPLATES):
+        if name.endswith('.html'):
+            with open(os.path.join(TEMPLATES, name), encoding='utf-8') as template:
+                icons.update(re.findall(r'\bfa-[a-z0-9-]+', template.read()))
+    return icons - FA_NON_ICONS
+
+
+def css_rules(css):
+    """Split CSS into top-level (prelude, body) rules, keeping nested at-rules whole"""
+    rules, depth, start, prelude = [], 0, 0, None
+    for index, char in enumerate(css):
+        if char == '{':
+            if depth == 0:
+                prelude = css[start:index].strip()
+                start = index + 1
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                rules.append((prelude, css[start:index]))
+                start = index + 1
+    return rules
+
+
+def subset_fontawesome(css, icons):
+    """Drop glyph rules for icons the templates never use; return (css, codepoints)"""
+    kept, codepoints = [], set()
+    for prelude, body in css_rules(css):
+        selectors = [selector.strip() for selector in prelude.split(',')]
+        matches = [ICON_SELECTOR.match(selector) for selector in selectors]
+        if all(matches) and 'content' in body:
+            selectors = [s for s, m in zip(selectors, matches) if m.group(1) in icons]
+            if not selectors:
+                continue
+            codepoints.update(int(code, 16) for code in re.findall(r'\\([0-9a-fA-F]{4,6})', body))
+        kept.append(f"{','.join(selectors)}{{{body}}}")
+    return ''.join(kept), codepoints
+
+
+def subset_font(path, codepoints):
+    """Subset a webfont to codepoints with fontTools, if available"""
+    try:
+        from fontTools import subset
+    except ImportError:
+        with open(path, 'rb') as font:
+            return font.read()
+    options = subset.Options()
+    options.flavor = 'woff2' if path.endswith('.woff2') else None
+    font = subset.load_font(path, options)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes=codepoints)
+    subsetter.subset(font)
+    out = path + '.subset'
+    subset.save_font(font, out, options)
+    with open(out, 'rb') as subset_file:
+        data = subset_file.read()
+    os.remove(out)
+    return data
+
+
+def vendor_fontawesome(distribution):
+    """Vendor a subset Font Awesome stylesheet and its webfonts into dist"""
+    css_path = os.path.join(distribution, 'css', 'all.min.css')
+    if not os.path.isfile(css_path):
+        css_path = os.path.join(distribution, 'css', 'all.css')
+    with open(css_path, encoding='utf-8') as stylesheet:
+        css, codepoints = subset_fontawesome(stylesheet.read(), used_icons())
+
+    fonts = {}
+
+    def replace_font(match):
+        quote, font_name, suffix = match.groups()
+        if font_name not in fonts:
+            data = subset_font(os.path.join(distribution, 'webfonts', font_name), codepoints)
+            fonts[font_name] = write_hashed(font_name, data)
+        return f"url({quote}{fonts[font_name]}{suffix}{quote})"
+
+    css = FONT_URL.sub(replace_font, css)
+    print(f"🔤 Font Awesome subset: {len(codepoints)} glyphs, {len(fonts)} webfonts")
+    return write_hashed('fontawesome.css', css.encode('utf-8'))
+
+
+def build(fontawesome=None, compress_assets=True):
+    """Rebuild static/dist and return the manifest"""
+    shutil.rmtree(DIST, ignore_errors=True)
+    os.makedirs(DIST)
+
+    manifest = {}
+    for source in SOURCES:
+        with open(os.path.join(STATIC, source), 'rb') as asset:
+            manifest[source] = write_hashed(source, asset.read())
+    if fontawesome:
+        manifest['vendor/fontawesome.css'] = vendor_fontawesome(fontawesome)
+
+    if compress_assets:
+        for name in os.listdir(DIST):
+            if name.endswith(COMPRESSIBLE):
+                compress(os.path.join(DIST, name))
+
+    with open(os.path.join(DIST, 'manifest.json'), 'w') as manifest_file:
+        json.dump(manifest, manifest_file, indent=2, sort_keys=True)
+    return manifest
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build fingerprinted static assets')
+    parser.add_argument('--fontawesome', help='path to an unpacked Font Awesome 6 free web distribution')
+    parser.add_argument('--no-compress', action='store_true', help='skip .gz/.br variants')
+    args = parser.parse_args()
+
+    manifest = build(args.fontawesome, compress_assets=not args.no_compress)
+    for source, hashed in sorted(manifest.items()):
+        print(f"📦 {source} -> dist/{hashed}")
+    if brotli is None:
+        print("💡 Install 'brotli' to also emit .br variants")
@@ -0,0 +1,83 @@
+"""
+Response compression and conditional GET for the Selenium testing demo.
+
+Buffered 200 responses get a strong ETag computed from the body. Requests
+whose If-None-Match matches are answered with an empty 304, and larger
+text bodies are compressed with brotli or gzip according to Accept-Encoding.
+"""
+import gzip
+import hashlib
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {
+    'text/html', 'text/css', 'text/plain', 'text/javascript',
+    'application/json', 'application/javascript', 'image/svg+xml'
+}
+
+
+def body_etag(body):
+    """Strong validator for a response body"""
+    return hashlib.blake2b(body, digest_size=12).hexdigest()
+
+
+class Compression:
+    """after_request hook adding ETags, 304s and content encoding"""
+
+    def __init__(self, app=None, min_size=1024, gzip_level=6, brotli_quality=5):
+        self.min_size = min_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.enabled = True
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.after_request(self.process_response)
+
+    def negotiate(self):
+        """Best encoding the client accepts, or None"""
+        accepted = request.accept_encodings
+        if brotli is not None and accepted['br']:
+            return 'br'
+        if accepted['gzip']:
+            return 'gzip'
+        return None
+
+    def encode(self, body, encoding):
+        if encoding == 'br':
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level)
+
+    def process_response(self, response):
+        if (not self.enabled or response.status_code != 200 or response.direct_passthrough
+                or response.is_streamed or 'Content-Encoding' in response.headers
+                or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+            return response
+
+        body = response.get_data()
+        etag, weak = response.get_etag()
+        if etag is None or weak:
+            etag = body_etag(body)
+
+        encoding = self.negotiate() if len(body) >= self.min_size else None
+        response.vary.add('Accept-Encoding')
+        # Each representation needs its own strong validator
+        tag = f'{etag}-{encoding}' if encoding else etag
+        response.set_etag(tag)
+
+        if request.method in ('GET', 'HEAD') and request.if_none_match.contains(tag):
+            response.status_code = 304
+            response.set_data(b'')
+            del response.headers['Content-Length']
+            return response
+
+        if encoding:
+            response.set_data(self.encode(body, encoding))
+            response.headers['Content-Encoding'] = encoding
+        return response
@@ -0,0 +1,396 @@
+"""
+Shared pytest fixtures for the browser (Selenium) and HTTP test tiers.
+
+Starting Chrome dominates the suite's wall time, so browsers are kept in a
+session-scoped pool instead of being launched and quit for every test.
+Each test checks a browser out, and on return it is reset (cookies, local
+and session storage cleared, window size restored, blank page) before the
+next test may use it. A browser that fails to reset is discarded and
+replaced, so no state leaks between tests.
+
+Tests can run in parallel with pytest-xdist (`pytest -n 4`). Every xdist
+worker is a separate process with its own pool; a worker runs one test at
+a time, so the pool normally holds one browser per worker.
+
+Environment:
+
+    SELENIUM_HEADED=1       show the browser windows instead of running headless
+    SELENIUM_POOL_SIZE=N    maximum browsers per worker (default 2)
+    SELENIUM_BASE_URL=URL   use an external server instead of the live_server fixture
+
+The browser tier runs against a live server that the `live_server`
+fixture starts in a background thread on an ephemeral port. Each test
+process (each xdist worker) gets its own server with fresh stores, so
+parallel runs on one machine never collide. Set SELENIUM_BASE_URL to test
+an already running server instead.
+
+The HTTP tier (test_http.py) runs the same scenario tables against the
+Flask test client, without a browser, and test_asgi.py runs them against
+the ASGI (Quart) variant; `pytest -m http` runs only that tier, `pytest -m
+ui` only the browser tier.
+
+`pytest --report-dir reports` streams results to JSONL and renders a
+compact HTML report (see report.py).
+
+Screenshots go through artifacts.ArtifactManager: written off the test
+thread into artifacts/run-<id>/ (one directory per run, shared by all
+xdist workers), deduplicated by content hash, and linked from the
+pytest-html report when that plugin is active.
+
+Each browser test also gets a timing.StepTimer: driver calls are timed
+per named step and per kind (navigation, find, action, wait, script),
+with Navigation Timing metrics for every driver.get. The structured data
+goes into the JSONL report; a per-test summary, slowest test first, is
+printed at the end.
+
+The terminal summary also lists, per test case, the seconds saved by the
+event-driven waits in waits.py compared to the fixed sleeps they replaced.
+"""
+import asyncio
+import os
+import queue
+import secrets
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+from app import create_app
+from artifacts import ArtifactManager, new_run_id
+from timing import StepTimer, summary_lines
+from waits import Waiter
+
+# Streaming JSONL/HTML results (enabled with --report-dir)
+pytest_plugins = ['report']
+
+WINDOW_SIZE = (1920, 1080)
+
+
+def chrome_options():
+    """Chrome options for stable, isolated test browsers"""
+    options = Options()
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--disable-gpu")
+    options.add_argument(f"--window-size={WINDOW_SIZE[0]},{WINDOW_SIZE[1]}")
+    options.add_argument("--disable-web-security")
+    options.add_argument("--allow-running-insecure-content")
+    if os.environ.get('SELENIUM_HEADED') != '1':
+        options.add_argument("--headless=new")
+    return options
+
+
+class BrowserPool:
+    """Bounded pool of reusable Chrome drivers"""
+
+    def __init__(self, max_size=2, factory=None):
+        self.max_size = max_size
+        self.factory = factory or (lambda: webdriver.Chrome(options=chrome_options()))
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._all = []
+
+    def acquire(self, timeout=120):
+        """Check out an idle browser, starting a new one while under max_size"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            grow = self._created < self.max_size
+            if grow:
+                self._created += 1
+        if not grow:
+            return self._idle.get(timeout=timeout)
+        try:
+            driver = self.factory()
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+        with self._lock:
+            self._all.append(driver)
+        print(f"✅ Chrome WebDriver started ({self._created}/{self.max_size} in pool)")
+        return driver
+
+    def release(self, driver, base_url=None):
+        """Reset a browser and return it to the pool, or discard it if the reset fails"""
+        try:
+            self.reset(driver, base_url)
+        except Exception as e:
+            print(f"⚠️ Browser reset failed, replacing it: {e}")
+            self.discard(driver)
+            return
+        self._idle.put(driver)
+
+    @staticmethod
+    def reset(driver, base_url=None):
+        """Clear everything a test could have left behind"""
+        driver.implicitly_wait(0)
+        if base_url:
+            # Storage is per origin, so clear it while on the app's origin
+            if not driver.current_url.startswith(base_url):
+                driver.get(base_url)
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        driver.delete_all_cookies()
+        driver.set_window_size(*WINDOW_SIZE)
+        driver.get("about:blank")
+
+    def discard(self, driver):
+        with self._lock:
+            self._created -= 1
+            if driver in self._all:
+                self._all.remove(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def close(self):
+        with self._lock:
+            drivers, self._all = self._all, []
+            self._created = 0
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    """Keep per-request access logs out of the test output"""
+
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+class LiveServer:
+    """An app served from a background thread on an ephemeral port"""
+
+    def __init__(self, app, host='127.0.0.1'):
+        self.app = app
+        self.server = make_server(host, 0, app, threaded=True, request_handler=QuietRequestHandler)
+        self.url = f'http://{host}:{self.server.server_port}'
+        self._thread = threading.Thread(target=self.server.serve_forever, name='live-server', daemon=True)
+
+    def start(self, timeout=10.0):
+        self._thread.start()
+        self.wait_ready(timeout)
+        return self
+
+    def wait_ready(self, timeout=10.0):
+        """Poll /api/health until the server answers 200"""
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                with urllib.request.urlopen(f'{self.url}/api/health', timeout=1) as response:
+                    if response.status == 200:
+                        return
+            except (urllib.error.URLError, ConnectionError):
+                pass
+            if time.monotonic() > deadline:
+                raise RuntimeError(f'Live server at {self.url} did not become ready')
+            time.sleep(0.05)
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self._thread.join(timeout=5)
+        self.app.extensions['health_monitor'].stop()
+        self.app.extensions['contact_messages'].close()
+
+
+@pytest.fixture(scope='session')
+def live_server(tmp_path_factory):
+    """Fresh app and stores on an ephemeral port, one per test process"""
+    data_dir = tmp_path_factory.mktemp('live_server')
+    app = create_app({
+        'SECRET_KEY': secrets.token_hex(16),
+        'USER_DB_PATH': None,
+        'CONTACT_DB_PATH': str(data_dir / 'contact_messages.db'),
+        'SESSION_BACKEND': 'cookie'
+    })
+    server = LiveServer(app).start()
+    print(f"🌐 Live server ready at {server.url}")
+    yield server
+    server.stop()
+
+
+@pytest.fixture(scope='session')
+def base_url(request):
+    """Base URL for browser tests: SELENIUM_BASE_URL, or the live_server fixture"""
+    external = os.environ.get('SELENIUM_BASE_URL')
+    if external:
+        return external.rstrip('/')
+    return request.getfixturevalue('live_server').url
+
+
+@pytest.fixture(scope='session')
+def browser_pool():
+    """One pool per test process (per xdist worker when running in parallel)"""
+    pool = BrowserPool(max_size=int(os.environ.get('SELENIUM_POOL_SIZE', '2')))
+    yield pool
+    print("🧹 Shutting down browser pool...")
+    pool.close()
+
+
+@pytest.fixture
+def driver(request, browser_pool):
+    """A clean pooled browser for the duration of one test"""
+    try:
+        browser = browser_pool.acquire()
+    except Exception as e:
+        print(f"❌ Chrome initialization failed: {e}")
+        print("💡 Ensure Chrome browser is installed and ChromeDriver is available")
+        raise
+    yield browser
+    base_url = getattr(request.instance, 'BASE_URL', None)
+    browser_pool.release(browser, base_url)
+
+
+@pytest.fixture
+def step_timer(request):
+    """Per-step navigation/find/action/wait timings for the current test"""
+    timer = StepTimer()
+    yield timer
+    request.node.user_properties.append(('step_timings', timer.finish()))
+
+
+@pytest.fixture
+def waiter(request, driver, step_timer):
+    """Event-driven waits for the pooled browser, with seconds-saved accounting"""
+    wait_helper = Waiter(driver, timer=step_timer)
+    yield wait_helper
+    # user_properties travel with the report, so this also works under xdist
+    request.node.user_properties.append(('wait_seconds', (wait_helper.waited, wait_helper.replaced)))
+
+
+@pytest.fixture(scope='session')
+def artifact_manager():
+    manager = ArtifactManager.from_env(run_id=os.environ['ARTIFACT_RUN_ID'])
+    yield manager
+    manager.close(worker_id=os.environ.get('PYTEST_XDIST_WORKER'))
+    print(manager.summary())
+
+
+@pytest.fixture
+def artifacts(request, artifact_manager):
+    """Save screenshots for the current test; paths are linked from the HTML report"""
+    saved = []
+
+    class TestArtifacts:
+        def screenshot(self, driver, name):
+            path = artifact_manager.screenshot(driver, name, test_id=request.node.nodeid)
+            saved.append((name, path))
+            return path
+
+    yield TestArtifacts()
+    for name, path in saved:
+        request.node.user_properties.append(('artifact', (name, path)))
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    report = outcome.get_result()
+    pytest_html = item.config.pluginmanager.getplugin('html')
+    if pytest_html is None or report.when != 'teardown':
+        return
+    extras = getattr(report, 'extras', [])
+    for name, value in item.user_properties:
+        if name == 'artifact':
+            label, path = value
+            extras.append(pytest_html.extras.image(os.path.abspath(path), name=label))
+    report.extras = extras
+
+
+@pytest.fixture(scope='session')
+def http_app():
+    """One app for the HTTP tier (seeding hashes every password, so build it once)"""
+    return create_app({'CONTACT_DB_PATH': ':memory:', 'SESSION_BACKEND': 'memory'})
+
+
+@pytest.fixture
+def http_client(http_app):
+    """Test client with its own cookie jar, cleared login throttles and contact spam state"""
+    http_app.extensions['user_throttle'].clear()
+    http_app.extensions['ip_throttle'].clear()
+    http_app.extensions['contact_guard'].clear()
+    return http_app.test_client()
+
+
+@pytest.fixture
+def asgi_app():
+    """The ASGI (Quart) variant with the same in-memory stores as http_app
+
+    One app per test: its after_serving hook closes the stores.
+    """
+    from asgi import create_asgi_app
+    return create_asgi_app({'CONTACT_DB_PATH': ':memory:', 'SESSION_BACKEND': 'memory'})
+
+
+@pytest.fixture
+def asgi_run(asgi_app):
+    """Run `async def scenario(client)` against a fresh Quart test client"""
+    for name in ('user_throttle', 'ip_throttle', 'contact_guard'):
+        asgi_app.extensions[name].clear()
+
+    def run(scenario):
+        async def serve():
+            # test_app() runs the before/after_serving hooks (error pages, closing stores)
+            async with asgi_app.test_app() as test_app:
+                return await scenario(test_app.test_client())
+        return asyncio.run(serve())
+    return run
+
+
+def pytest_configure(config):
+    # Set once by the controller; xdist workers inherit it and share the run directory
+    os.environ.setdefault('ARTIFACT_RUN_ID', new_run_id())
+    config.addinivalue_line('markers', 'ui: browser tier, needs Chrome and a running app')
+    config.addinivalue_line('markers', 'http: HTTP tier, runs against the Flask test client')
+
+
+# nodeid -> (seconds waited, seconds of fixed sleep replaced)
+_wait_savings = {}
+# nodeid -> StepTimer.finish() totals
+_step_totals = {}
+
+
+def pytest_runtest_logreport(report):
+    if report.when != 'teardown':
+        return
+    for name, value in report.user_properties:
+        if name == 'wait_seconds':
+            _wait_savings[report.nodeid] = tuple(value)
+        elif name == 'step_timings':
+            _step_totals[report.nodeid] = value['totals']
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if _step_totals:
+        terminalreporter.section('step timings (seconds)')
+        for line in summary_lines(_step_totals):
+            terminalreporter.write_line(line)
+    if not _wait_savings:
+        return
+    terminalreporter.section('wait time saved vs fixed sleeps')
+    total_waited = total_replaced = 0.0
+    for nodeid, (waited, replaced) in sorted(_wait_savings.items()):
+        total_waited += waited
+        total_replaced += replaced
+        terminalreporter.write_line(
+            f"{nodeid.rsplit('::', 1)[-1]:<45} waited {waited:6.2f}s  "
+            f"replaced {replaced:6.2f}s  saved {replaced - waited:6.2f}s"
+        )
+    terminalreporter.write_line(
+        f"{'TOTAL':<45} waited {total_waited:6.2f}s  "
+        f"replaced {total_replaced:6.2f}s  saved {total_replaced - total_waited:6.2f}s"
+    )
@@ -0,0 +1,267 @@
+"""
+Durable contact message storage for the Selenium testing demo.
+
+Messages are appended to a SQLite database in WAL mode. A background
+flusher thread batches pending inserts into a single transaction, so a
+burst of submissions costs one fsync per batch instead of one per message.
+SQLite assigns IDs inside that transaction, so several processes can share
+one database file; AUTOINCREMENT means an id is never reused.
+
+Reads (the admin inbox) use keyset pagination on the id, optional user and
+date filters backed by indexes, and an FTS5 full-text index over subject
+and message kept in sync by triggers on every insert and retention delete.
+Where SQLite lacks FTS5, search falls back to a LIKE scan.
+
+If the database stays unwritable, the pending queue is capped at
+max_pending messages; beyond that new messages are dropped and logged
+rather than growing memory without limit.
+"""
+import atexit
+import logging
+import re
+import sqlite3
+import threading
+import time
+
+MESSAGE_FIELDS = ('id', 'name', 'email', 'subject', 'message', 'timestamp', 'user')
+INSERT_FIELDS = MESSAGE_FIELDS[1:]
+
+logger = logging.getLogger(__name__)
+
+
+class ContactMessageStore:
+    """Append-only contact message log with batched background writes"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS contact_messages (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            email TEXT NOT NULL,
+            subject TEXT NOT NULL,
+            message TEXT NOT NULL,
+            timestamp TEXT NOT NULL,
+            user TEXT NOT NULL,
+            created_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_contact_created_at ON contact_messages (created_at);
+        CREATE INDEX IF NOT EXISTS idx_contact_user ON contact_messages (user, id);
+        CREATE INDEX IF NOT EXISTS idx_contact_timestamp ON contact_messages (timestamp);
+    """
+
+    # External-content index: stores only the inverted index, rows stay in contact_messages
+    FTS_SCHEMA = """
+        CREATE VIRTUAL TABLE IF NOT EXISTS contact_messages_fts USING fts5(
+            subject, message, content='contact_messages', content_rowid='id'
+        );
+        CREATE TRIGGER IF NOT EXISTS contact_messages_fts_insert AFTER INSERT ON contact_messages BEGIN
+            INSERT INTO contact_messages_fts (rowid, subject, message)
+            VALUES (new.id, new.subject, new.message);
+        END;
+        CREATE TRIGGER IF NOT EXISTS contact_messages_fts_delete AFTER DELETE ON contact_messages BEGIN
+            INSERT INTO contact_messages_fts (contact_messages_fts, rowid, subject, message)
+            VALUES ('delete', old.id, old.subject, old.message);
+        END;
+    """
+
+    def __init__(self, path, batch_size=100, flush_interval=0.5,
+                 max_messages=None, max_age_days=None, max_pending=10000):
+        self.path = path
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.dropped = 0
+        self.flush_interval = flush_interval
+        self.max_messages = max_messages
+        self.max_age_days = max_age_days
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=FULL')
+        self._conn.executescript(self.SCHEMA)
+        self.full_text = self._create_fts()
+        self._db_lock = threading.Lock()
+
+        self._pending = []
+        self._cond = threading.Condition()
+        self._closed = False
+        self._flusher = threading.Thread(target=self._run, name='contact-flusher', daemon=True)
+        self._flusher.start()
+        atexit.register(self.close)
+
+    def _create_fts(self):
+        """Create the full-text index (backfilling existing rows); False if FTS5 is missing"""
+        exists = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'contact_messages_fts'"
+        ).fetchone()
+        try:
+            self._conn.executescript(self.FTS_SCHEMA)
+        except sqlite3.OperationalError:
+            return False
+        if not exists:
+            self._conn.execute("INSERT INTO contact_messages_fts (contact_messages_fts) VALUES ('rebuild')")
+        return True
+
+    def add(self, message_data):
+        """Queue a message for storage (its id is assigned when the batch is written)"""
+        # Missing fields fail here, in the caller, not later in the flusher
+        row = tuple(message_data[field] for field in INSERT_FIELDS)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError('contact message store is closed')
+            if len(self._pending) >= self.max_pending:
+                self.dropped += 1
+                logger.error('Contact message queue full (%d pending), dropping a message', len(self._pending))
+                return
+            self._pending.append(row)
+            if len(self._pending) >= self.batch_size:
+                self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._pending and not self._closed:
+                    self._cond.wait(self.flush_interval)
+                if self._closed and not self._pending:
+                    return
+            try:
+                self.flush()
+            except Exception as e:
+                # The batch is back in the queue; retry later rather than lose every future write
+                logger.warning('Contact message flush failed, retrying: %s', e)
+                with self._cond:
+                    if self._closed:
+                        return
+                    self._cond.wait(self.flush_interval)
+
+    def flush(self):
+        """Write every pending message in one transaction"""
+        with self._db_lock:
+            with self._cond:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return 0
+            now = time.time()
+            try:
+                self._conn.execute('BEGIN IMMEDIATE')
+                self._conn.executemany(
+                    'INSERT INTO contact_messages '
+                    '(name, email, subject, message, timestamp, user, created_at) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    [row + (now,) for row in batch]
+                )
+                self._conn.execute('COMMIT')
+            except Exception:
+                if self._conn.in_transaction:
+                    self._conn.execute('ROLLBACK')
+                with self._cond:
+                    self._pending[:0] = batch
+                    overflow = len(self._pending) - self.max_pending
+                    if overflow > 0:
+                        # Keep the oldest messages; the newest arrivals are dropped
+                        del self._pending[self.max_pending:]
+                        self.dropped += overflow
+                        logger.error('Contact message queue full, dropped %d messages', overflow)
+                raise
+            self._apply_retention()
+            return len(batch)
+
+    def _apply_retention(self):
+        """Drop messages outside the retention policy (caller holds _db_lock)"""
+        removed = 0
+        if self.max_age_days is not None:
+            cutoff = time.time() - self.max_age_days * 86400
+            removed += self._conn.execute(
+                'DELETE FROM contact_messages WHERE created_at < ?', (cutoff,)
+            ).rowcount
+        if self.max_messages is not None:
+            # Keep the newest max_messages ids; an index range delete, whichever process wrote them
+            removed += self._conn.execute(
+                'DELETE FROM contact_messages WHERE id <= '
+                "(SELECT seq FROM sqlite_sequence WHERE name = 'contact_messages') - ?",
+                (self.max_messages,)
+            ).rowcount
+        return removed
+
+    def compact(self):
+        """Apply retention immediately and reclaim free pages"""
+        self.flush()
+        with self._db_lock:
+            removed = self._apply_retention()
+            self._conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+            self._conn.execute('VACUUM')
+        return removed
+
+    def recent(self, limit=20):
+        """Return the newest messages, most recent first"""
+        self.flush()
+        with self._db_lock:
+            rows = self._conn.execute(
+                'SELECT id, name, email, subject, message, timestamp, user '
+                'FROM contact_messages ORDER BY id DESC LIMIT ?', (limit,)
+            ).fetchall()
+        return [dict(zip(MESSAGE_FIELDS, row)) for row in rows]
+
+    def page(self, limit=20, before=None, user=None, since=None, until=None, query=None):
+        """One page of messages, newest first, plus the cursor for the next page.
+
+        `before` is the cursor (an id) from the previous page; since/until
+        bound the timestamp ('YYYY-MM-DD' or a full timestamp, inclusive);
+        query matches words in subject or message (the last one as a prefix).
+        Returns (messages, next_cursor), next_cursor None on the last page.
+        """
+        self.flush()
+        columns = ', '.join(f'm.{field}' for field in MESSAGE_FIELDS)
+        sql = f'SELECT {columns} FROM contact_messages m'
+        key = 'm.id'
+        conditions, params = [], []
+        terms = re.findall(r'\w+', query or '')
+        if terms and self.full_text:
+            # Walk the index newest-first and stop at the page limit instead of sorting every match
+            sql = f'SELECT {columns} FROM contact_messages_fts f CROSS JOIN contact_messages m ON m.id = f.rowid'
+            key = 'f.rowid'
+            conditions.append('contact_messages_fts MATCH ?')
+            params.append(' '.join(f'"{term}"' for term in terms) + '*')
+        elif terms:
+            for term in terms:
+                conditions.append('(m.subject LIKE ? OR m.message LIKE ?)')
+                params.extend([f'%{term}%'] * 2)
+        if before is not None:
+            conditions.append(f'{key} < ?')
+            params.append(int(before))
+        if user:
+            conditions.append('m.user = ?')
+            params.append(user)
+        if since:
+            conditions.append('m.timestamp >= ?')
+            params.append(since)
+        if until:
+            # A bare date includes the whole day
+            conditions.append('m.timestamp <= ?')
+            params.append(until + ' 23:59:59' if len(until) == 10 else until)
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        sql += f' ORDER BY {key} DESC LIMIT ?'
+        params.append(limit + 1)
+
+        with self._db_lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        messages = [dict(zip(MESSAGE_FIELDS, row)) for row in rows[:limit]]
+        next_cursor = messages[-1]['id'] if len(rows) > limit else None
+        return messages, next_cursor
+
+    def __len__(self):
+        """Stored messages (from every process sharing the file) plus this process's pending ones"""
+        with self._db_lock:
+            stored = self._conn.execute('SELECT COUNT(*) FROM contact_messages').fetchone()[0]
+        return stored + len(self._pending)
+
+    def close(self):
+        """Flush pending messages and stop the background flusher"""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify()
+        self._flusher.join()
+        self.flush()
+        with self._db_lock:
+            self._conn.close()
@@ -0,0 +1,70 @@
+"""
+Prerendered error responses for the Selenium testing demo.
+
+403, 404 and 500 pages are rendered once at startup into bytes, so a scanner
+probing random paths costs a dict lookup and a Response object per hit
+instead of a template render (or, as before, a TemplateNotFound cascade).
+Requests under /api/ or that prefer JSON get a compact JSON body instead.
+
+Logged-in users still get a live render so the nav shows their session;
+the 500 page is never rendered while handling a failure.
+"""
+import json
+
+from flask import Response, render_template, request, session
+
+ERROR_PAGES = {
+    403: ('403.html', 'forbidden', 'You do not have permission to access this resource.'),
+    404: ('404.html', 'not_found', 'The requested URL was not found on the server.'),
+    500: ('500.html', 'internal_error', 'The server encountered an internal error.')
+}
+
+# Cached pages are rendered for an anonymous request to a path no route
+# matches, so no nav link is marked active (as on a live 404)
+PRERENDER_PATH = '/__error__'
+
+
+def error_json(status):
+    """Compact JSON body for an error status"""
+    _, code, message = ERROR_PAGES[status]
+    return json.dumps({'error': code, 'message': message, 'status': status},
+                      separators=(',', ':')).encode('utf-8')
+
+
+def prefers_json(path, accept_mimetypes, api_prefix='/api/'):
+    """API paths, and clients that rank JSON above HTML, get JSON errors"""
+    if path.startswith(api_prefix):
+        return True
+    return accept_mimetypes.best_match(('text/html', 'application/json')) == 'application/json'
+
+
+class ErrorPages:
+    """Cached HTML/JSON bodies for error status codes, registered as error handlers"""
+
+    def __init__(self, app=None, api_prefix='/api/'):
+        self.api_prefix = api_prefix
+        self.html = {}
+        self.json = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Prerender every page (call after routes and template globals are registered)"""
+        with app.test_request_context(PRERENDER_PATH):
+            for status, (template, _, _) in ERROR_PAGES.items():
+                self.html[status] = render_template(template).encode('utf-8')
+                self.json[status] = error_json(status)
+        for status in ERROR_PAGES:
+            app.register_error_handler(status, self.handler(status))
+
+    def handler(self, status):
+        template = ERROR_PAGES[status][0]
+
+        def handle_error(e):
+            if prefers_json(request.path, request.accept_mimetypes, self.api_prefix):
+                return Response(self.json[status], status, mimetype='application/json')
+            if status != 500 and session.get('username'):
+                return render_template(template), status
+            return Response(self.html[status], status, mimetype='text/html')
+        handle_error.__name__ = f'handle_{status}'
+        return handle_error
@@ -0,0 +1,127 @@
+"""
+Compact flash messages for the Selenium testing demo.
+
+flask.flash() stores every message as a full (category, text) pair in the
+session, so a bad contact form put up to four sentences into the signed
+cookie and a redirect re-sent (and re-verified) them. Here the session
+holds a single list of short message codes plus their arguments:
+
+    session['_fm'] = [['name_short'], ['email_invalid'], ['login_ok', 'System Admin']]
+
+Texts live in MESSAGES and are expanded only when a template calls
+get_flashed_messages() (the same name and signature as Flask's, so
+base.html is unchanged). Arguments are truncated and the oldest entries
+dropped so the stored payload never exceeds MAX_PAYLOAD_BYTES.
+
+add_flash() and flashed_messages_reader() take the session (and g) to use,
+so the ASGI app stores the same compact entries through Quart's proxies.
+"""
+import json
+
+from flask import g, session
+from flask import get_flashed_messages as get_legacy_flashed_messages
+
+SESSION_KEY = '_fm'
+MAX_ARG_CHARS = 60
+MAX_PAYLOAD_BYTES = 512
+
+# code -> (category, text with str.format placeholders)
+MESSAGES = {
+    # Validation errors (the codes Form.validate() returns)
+    'name_short': ('error', 'Name must be at least 2 characters long.'),
+    'email_required': ('error', 'Email address is required.'),
+    'email_invalid': ('error', 'Please enter a valid email address.'),
+    'subject_short': ('error', 'Subject must be at least 5 characters long.'),
+    'message_short': ('error', 'Message must be at least 10 characters long.'),
+    'credentials_missing': ('error', 'Please enter both username and password.'),
+    # Authentication
+    'login_ok': ('success', 'Welcome back, {}! Login successful.'),
+    'login_failed': ('error', 'Invalid username or password. Please check your credentials and try again.'),
+    'login_throttled': ('error', 'Too many invalid login attempts. Please wait {} seconds before trying again.'),
+    'logout': ('info', 'Goodbye {}! You have been securely logged out. Thank you for using our platform.'),
+    'dashboard_login': ('warning', 'Please login to access the dashboard.'),
+    'profile_login': ('warning', 'Please login to view your profile.'),
+    'admin_login': ('warning', 'Please login as an administrator to view the contact inbox.'),
+    # Contact form
+    'contact_rate_limited': ('error', 'You are sending messages too quickly. Please wait {} seconds and try again.'),
+    'contact_duplicate': ('info', 'We already received this message and will respond soon.'),
+    'contact_sent': ('success', 'Thank you {}! Your message "{}" has been sent successfully. '
+                                'We will respond within 24 hours.')
+}
+
+
+def _clip(value):
+    value = str(value)
+    return value if len(value) <= MAX_ARG_CHARS else value[:MAX_ARG_CHARS - 1] + '…'
+
+
+def add_flash(session_, code, *args):
+    """Queue catalog message `code` in session_ for the next rendered page"""
+    if code not in MESSAGES:
+        raise KeyError(f'unknown flash message code {code!r}')
+    entries = session_.get(SESSION_KEY, [])
+    entries.append([code, *(_clip(arg) for arg in args)])
+    # Keep the newest messages that fit the payload budget
+    while len(entries) > 1 and len(json.dumps(entries, separators=(',', ':'))) > MAX_PAYLOAD_BYTES:
+        entries.pop(0)
+    session_[SESSION_KEY] = entries
+
+
+def flash_message(code, *args):
+    """Queue catalog message `code` for the next rendered page"""
+    add_flash(session, code, *args)
+
+
+def add_flash_errors(session_, errors):
+    """Queue validation error codes (from Form.validate) in session_"""
+    for code in errors:
+        add_flash(session_, code)
+
+
+def flash_errors(errors):
+    """Flash validation error codes (from Form.validate)"""
+    add_flash_errors(session, errors)
+
+
+def expand(entry):
+    """(category, text) for a stored [code, *args] entry"""
+    category, text = MESSAGES[entry[0]]
+    return category, text.format(*entry[1:])
+
+
+def has_pending_flashes(session_):
+    return SESSION_KEY in session_ or '_flashes' in session_
+
+
+def flashed_messages_reader(session_, g_, get_legacy):
+    """A get_flashed_messages() over the given session and g proxies"""
+
+    def get_flashed_messages(with_categories=False, category_filter=()):
+        """Drop-in for get_flashed_messages that also expands compact messages"""
+        messages = g_.get('_expanded_flashes')
+        if messages is None:
+            entries = session_.pop(SESSION_KEY) if SESSION_KEY in session_ else []
+            messages = [expand(entry) for entry in entries]
+            # Messages flashed with the framework's own flash() still show up
+            messages.extend(get_legacy(with_categories=True))
+            g_._expanded_flashes = messages
+        if category_filter:
+            messages = [message for message in messages if message[0] in category_filter]
+        if not with_categories:
+            return [text for _, text in messages]
+        return messages
+    return get_flashed_messages
+
+
+get_flashed_messages = flashed_messages_reader(session, g, get_legacy_flashed_messages)
+
+
+class FlashMessages:
+    """Makes templates use the compact get_flashed_messages()"""
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.jinja_env.globals['get_flashed_messages'] = get_flashed_messages
@@ -0,0 +1,142 @@
+"""
+Health reporting for the Selenium testing demo.
+
+/api/health is polled several times per second by load balancers, so its
+payload is rebuilt by a background thread into an immutable snapshot of
+pre-serialized JSON bytes plus an ETag; serving it does no per-request work.
+/api/health/deep reports process-level detail and is computed on demand.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque, namedtuple
+
+from flask import Response, jsonify, request
+
+Snapshot = namedtuple('Snapshot', ['body', 'etag'])
+
+logger = logging.getLogger(__name__)
+
+
+def process_rss_bytes():
+    """Current resident set size of this process in bytes"""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        import resource
+        # ru_maxrss is the peak RSS in kilobytes on Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class RequestStats:
+    """Sliding window of recent request latencies"""
+
+    def __init__(self, window=60.0, max_samples=10000):
+        self.window = window
+        self.total = 0
+        self._lock = threading.Lock()
+        self._samples = deque(maxlen=max_samples)
+
+    def record(self, latency):
+        with self._lock:
+            self.total += 1
+            self._samples.append((time.monotonic(), latency))
+
+    def reset(self):
+        with self._lock:
+            self.total = 0
+            self._samples.clear()
+
+    def summary(self):
+        """Request rate and latency percentiles over the window"""
+        cutoff = time.monotonic() - self.window
+        with self._lock:
+            samples = list(self._samples)
+        latencies = sorted(latency for stamp, latency in samples if stamp >= cutoff)
+
+        def percentile(p):
+            if not latencies:
+                return None
+            index = min(len(latencies) - 1, int(round(p / 100 * (len(latencies) - 1))))
+            return round(latencies[index] * 1000, 3)
+
+        return {
+            'requests_total': self.total,
+            'request_rate_per_sec': round(len(latencies) / self.window, 3),
+            'latency_ms': {
+                'p50': percentile(50),
+                'p95': percentile(95),
+                'p99': percentile(99)
+            }
+        }
+
+
+class HealthMonitor:
+    """Background-refreshed health snapshot plus on-demand deep report"""
+
+    def __init__(self, build_payload, interval=1.0):
+        self.build_payload = build_payload
+        self.interval = interval
+        self.started = time.time()
+        self.stats = RequestStats()
+        self._stop = threading.Event()
+        self.snapshot = self._build()
+        self._thread = None
+
+    def init_app(self, app):
+        """Start the refresher thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='health-refresher', daemon=True)
+            self._thread.start()
+
+    def _build(self):
+        body = json.dumps(self.build_payload(), sort_keys=True).encode('utf-8')
+        return Snapshot(body, hashlib.sha1(body).hexdigest()[:16])
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.snapshot = self._build()
+            except Exception as e:
+                # Keep serving the last good snapshot
+                logger.warning('Health snapshot refresh failed: %s', e)
+
+    def stop(self):
+        self._stop.set()
+
+    def record_request(self, endpoint, seconds):
+        """Request observer fed by the metrics timing hooks"""
+        self.stats.record(seconds)
+
+    def response(self, request_=request, response_class=Response):
+        """Serve the current snapshot, answering If-None-Match with 304
+
+        The ASGI app passes Quart's request and Response class.
+        """
+        snapshot = self.snapshot
+        if snapshot.etag in request_.if_none_match:
+            response = response_class(status=304)
+        else:
+            response = response_class(snapshot.body, mimetype='application/json')
+        response.set_etag(snapshot.etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+
+    def deep_report(self):
+        """Process RSS, uptime, request rate and latency percentiles"""
+        report = json.loads(self.snapshot.body)
+        report.update({
+            'uptime_seconds': round(time.time() - self.started, 3),
+            'process_rss_bytes': process_rss_bytes(),
+            'pid': os.getpid(),
+            'threads': threading.active_count()
+        })
+        report.update(self.stats.summary())
+        return report
+
+    def deep_response(self):
+        return jsonify(self.deep_report())
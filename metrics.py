@@ -0,0 +1,171 @@
+"""
+Request latency metrics for the Selenium testing demo.
+
+Per-endpoint latency histograms with HDR-style log-linear buckets, recorded
+separately for whole-request, handler and template render time, plus any
+counters other components register with add_counter(). Each thread
+records into its own shard without locking; shards are merged only when
+/metrics is scraped and rendered in the Prometheus text format.
+"""
+import bisect
+import threading
+import time
+
+from flask import Response, before_render_template, g, request, template_rendered
+
+SERIES = (
+    ('http_request_duration_seconds', 'Total request handling time'),
+    ('http_handler_duration_seconds', 'Request handling time excluding template rendering'),
+    ('template_render_duration_seconds', 'Template rendering time')
+)
+
+
+def log_linear_bounds(lowest=25e-6, highest=60.0, steps_per_octave=2):
+    """Bucket upper bounds growing geometrically (HDR-style) from lowest to highest"""
+    bounds = []
+    factor = 2 ** (1 / steps_per_octave)
+    bound = lowest
+    while bound < highest:
+        bounds.append(float(f'{bound:.3g}'))
+        bound *= factor
+    bounds.append(highest)
+    return tuple(bounds)
+
+
+class Metrics:
+    """Per-thread sharded latency histograms keyed by (series, endpoint)"""
+
+    def __init__(self, bounds=None):
+        self.bounds = bounds or log_linear_bounds()
+        self._local = threading.local()
+        self._registry_lock = threading.Lock()
+        # (thread, shard) for every thread that has recorded anything
+        self._shards = []
+        # Merged counts from threads that have exited
+        self._retired = {}
+        self._observers = []
+        # (series, help, label, read) where read() returns {label value: count}
+        self._counters = []
+
+    def init_app(self, app):
+        """Register timing hooks and template render signals on app"""
+        app.before_request(self._start_timer)
+        app.teardown_request(self._finish_timer)
+        before_render_template.connect(self._render_started, app)
+        template_rendered.connect(self._render_finished, app)
+
+    def reset(self):
+        """Drop every recorded sample"""
+        with self._registry_lock:
+            for _, shard in self._shards:
+                shard.clear()
+            self._retired = {}
+
+    def add_counter(self, series, help_text, read, label='outcome'):
+        """Export read() -> {label value: count} as a Prometheus counter"""
+        self._counters.append((series, help_text, label, read))
+
+    def add_observer(self, callback):
+        """Call callback(endpoint, seconds) after every request"""
+        self._observers.append(callback)
+
+    def _shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._registry_lock:
+                self._shards.append((threading.current_thread(), shard))
+        return shard
+
+    def observe(self, series, endpoint, seconds):
+        """Record one sample; lock-free on the calling thread's shard"""
+        shard = self._shard()
+        entry = shard.get((series, endpoint))
+        if entry is None:
+            # [bucket counts..., +Inf count], sum
+            entry = shard[(series, endpoint)] = [[0] * (len(self.bounds) + 1), 0.0]
+        entry[0][bisect.bisect_left(self.bounds, seconds)] += 1
+        entry[1] += seconds
+
+    def _start_timer(self):
+        g.metrics_started = time.perf_counter()
+        g.metrics_render_time = 0.0
+
+    def _render_started(self, sender, template, context, **extra):
+        g.metrics_render_started = time.perf_counter()
+
+    def _render_finished(self, sender, template, context, **extra):
+        started = g.pop('metrics_render_started', None)
+        if started is not None:
+            g.metrics_render_time = g.get('metrics_render_time', 0.0) + time.perf_counter() - started
+
+    def _finish_timer(self, exc=None):
+        started = g.pop('metrics_started', None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        self.record(request.endpoint, elapsed, g.pop('metrics_render_time', 0.0))
+
+    def record(self, endpoint, elapsed, render_time=0.0):
+        """Record one finished request (also called by the ASGI app's own hooks)"""
+        endpoint = endpoint or 'unmatched'
+        self.observe('http_request_duration_seconds', endpoint, elapsed)
+        self.observe('http_handler_duration_seconds', endpoint, elapsed - render_time)
+        if render_time:
+            self.observe('template_render_duration_seconds', endpoint, render_time)
+        for callback in self._observers:
+            callback(endpoint, elapsed)
+
+    @staticmethod
+    def _merge_into(target, shard):
+        for key, (counts, total) in list(shard.items()):
+            merged = target.get(key)
+            if merged is None:
+                target[key] = [list(counts), total]
+            else:
+                merged[0] = [a + b for a, b in zip(merged[0], counts)]
+                merged[1] += total
+
+    def collect(self):
+        """Merge all shards into {(series, endpoint): [counts, sum]}"""
+        merged = {}
+        with self._registry_lock:
+            live = []
+            for thread, shard in self._shards:
+                if thread.is_alive():
+                    live.append((thread, shard))
+                else:
+                    # Fold finished threads away so shards do not accumulate
+                    self._merge_into(self._retired, shard)
+            self._shards = live
+            self._merge_into(merged, self._retired)
+            for _, shard in live:
+                self._merge_into(merged, shard)
+        return merged
+
+    def render(self):
+        """Prometheus text exposition of every histogram"""
+        merged = self.collect()
+        lines = []
+        labels = [f'{bound:g}' for bound in self.bounds] + ['+Inf']
+        for series, help_text in SERIES:
+            lines.append(f'# HELP {series} {help_text}')
+            lines.append(f'# TYPE {series} histogram')
+            for (name, endpoint), (counts, total) in sorted(merged.items()):
+                if name != series:
+                    continue
+                cumulative = 0
+                for label, count in zip(labels, counts):
+                    cumulative += count
+                    lines.append(f'{series}_bucket{{endpoint="{endpoint}",le="{label}"}} {cumulative}')
+                lines.append(f'{series}_sum{{endpoint="{endpoint}"}} {total:.6f}')
+                lines.append(f'{series}_count{{endpoint="{endpoint}"}} {cumulative}')
+        for series, help_text, label, read in self._counters:
+            lines.append(f'# HELP {series} {help_text}')
+            lines.append(f'# TYPE {series} counter')
+            for value, count in sorted(read().items()):
+                lines.append(f'{series}{{{label}="{value}"}} {count}')
+        return '\n'.join(lines) + '\n'
+
+    def response(self):
+        return Response(self.render(), mimetype='text/plain; version=0.0.4')
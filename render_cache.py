@@ -0,0 +1,96 @@
+"""
+Rendered page cache for the Selenium testing demo.
+
+Pages such as index, about and features only vary by the endpoint (active
+nav link), the logged-in username shown in the nav, and the template files
+themselves. Their rendered HTML is cached in an LRU keyed by exactly that,
+so repeat hits skip Jinja. Entries are invalidated automatically when a
+template or any template it extends/includes changes on disk, and the cache
+is bypassed while flash messages are pending. Files are only re-stat'ed
+while Jinja auto-reload is on (debug mode); otherwise Jinja keeps serving
+the templates it compiled until the next reload anyway.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from flask import render_template, request, session
+from jinja2 import meta
+
+from flashes import has_pending_flashes
+
+
+class RenderCache:
+    """LRU of rendered template output keyed by (endpoint, auth state, mtimes)"""
+
+    def __init__(self, app=None, max_entries=256, check_interval=1.0):
+        self.max_entries = max_entries
+        self.check_interval = check_interval
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        # template name -> (files it depends on, last stat time, their mtimes)
+        self._dependencies = {}
+        self.app = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+
+    def _template_files(self, name, seen=None):
+        """Filenames of a template plus everything it extends or includes"""
+        seen = seen if seen is not None else set()
+        if name in seen:
+            return []
+        seen.add(name)
+        env = self.app.jinja_env
+        source, filename, _ = env.loader.get_source(env, name)
+        files = [filename]
+        for parent in meta.find_referenced_templates(env.parse(source)):
+            if parent:
+                files.extend(self._template_files(parent, seen))
+        return files
+
+    def _mtimes(self, name):
+        """Current mtimes for a template's files, re-stat'ed at most once per check_interval"""
+        now = time.monotonic()
+        entry = self._dependencies.get(name)
+        if entry is None:
+            files = self._template_files(name)
+        else:
+            files, checked, mtimes = entry
+            if not self.app.jinja_env.auto_reload or now - checked < self.check_interval:
+                return mtimes
+        mtimes = tuple(os.stat(filename).st_mtime_ns for filename in files)
+        self._dependencies[name] = (files, now, mtimes)
+        return mtimes
+
+    def render(self, template_name):
+        """Render template_name (no extra context), serving cached bytes when possible"""
+        if not self.enabled or has_pending_flashes(session):
+            return render_template(template_name)
+
+        key = (request.endpoint, session.get('username'), template_name, self._mtimes(template_name))
+        with self._lock:
+            html = self._entries.get(key)
+            if html is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return html
+
+        html = render_template(template_name)
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = html
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return html
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._dependencies.clear()
@@ -0,0 +1,231 @@
+"""
+Streaming test report: JSONL results plus a compact HTML view.
+
+Each process that runs tests (the main pytest process, or every xdist
+worker) appends one JSON line per finished test to its own
+results-<worker>.jsonl and flushes it immediately, so a killed run still
+leaves a usable report. At the end of the session the controller merges
+every JSONL file in the run directory into report.html: a single small
+page with inline CSS, collapsible failure details and lazy-loaded
+screenshot links (images are never embedded).
+
+Enable with `pytest --report-dir reports`; results land in
+reports/run-<id>/. Reports from separate runs or CI shards can be merged
+afterwards:
+
+    python report.py render reports/run-A reports/run-B -o merged.html
+    python report.py merge reports/run-A/*.jsonl -o merged.jsonl
+"""
+import argparse
+import glob
+import html
+import json
+import os
+import sys
+import time
+
+import pytest
+
+from artifacts import new_run_id
+
+MAX_TEXT = 4000
+OUTCOME_ORDER = ('failed', 'error', 'xpassed', 'passed', 'xfailed', 'skipped')
+
+
+def _truncate(text, limit=MAX_TEXT):
+    if text and len(text) > limit:
+        return text[:limit] + f'\n… ({len(text) - limit} more characters)'
+    return text
+
+
+class StreamingReporter:
+    """pytest plugin writing one JSON line per finished test"""
+
+    def __init__(self, run_dir, worker_id=None):
+        self.run_dir = run_dir
+        self.worker_id = worker_id or 'main'
+        self._tests = {}
+        os.makedirs(run_dir, exist_ok=True)
+        self._output = open(os.path.join(run_dir, f'results-{self.worker_id}.jsonl'), 'a', encoding='utf-8')
+
+    def pytest_runtest_logreport(self, report):
+        record = self._tests.setdefault(report.nodeid, {
+            'nodeid': report.nodeid,
+            'outcome': 'passed',
+            'duration': 0.0,
+            'worker': self.worker_id,
+            'artifacts': []
+        })
+        record['duration'] += report.duration
+
+        if report.when == 'call':
+            if hasattr(report, 'wasxfail'):
+                record['outcome'] = 'xfailed' if report.skipped else 'xpassed'
+            else:
+                record['outcome'] = report.outcome
+        elif report.failed:
+            record['outcome'] = 'error'
+        elif report.skipped and report.when == 'setup':
+            record['outcome'] = 'skipped'
+
+        if report.failed or (report.skipped and report.when == 'setup'):
+            record['phase'] = report.when
+            record['message'] = _truncate(report.longreprtext)
+            if report.capstdout:
+                record['stdout'] = _truncate(report.capstdout, 2000)
+
+        if report.when == 'teardown':
+            for name, value in report.user_properties:
+                if name == 'artifact':
+                    label, path = value
+                    record['artifacts'].append({'name': label, 'path': os.path.abspath(path)})
+                elif name == 'wait_seconds':
+                    record['wait_seconds'] = list(value)
+                elif name == 'step_timings':
+                    record['step_timings'] = value
+            record['finished'] = time.time()
+            self._write(self._tests.pop(report.nodeid))
+
+    def _write(self, record):
+        self._output.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._output.flush()
+
+    def close(self):
+        self._output.close()
+
+
+def read_results(paths):
+    """Load records from JSONL files and/or directories of them; later records win"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, '*.jsonl'))))
+        else:
+            files.append(path)
+    records = {}
+    for filename in files:
+        with open(filename, encoding='utf-8') as results:
+            for line in results:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # a line cut short by a killed run
+                records[record['nodeid']] = record
+    return list(records.values())
+
+
+_CSS = """
+body{font:14px/1.4 system-ui,sans-serif;margin:1.5em;color:#222}
+h1{font-size:1.3em}.summary span{margin-right:1em;font-weight:600}
+table{border-collapse:collapse;width:100%}td,th{padding:4px 8px;border-bottom:1px solid #eee;text-align:left;vertical-align:top}
+.passed{color:#1a7f37}.failed,.error,.xpassed{color:#cf222e}.skipped,.xfailed{color:#9a6700}
+pre{white-space:pre-wrap;background:#f6f8fa;padding:8px;max-height:30em;overflow:auto}
+img{max-width:480px;display:block;margin:4px 0;border:1px solid #ddd}
+"""
+
+
+def render_html(records, output_path, title='Selenium Testing Demo – test report'):
+    """Write a compact HTML page for records; screenshot links are relative to output_path"""
+    base = os.path.dirname(os.path.abspath(output_path))
+    records = sorted(records, key=lambda r: (OUTCOME_ORDER.index(r['outcome'])
+                                             if r['outcome'] in OUTCOME_ORDER else 0, r['nodeid']))
+    counts = {}
+    for record in records:
+        counts[record['outcome']] = counts.get(record['outcome'], 0) + 1
+    total_time = sum(record['duration'] for record in records)
+
+    esc = html.escape
+    rows = []
+    for record in records:
+        details = []
+        if record.get('message'):
+            details.append(f"<details><summary>{esc(record.get('phase', ''))} output</summary>"
+                           f"<pre>{esc(record['message'])}</pre>")
+            if record.get('stdout'):
+                details.append(f"<pre>{esc(record['stdout'])}</pre>")
+            details.append('</details>')
+        for artifact in record.get('artifacts', []):
+            href = esc(os.path.relpath(artifact['path'], base))
+            details.append(f'<details><summary>📸 {esc(artifact["name"])}</summary>'
+                           f'<a href="{href}"><img loading="lazy" src="{href}" alt=""></a></details>')
+        rows.append(
+            f"<tr><td class=\"{esc(record['outcome'])}\">{esc(record['outcome'])}</td>"
+            f"<td>{record['duration']:.2f}s</td><td>{esc(record['nodeid'])}{''.join(details)}</td>"
+            f"<td>{esc(record.get('worker', ''))}</td></tr>"
+        )
+
+    summary = ''.join(f'<span class="{esc(k)}">{v} {esc(k)}</span>' for k, v in sorted(counts.items()))
+    page = (
+        f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>{esc(title)}</title>'
+        f'<style>{_CSS}</style></head><body><h1>{esc(title)}</h1>'
+        f'<p class="summary">{summary}<span>{len(records)} tests, {total_time:.1f}s</span></p>'
+        f'<table><tr><th>Result</th><th>Time</th><th>Test</th><th>Worker</th></tr>'
+        f'{"".join(rows)}</table></body></html>'
+    )
+    with open(output_path, 'w', encoding='utf-8') as output:
+        output.write(page)
+    return counts
+
+
+def pytest_addoption(parser):
+    parser.addoption('--report-dir', default=None,
+                     help='write streaming JSONL results and report.html under DIR/run-<id>/')
+
+
+def pytest_configure(config):
+    report_dir = config.getoption('report_dir')
+    if not report_dir:
+        return
+    # Same run id as the screenshot directory (inherited by xdist workers)
+    run_id = os.environ.setdefault('ARTIFACT_RUN_ID', new_run_id())
+    run_dir = os.path.join(report_dir, f'run-{run_id}')
+    config._report_run_dir = run_dir
+    # Under xdist only the workers run tests; the controller just renders
+    if not hasattr(config, 'workerinput') and getattr(config.option, 'dist', 'no') != 'no':
+        return
+    worker_id = os.environ.get('PYTEST_XDIST_WORKER')
+    config._streaming_reporter = StreamingReporter(run_dir, worker_id)
+    config.pluginmanager.register(config._streaming_reporter, 'streaming-reporter')
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_unconfigure(config):
+    reporter = getattr(config, '_streaming_reporter', None)
+    if reporter is not None:
+        config.pluginmanager.unregister(reporter)
+        reporter.close()
+    run_dir = getattr(config, '_report_run_dir', None)
+    if run_dir and not hasattr(config, 'workerinput') and os.path.isdir(run_dir):
+        output_path = os.path.join(run_dir, 'report.html')
+        render_html(read_results([run_dir]), output_path)
+        print(f"📊 Test report: {output_path}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Render or merge streaming test results')
+    commands = parser.add_subparsers(dest='command', required=True)
+    render = commands.add_parser('render', help='render JSONL files/directories to HTML')
+    render.add_argument('inputs', nargs='+')
+    render.add_argument('-o', '--output', default='report.html')
+    merge = commands.add_parser('merge', help='merge JSONL files/directories into one JSONL file')
+    merge.add_argument('inputs', nargs='+')
+    merge.add_argument('-o', '--output', default='results.jsonl')
+    args = parser.parse_args(argv)
+
+    records = read_results(args.inputs)
+    if args.command == 'render':
+        counts = render_html(records, args.output)
+        print(f"📊 {len(records)} results → {args.output} ({counts})")
+    else:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            for record in records:
+                output.write(json.dumps(record, ensure_ascii=False) + '\n')
+        print(f"📦 {len(records)} results → {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""
+Scenario tables shared by the browser tier (test_selenium.py) and the
+HTTP tier (test_http.py), so both exercise exactly the same cases.
+
+Fields only the HTTP tier checks (such as the expected flash text) ride
+along in the same records; the Selenium tests ignore them.
+"""
+
+# Seeded accounts (see SEED_USERS in app.py)
+TEST_USERS = {
+    'admin': {'password': 'password123', 'role': 'Administrator', 'name': 'System Admin'},
+    'student': {'password': 'student123', 'role': 'Student', 'name': 'Test Student'},
+    'test_user': {'password': 'test123', 'role': 'Test User', 'name': 'Demo User'},
+    'qa_tester': {'password': 'qa123', 'role': 'QA Tester', 'name': 'Quality Assurance'}
+}
+
+# (page name, nav link text, path)
+NAVIGATION_PAGES = [
+    ("Home", "🏠 Home", "/"),
+    ("Login", "🔐 Login", "/login"),
+    ("Contact", "📧 Contact", "/contact"),
+    ("Features", "⭐ Features", "/features"),
+    ("About", "ℹ️ About", "/about")
+]
+
+MISSING_CREDENTIALS = 'Please enter both username and password.'
+INVALID_CREDENTIALS = 'Invalid username or password'
+
+# (username, password, description, expected server-side flash)
+INVALID_LOGIN_SCENARIOS = [
+    ("wrong_user", "wrong_pass", "Wrong username and password", INVALID_CREDENTIALS),
+    ("admin", "wrongpass", "Valid username, wrong password", INVALID_CREDENTIALS),
+    ("wronguser", "password123", "Wrong username, valid password", INVALID_CREDENTIALS),
+    ("", "", "Empty credentials", MISSING_CREDENTIALS),
+    ("admin", "", "Username only", MISSING_CREDENTIALS),
+    ("", "password123", "Password only", MISSING_CREDENTIALS),
+    ("admin123", "admin123", "Non-existent user", INVALID_CREDENTIALS),
+    ("admin'; DROP TABLE users;--", "password123", "SQL injection attempt", INVALID_CREDENTIALS)
+]
+
+CONTACT_FORM_SCENARIOS = [
+    {
+        'name': 'John Doe',
+        'email': 'john.doe@example.com',
+        'subject': 'Test Message from Selenium',
+        'message': 'This is a comprehensive test message for the contact form validation system.',
+        'expected': 'success',
+        'description': 'Valid form submission',
+        'flash': 'Thank you John Doe!'
+    },
+    {
+        'name': '',
+        'email': 'test@example.com',
+        'subject': 'Test Subject',
+        'message': 'Test message',
+        'expected': 'error',
+        'description': 'Empty name field',
+        'flash': 'Name must be at least 2 characters long.'
+    },
+    {
+        'name': 'Test User',
+        'email': 'invalid-email',
+        'subject': 'Test Subject',
+        'message': 'Test message with invalid email',
+        'expected': 'error',
+        'description': 'Invalid email format',
+        'flash': 'Please enter a valid email address.'
+    },
+    {
+        'name': 'Test User',
+        'email': 'test@example.com',
+        'subject': 'Hi',
+        'message': 'Short message',
+        'expected': 'error',
+        'description': 'Subject too short',
+        'flash': 'Subject must be at least 5 characters long.'
+    }
+]
+
+XSS_USERNAME = "<script>alert('XSS')</script>"
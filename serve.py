@@ -0,0 +1,334 @@
+"""
+Production launcher for the Selenium testing demo.
+
+Pre-forks a configurable number of worker processes that share one
+listening socket; each worker builds its own app via create_app() and
+serves requests from a bounded thread pool. The master process respawns
+crashed workers and handles signals:
+
+    SIGHUP           graceful reload (new workers start, old ones drain)
+    SIGTERM/SIGINT   graceful shutdown
+    SIGTTIN/SIGTTOU  add/remove one worker
+
+Usage:
+
+    python serve.py --bind 0.0.0.0:8000 --workers 4 --threads 8
+    python serve.py --config production.cfg
+    python serve.py --dev              # single-process reloader + debugger
+
+Workers import the app only after forking, so a SIGHUP reload picks up
+code changes. On platforms without os.fork a single worker runs in-process.
+
+Every worker has its own copy of the in-memory state (login throttles,
+contact rate limits, and any store left in memory), so with more than one
+worker keep users and sessions in SQLite (USER_DB_PATH, SESSION_BACKEND);
+workers warn at start-up when they are not. `python app.py` runs a single
+worker unless --workers is given.
+
+Outside --dev, each worker precompiles every template (through the
+--template-cache bytecode directory when given) and warms up all routes
+before it starts accepting connections; --cold turns that off.
+"""
+import argparse
+import importlib
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.serving import BaseWSGIServer
+
+DEFAULT_BIND = '127.0.0.1:8000'
+
+# Config defaults for production workers (environment and --config still win)
+PRODUCTION_DEFAULTS = {
+    'TEMPLATE_PRECOMPILE': True,
+    'WARM_UP': True
+}
+
+# (config key, value, store) for stores kept in worker memory, invisible to other workers
+PROCESS_LOCAL_STORES = (
+    ('USER_DB_PATH', None, 'users'),
+    ('SESSION_BACKEND', 'memory', 'sessions'),
+    ('CONTACT_DB_PATH', ':memory:', 'contact messages')
+)
+
+
+class PooledWSGIServer(BaseWSGIServer):
+    """Werkzeug server that handles connections on a fixed-size thread pool"""
+
+    def __init__(self, host, port, app, threads=8, fd=None):
+        super().__init__(host, port, app, fd=fd)
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='wsgi')
+
+    def process_request(self, request, client_address):
+        self.executor.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        if hasattr(self, 'executor'):
+            # Let in-flight requests finish before the worker exits
+            self.executor.shutdown(wait=True)
+
+
+def parse_bind(bind):
+    host, _, port = bind.rpartition(':')
+    return (host or '127.0.0.1').strip('[]'), int(port)
+
+
+def load_app(target, config, defaults=None):
+    """Import 'module:factory' and build the app with defaults < environment < config"""
+    module_name, _, factory_name = target.partition(':')
+    module = importlib.import_module(module_name)
+    factory = getattr(module, factory_name or 'create_app')
+    overrides = dict(defaults or {})
+    if hasattr(module, 'config_from_env'):
+        overrides.update(module.config_from_env())
+    overrides.update(config)
+    return factory(overrides)
+
+
+def production_defaults(args):
+    if args.cold:
+        return {}
+    defaults = dict(PRODUCTION_DEFAULTS)
+    if args.template_cache:
+        defaults['TEMPLATE_CACHE_DIR'] = args.template_cache
+    return defaults
+
+
+def load_config(path):
+    """Read an optional Flask-style config file into a dict"""
+    if not path:
+        return {}
+    namespace = {}
+    with open(path) as config_file:
+        exec(compile(config_file.read(), path, 'exec'), namespace)
+    return {key: value for key, value in namespace.items() if key.isupper()}
+
+
+def process_local_stores(config):
+    """Names of the stores this config keeps in process memory"""
+    return [store for key, value, store in PROCESS_LOCAL_STORES if key in config and config[key] == value]
+
+
+def close_app(app):
+    """Flush and close the app's stores (a forked worker's os._exit skips atexit)"""
+    monitor = app.extensions.get('health_monitor')
+    if monitor is not None:
+        monitor.stop()
+    for name in ('contact_messages', 'users_db'):
+        close = getattr(app.extensions.get(name), 'close', None)
+        if close is not None:
+            close()
+
+
+def create_listener(host, port, backlog=2048):
+    family = socket.AF_INET6 if ':' in host else socket.AF_INET
+    listener = socket.socket(family, socket.SOCK_STREAM)
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listener.bind((host, port))
+    listener.listen(backlog)
+    listener.set_inheritable(True)
+    return listener
+
+
+def run_worker(listener, args, config, forked=True):
+    """Serve requests on the shared listener until told to stop"""
+    started = time.perf_counter()
+    app = load_app(args.app, config, production_defaults(args))
+    precompiler = app.extensions.get('template_precompiler')
+    if precompiler is not None:
+        print(f"🔥 Worker {os.getpid()} ready in {(time.perf_counter() - started) * 1000:.0f} ms "
+              f"({len(precompiler.compiled)} templates compiled in {precompiler.seconds * 1000:.0f} ms)")
+    local_stores = process_local_stores(app.config)
+    if args.workers > 1 and local_stores:
+        print(f"⚠️ Worker {os.getpid()} keeps {', '.join(local_stores)} in memory; the other "
+              f"{args.workers - 1} worker(s) will not see them (use SQLite paths or --workers 1)")
+    host, port = listener.getsockname()[:2]
+    server = PooledWSGIServer(host, port, app, threads=args.threads, fd=listener.fileno())
+
+    def stop(signum, frame):
+        # shutdown() blocks until serve_forever returns, so call it off the main thread
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, stop)
+    # Forked workers leave Ctrl-C and reload/scaling signals to the master
+    signal.signal(signal.SIGINT, signal.SIG_IGN if forked else stop)
+    if hasattr(signal, 'SIGHUP'):
+        for signum in (signal.SIGHUP, signal.SIGTTIN, signal.SIGTTOU):
+            signal.signal(signum, signal.SIG_IGN)
+    try:
+        server.serve_forever(poll_interval=0.5)
+    finally:
+        server.server_close()
+        close_app(app)
+
+
+class Master:
+    """Pre-fork master: keeps N workers alive and handles reload/shutdown"""
+
+    def __init__(self, listener, args, config):
+        self.listener = listener
+        self.args = args
+        self.config = config
+        self.workers = {}  # pid -> generation
+        self.generation = 0
+        self.target_workers = args.workers
+        self._signals = []
+
+    def spawn(self):
+        # Flush first so buffered output is not duplicated into the child
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid == 0:
+            status = 0
+            try:
+                run_worker(self.listener, self.args, self.config)
+            except Exception as e:
+                print(f"❌ Worker {os.getpid()} failed: {e}", file=sys.stderr)
+                status = 1
+            finally:
+                os._exit(status)
+        self.workers[pid] = self.generation
+        return pid
+
+    def kill_generation(self, generation):
+        for pid, worker_generation in list(self.workers.items()):
+            if worker_generation == generation:
+                self._kill(pid, signal.SIGTERM)
+
+    @staticmethod
+    def _kill(pid, signum):
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
+
+    def _queue_signal(self, signum, frame):
+        self._signals.append(signum)
+
+    def reap(self):
+        """Collect exited workers; returns how many exited"""
+        exited = 0
+        while True:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            self.workers.pop(pid, None)
+            exited += 1
+        return exited
+
+    def current_workers(self):
+        return [pid for pid, gen in self.workers.items() if gen == self.generation]
+
+    def reload(self):
+        """Start a fresh generation and drain the old one right away.
+
+        The listener stays open in the master, so connections that arrive
+        while the new workers boot wait in its backlog rather than failing.
+        """
+        old_generation = self.generation
+        self.generation += 1
+        for _ in range(self.target_workers):
+            self.spawn()
+        print(f"🔄 Reloaded: generation {self.generation} started, draining generation {old_generation}")
+        self.kill_generation(old_generation)
+
+    def shutdown(self, timeout):
+        print("🛑 Shutting down workers...")
+        for pid in list(self.workers):
+            self._kill(pid, signal.SIGTERM)
+        deadline = time.monotonic() + timeout
+        while self.workers and time.monotonic() < deadline:
+            self.reap()
+            time.sleep(0.1)
+        for pid in list(self.workers):
+            self._kill(pid, signal.SIGKILL)
+        self.reap()
+
+    def run(self):
+        for signum in (signal.SIGHUP, signal.SIGTERM, signal.SIGINT, signal.SIGTTIN, signal.SIGTTOU):
+            signal.signal(signum, self._queue_signal)
+
+        for _ in range(self.target_workers):
+            self.spawn()
+
+        while True:
+            while self._signals:
+                signum = self._signals.pop(0)
+                if signum in (signal.SIGTERM, signal.SIGINT):
+                    self.shutdown(self.args.graceful_timeout)
+                    return
+                if signum == signal.SIGHUP:
+                    self.reload()
+                elif signum == signal.SIGTTIN:
+                    self.target_workers += 1
+                elif signum == signal.SIGTTOU and self.target_workers > 1:
+                    self.target_workers -= 1
+                    current = self.current_workers()
+                    if current:
+                        self._kill(current[-1], signal.SIGTERM)
+
+            self.reap()
+            # Respawn crashed workers of the current generation
+            for _ in range(self.target_workers - len(self.current_workers())):
+                self.spawn()
+            time.sleep(0.2)
+
+
+def build_parser(default_bind=DEFAULT_BIND, default_workers=None):
+    default_workers = default_workers or os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description='Run the Selenium testing demo app')
+    parser.add_argument('--bind', default=default_bind, help=f'host:port to listen on (default {default_bind})')
+    parser.add_argument('--workers', type=int, default=default_workers,
+                        help=f'worker processes (default {default_workers})')
+    parser.add_argument('--threads', type=int, default=8, help='request threads per worker (default 8)')
+    parser.add_argument('--app', default='app:create_app', help="app factory as 'module:callable'")
+    parser.add_argument('--config', help='Python config file with UPPERCASE settings')
+    parser.add_argument('--graceful-timeout', type=float, default=30.0, help='seconds to let workers drain on shutdown')
+    parser.add_argument('--dev', action='store_true', help='single-process dev server with reloader and debugger')
+    parser.add_argument('--cold', action='store_true',
+                        help='skip template precompilation and route warm-up (templates compile lazily)')
+    parser.add_argument('--template-cache', metavar='DIR', help='on-disk Jinja bytecode cache directory')
+    return parser
+
+
+def main(argv=None, default_bind=DEFAULT_BIND, default_workers=None):
+    args = build_parser(default_bind, default_workers).parse_args(argv)
+    config = load_config(args.config)
+    host, port = parse_bind(args.bind)
+
+    if args.dev:
+        app = load_app(args.app, config)
+        app.run(debug=True, host=host, port=port)
+        return
+
+    listener = create_listener(host, port)
+    print(f"🚀 Serving on http://{host}:{port} with {args.workers} worker(s) x {args.threads} thread(s)")
+
+    if not hasattr(os, 'fork') or args.workers <= 1:
+        run_worker(listener, args, config, forked=False)
+        return
+
+    print(f"👷 Master pid {os.getpid()} (SIGHUP reload, SIGTERM stop)")
+    Master(listener, args, config).run()
+
+
+if __name__ == '__main__':
+    main()
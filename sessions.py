@@ -0,0 +1,181 @@
+"""
+Optional server-side sessions for the Selenium testing demo.
+
+Flask's default session serializes and signs the whole session dict into
+the cookie on every request. With a server-side backend the cookie only
+carries a short random session id; the data lives in an in-memory LRU or a
+SQLite table, and clearing a session (logout) revokes it on the server.
+"""
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SecureCookieSession, SessionInterface
+
+SESSION_BACKENDS = ('cookie', 'memory', 'sqlite')
+
+
+class ServerSideSession(SecureCookieSession):
+    """Session dict tied to a server-side record by an opaque id"""
+
+    def __init__(self, initial=None, sid=None):
+        super().__init__(initial)
+        self.sid = sid
+        self.revoked_sid = None
+
+    def clear(self):
+        # Clearing a session (login/logout) rotates its id and revokes the old record
+        if self.sid and not self.revoked_sid:
+            self.revoked_sid = self.sid
+            self.sid = None
+        super().clear()
+
+
+class MemorySessionBackend:
+    """In-memory LRU of session records with TTL expiry"""
+
+    def __init__(self, ttl=86400, max_entries=100000, clock=time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        # sid -> (expires_at, serialized data)
+        self._entries = OrderedDict()
+
+    def get(self, sid):
+        with self._lock:
+            entry = self._entries.get(sid)
+            if entry is None:
+                return None
+            if entry[0] < self._clock():
+                del self._entries[sid]
+                return None
+            self._entries.move_to_end(sid)
+            return entry[1]
+
+    def set(self, sid, data):
+        with self._lock:
+            self._entries[sid] = (self._clock() + self.ttl, data)
+            self._entries.move_to_end(sid)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, sid):
+        with self._lock:
+            self._entries.pop(sid, None)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteSessionBackend:
+    """SQLite table of session records with TTL expiry"""
+
+    def __init__(self, path, ttl=86400, purge_every=1000):
+        self.ttl = ttl
+        self.purge_every = purge_every
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS sessions ('
+            'sid TEXT PRIMARY KEY, data TEXT NOT NULL, expires_at REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions (expires_at)')
+
+    def get(self, sid):
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT data FROM sessions WHERE sid = ? AND expires_at >= ?', (sid, time.time())
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, sid, data):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO sessions (sid, data, expires_at) VALUES (?, ?, ?)',
+                (sid, data, now + self.ttl)
+            )
+            self._writes += 1
+            if self._writes % self.purge_every == 0:
+                self._conn.execute('DELETE FROM sessions WHERE expires_at < ?', (now,))
+
+    def delete(self, sid):
+        with self._lock:
+            self._conn.execute('DELETE FROM sessions WHERE sid = ?', (sid,))
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM sessions').fetchone()[0]
+
+
+class ServerSideSessionInterface(SessionInterface):
+    """Flask session interface storing session data in a backend"""
+
+    session_class = ServerSideSession
+    serializer = TaggedJSONSerializer()
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if sid:
+            data = self.backend.get(sid)
+            if data is not None:
+                try:
+                    return self.session_class(self.serializer.loads(data), sid=sid)
+                except ValueError:
+                    self.backend.delete(sid)
+        return self.session_class()
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if session.accessed:
+            response.vary.add('Cookie')
+
+        if session.revoked_sid:
+            self.backend.delete(session.revoked_sid)
+
+        if not session:
+            if session.modified or session.revoked_sid:
+                response.delete_cookie(name, domain=domain, path=path,
+                                       secure=self.get_cookie_secure(app),
+                                       httponly=self.get_cookie_httponly(app),
+                                       samesite=self.get_cookie_samesite(app))
+            return
+
+        if not (session.modified or self.should_set_cookie(app, session)):
+            return
+
+        if session.sid is None:
+            session.sid = secrets.token_urlsafe(24)
+        self.backend.set(session.sid, self.serializer.dumps(dict(session)))
+        response.set_cookie(
+            name, session.sid,
+            expires=self.get_expiration_time(app, session),
+            httponly=self.get_cookie_httponly(app),
+            domain=domain,
+            path=path,
+            secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app)
+        )
+
+
+def create_session_interface(backend='cookie', path='sessions.db', ttl=86400):
+    """Session interface for the named backend (None keeps Flask's signed cookies)"""
+    if backend == 'cookie':
+        return None
+    if backend == 'memory':
+        return ServerSideSessionInterface(MemorySessionBackend(ttl=ttl))
+    if backend == 'sqlite':
+        return ServerSideSessionInterface(SQLiteSessionBackend(path, ttl=ttl))
+    raise ValueError(f"Unknown session backend '{backend}' (expected one of {SESSION_BACKENDS})")
@@ -0,0 +1,152 @@
+"""
+Contact-form spam control for the Selenium testing demo.
+
+Two cheap checks run before a submission reaches the contact store:
+
+  * a token bucket per client (logged-in user, else client IP) that allows
+    a short burst and then a steady rate of submissions, and
+  * a duplicate filter remembering a fingerprint (hash of the normalized
+    email, subject and message) of every accepted message for a time
+    window, so a bot replaying the same form is turned away.
+
+Both are bounded LRU tables like LoginThrottle. Outcomes are counted and
+exported on /metrics as contact_submissions_total.
+"""
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+
+
+def fingerprint(email, subject, message):
+    """Digest of a submission that ignores case and whitespace differences"""
+    normalized = '\x1f'.join(' '.join(part.casefold().split()) for part in (email, subject, message))
+    return hashlib.blake2b(normalized.encode('utf-8'), digest_size=16).digest()
+
+
+class TokenBucketLimiter:
+    """Bounded, thread-safe token buckets keyed by client (rate 0 disables the limit)"""
+
+    def __init__(self, rate=0.1, burst=5, max_entries=10000, clock=time.monotonic):
+        if rate < 0:
+            raise ValueError(f'Token bucket rate must be >= 0 (0 disables the limit), got {rate}')
+        self.rate = rate  # tokens added per second
+        self.burst = burst
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> [tokens, last refill]
+        self._buckets = OrderedDict()
+
+    def acquire(self, key):
+        """Take a token for key; returns 0 on success, else seconds until one is available"""
+        if not self.rate:
+            return 0
+        now = self._clock()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [float(self.burst), now]
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+            # Evicting the least recently seen client only ever gives it a full bucket back
+            while len(self._buckets) > self.max_entries:
+                self._buckets.popitem(last=False)
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return 0
+            return math.ceil((1 - bucket[0]) / self.rate)
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+class DuplicateFilter:
+    """Time-expiring set of fingerprints with a hard size bound"""
+
+    def __init__(self, window=3600.0, max_entries=100000, clock=time.monotonic):
+        self.window = window
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        # fingerprint -> expiry, oldest first (every entry gets the same window)
+        self._seen = OrderedDict()
+
+    def check_and_add(self, digest):
+        """True if digest was seen within the window; otherwise remember it and return False"""
+        now = self._clock()
+        with self._lock:
+            while self._seen:
+                oldest, expires = next(iter(self._seen.items()))
+                if expires > now:
+                    break
+                del self._seen[oldest]
+            if digest in self._seen:
+                return True
+            self._seen[digest] = now + self.window
+            while len(self._seen) > self.max_entries:
+                self._seen.popitem(last=False)
+            return False
+
+    def clear(self):
+        with self._lock:
+            self._seen.clear()
+
+    def __len__(self):
+        return len(self._seen)
+
+
+class ContactGuard:
+    """Rate limit plus duplicate check for contact submissions, with outcome counters"""
+
+    OUTCOMES = ('accepted', 'rate_limited', 'duplicate')
+
+    def __init__(self, app=None, limiter=None, duplicates=None):
+        self.limiter = limiter or TokenBucketLimiter()
+        self.duplicates = duplicates or DuplicateFilter()
+        self._lock = threading.Lock()
+        self.counts = dict.fromkeys(self.OUTCOMES, 0)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        config = app.config
+        self.limiter = TokenBucketLimiter(rate=config['CONTACT_RATE_PER_MINUTE'] / 60.0,
+                                          burst=config['CONTACT_BURST'])
+        self.duplicates = DuplicateFilter(window=config['CONTACT_DEDUP_WINDOW'],
+                                          max_entries=config['CONTACT_DEDUP_MAX_ENTRIES'])
+
+    def _count(self, outcome):
+        with self._lock:
+            self.counts[outcome] += 1
+
+    def retry_after(self, client):
+        """Spend a token for client; 0 if the submission may proceed, else seconds to wait"""
+        wait = self.limiter.acquire(client)
+        if wait:
+            self._count('rate_limited')
+        return wait
+
+    def is_duplicate(self, email, subject, message):
+        """Reject a repeat of a recent message; otherwise record it as accepted"""
+        if self.duplicates.check_and_add(fingerprint(email, subject, message)):
+            self._count('duplicate')
+            return True
+        self._count('accepted')
+        return False
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counts)
+
+    def clear(self):
+        """Forget buckets and fingerprints (counters are kept)"""
+        self.limiter.clear()
+        self.duplicates.clear()
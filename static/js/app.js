@@ -0,0 +1,33 @@
+// Enhanced user experience with animations
+document.addEventListener('DOMContentLoaded', function() {
+    // Animate flash messages
+    const flashMessages = document.querySelectorAll('.flash-success, .flash-error, .flash-info, .flash-warning');
+    flashMessages.forEach(msg => {
+        setTimeout(() => {
+            msg.style.animation = 'slideIn 0.5s ease-out';
+        }, 100);
+    });
+
+    // Auto-hide flash messages after 5 seconds
+    flashMessages.forEach(msg => {
+        setTimeout(() => {
+            msg.style.transition = 'opacity 0.5s ease-out';
+            msg.style.opacity = '0';
+            setTimeout(() => {
+                msg.remove();
+            }, 500);
+        }, 5000);
+    });
+
+    // Add loading animation to form submissions
+    const forms = document.querySelectorAll('form');
+    forms.forEach(form => {
+        form.addEventListener('submit', function() {
+            const submitBtn = form.querySelector('button[type="submit"], input[type="submit"]');
+            if (submitBtn) {
+                submitBtn.innerHTML = '<span class="loading"></span> Processing...';
+                submitBtn.disabled = true;
+            }
+        });
+    });
+});
@@ -0,0 +1,103 @@
+import json
+import os
+
+import pytest
+
+from artifacts import RUN_PREFIX, ArtifactManager
+
+
+class FakeDriver:
+    def __init__(self, png):
+        self.png = png
+
+    def get_screenshot_as_png(self):
+        return self.png
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = ArtifactManager(root=str(tmp_path), run_id='current')
+    yield manager
+    manager._executor.shutdown(wait=True)
+
+
+def make_run(root, name, size=0):
+    run_dir = root / (RUN_PREFIX + name)
+    run_dir.mkdir()
+    (run_dir / 'shot.png').write_bytes(b'x' * size)
+    return run_dir
+
+
+def test_identical_bytes_are_stored_once(manager):
+    first = manager.add_bytes(b'same image', 'login page', '.png', test_id='t1')
+    second = manager.add_bytes(b'same image', 'login retry', '.png', test_id='t2')
+    other = manager.add_bytes(b'other image', 'dashboard', '.png')
+    manager.flush()
+
+    assert first == second != other
+    assert os.path.basename(first).startswith('login_page-')
+    assert sorted(os.listdir(manager.run_dir)) == sorted(os.path.basename(p) for p in (first, other))
+    with open(first, 'rb') as stored:
+        assert stored.read() == b'same image'
+    assert (manager.saved, manager.duplicates, manager.bytes_written) == (2, 1, 21)
+
+
+def test_screenshot_is_taken_from_the_driver(manager):
+    path = manager.screenshot(FakeDriver(b'\x89PNG fake'), 'home/page?1')
+    manager.flush()
+    assert path.endswith('.png') and os.path.basename(path).startswith('home_page_1-')
+    with open(path, 'rb') as stored:
+        assert stored.read() == b'\x89PNG fake'
+
+
+def test_close_writes_the_index(manager):
+    manager.add_bytes(b'a', 'first', '.png', test_id='t1')
+    manager.add_bytes(b'a', 'again', '.png', test_id='t2')
+    manager.close(worker_id='gw0')
+
+    with open(os.path.join(manager.run_dir, 'index-gw0.json')) as index_file:
+        index = json.load(index_file)
+    assert [(entry['name'], entry['test'], entry['duplicate']) for entry in index] == [
+        ('first', 't1', False), ('again', 't2', True)
+    ]
+    assert index[0]['file'] == index[1]['file']
+
+
+def test_failed_write_is_reported_not_raised(manager, capsys):
+    def broken(data):
+        raise ValueError('cannot encode')
+
+    manager.add_bytes(b'a', 'broken', '.png', encode=broken)
+    manager.flush()
+    assert manager.saved == 0
+    assert 'Artifact write failed' in capsys.readouterr().out
+
+
+def test_prune_keeps_the_newest_runs(tmp_path):
+    for name in ('20240101-000000-1', '20240102-000000-1', '20240103-000000-1'):
+        make_run(tmp_path, name)
+    (tmp_path / 'notes.txt').write_text('not a run')
+
+    manager = ArtifactManager(root=str(tmp_path), run_id='20240104-000000-1', keep_runs=2)
+    manager.close()
+    assert sorted(os.listdir(tmp_path)) == [
+        'notes.txt', RUN_PREFIX + '20240103-000000-1', RUN_PREFIX + '20240104-000000-1'
+    ]
+
+
+def test_prune_respects_the_size_budget(tmp_path):
+    make_run(tmp_path, '20240101-000000-1', size=600)
+    make_run(tmp_path, '20240102-000000-1', size=600)
+
+    manager = ArtifactManager(root=str(tmp_path), run_id='20240103-000000-1', keep_runs=10, max_bytes=1000)
+    manager.close()
+    assert sorted(os.listdir(tmp_path)) == [RUN_PREFIX + '20240102-000000-1', RUN_PREFIX + '20240103-000000-1']
+
+
+def test_from_env(tmp_path):
+    manager = ArtifactManager.from_env(run_id='env', environ={
+        'ARTIFACT_DIR': str(tmp_path), 'ARTIFACT_KEEP_RUNS': '3', 'ARTIFACT_MAX_MB': '0.5'
+    })
+    manager.close()
+    assert manager.run_dir == str(tmp_path / (RUN_PREFIX + 'env'))
+    assert (manager.keep_runs, manager.max_bytes, manager.image_format) == (3, 512 * 1024, 'png')
@@ -0,0 +1,199 @@
+import asyncio
+import re
+from urllib.parse import urlsplit
+
+import pytest
+
+from asgi import create_asgi_app
+from contact_store import ContactMessageStore
+from scenarios import TEST_USERS
+
+
+async def login(client, username, password):
+    return await client.post('/login', form={'username': username, 'password': password})
+
+
+@pytest.mark.http
+class TestASGITier:
+    """The HTTP tier against the ASGI (Quart) variant"""
+
+    def test_admin_inbox_search_and_pagination(self, asgi_run):
+        """Admins page through and full-text search contact messages"""
+        async def scenario(client):
+            for number in range(3):
+                await client.post('/contact', form={
+                    'name': 'Inbox Tester', 'email': 'inbox@testing.com',
+                    'subject': f'Wombat report {number}', 'message': 'Checking the ASGI inbox search.'
+                })
+            await login(client, 'admin', TEST_USERS['admin']['password'])
+            dashboard = await (await client.get('/dashboard')).get_data(as_text=True)
+            assert '/admin/messages' in dashboard
+
+            first = await (await client.get('/api/admin/messages?q=womb&limit=2')).get_json()
+            assert [m['subject'] for m in first['messages']] == ['Wombat report 2', 'Wombat report 1']
+            second = await (await client.get(
+                f"/api/admin/messages?q=womb&limit=2&before={first['next_cursor']}")).get_json()
+            assert [m['subject'] for m in second['messages']] == ['Wombat report 0']
+            assert second['next_cursor'] is None
+
+            page = await client.get('/admin/messages?q=wombat&user=Anonymous')
+            assert page.status_code == 200
+            assert 'Wombat report 2' in await page.get_data(as_text=True)
+        asgi_run(scenario)
+
+    def test_admin_inbox_requires_administrator(self, asgi_run):
+        """The inbox redirects anonymous users and forbids other roles"""
+        async def scenario(client):
+            response = await client.get('/admin/messages')
+            assert response.headers['Location'].endswith('/login')
+            await login(client, 'student', TEST_USERS['student']['password'])
+            assert (await client.get('/admin/messages')).status_code == 403
+            response = await client.get('/api/admin/messages')
+            assert response.status_code == 403
+            assert (await response.get_json())['error'] == 'forbidden'
+        asgi_run(scenario)
+
+    def test_contact_rate_limit_uses_trusted_forwarded_for(self, asgi_app, asgi_run, monkeypatch):
+        """Behind a trusted proxy, anonymous clients get separate contact buckets"""
+        monkeypatch.setitem(asgi_app.config, 'TRUSTED_PROXIES', 1)
+        burst = asgi_app.config['CONTACT_BURST']
+
+        async def scenario(client):
+            async def post(address):
+                response = await client.post('/contact', form={'name': 'x'},
+                                             headers={'X-Forwarded-For': address})
+                return response.status_code
+
+            for number in range(burst):
+                await post('203.0.113.1')
+            assert await post('203.0.113.1') == 429
+            assert await post('203.0.113.2') == 200
+        asgi_run(scenario)
+
+    def test_07_health_snapshot_etag(self, asgi_run):
+        """TC007: /api/health answers a matching If-None-Match with an empty 304"""
+        async def scenario(client):
+            first = await client.get('/api/health')
+            assert (await first.get_json())['status'] == 'healthy'
+            revalidated = await client.get('/api/health', headers={'If-None-Match': first.headers['ETag']})
+            assert revalidated.status_code == 304
+            assert await revalidated.get_data() == b''
+        asgi_run(scenario)
+
+    def test_09_not_found_marks_no_nav_link_active(self, asgi_run):
+        """TC009: The prerendered 404 page has no active nav link"""
+        async def scenario(client):
+            response = await client.get('/nonexistent-page')
+            assert response.status_code == 404
+            assert 'class="active"' not in await response.get_data(as_text=True)
+        asgi_run(scenario)
+
+    def test_10_session_revoked_after_logout(self, asgi_app, asgi_run):
+        """TC010: A session cookie captured before logout no longer grants access"""
+        cookie_name = asgi_app.config['SESSION_COOKIE_NAME']
+        stolen = []
+
+        async def scenario(client):
+            response = await login(client, 'admin', TEST_USERS['admin']['password'])
+            stolen.append(response.headers['Set-Cookie'].split(';')[0].split('=', 1)[1])
+            await client.get('/logout')
+            replay = await client.get('/dashboard', headers={'Cookie': f'{cookie_name}={stolen[0]}'})
+            assert replay.status_code == 302
+        asgi_run(scenario)
+        assert asgi_app.session_interface.backend.get(stolen[0]) is None
+
+    def test_shutdown_flushes_and_closes_stores(self, tmp_path):
+        """after_serving writes queued contact messages and stops the health monitor"""
+        path = str(tmp_path / 'contact.db')
+        app = create_asgi_app({'CONTACT_DB_PATH': path})
+        app.extensions['contact_messages'].store.flush_interval = 3600
+
+        async def serve():
+            async with app.test_app() as test_app:
+                await test_app.test_client().post('/contact', form={
+                    'name': 'Shutdown Tester', 'email': 'shutdown@testing.com',
+                    'subject': 'Last message', 'message': 'Queued just before shutdown.'
+                })
+        asyncio.run(serve())
+        assert app.extensions['health_monitor']._stop.is_set()
+        store = ContactMessageStore(path)
+        assert [m['subject'] for m in store.recent()] == ['Last message']
+        store.close()
+
+FLASH = re.compile(r'<div class="flash-(\w+)">\s*<i class="[^"]*"></i>\s*(.*?)\s*</div>', re.S)
+
+
+def routes(app):
+    """{endpoint: (rule, methods)} for everything but static files"""
+    return {rule.endpoint: (rule.rule, sorted(rule.methods - {'HEAD', 'OPTIONS'}))
+            for rule in app.url_map.iter_rules() if rule.endpoint != 'static'}
+
+
+def parity_steps(app):
+    """Every argument-free WSGI GET route, anonymously, as a student and as an admin, plus form posts"""
+    # Logging out is its own step, so each pass keeps its session
+    pages = [('GET', rule, None) for rule, methods in routes(app).values()
+             if '<' not in rule and rule != '/logout']
+    pages += [('GET', '/assets/missing.css', None), ('GET', '/nonexistent', None),
+              ('GET', '/api/nonexistent', None)]
+    return [
+        *pages,
+        ('POST', '/login', {'username': '', 'password': ''}),
+        ('POST', '/login', {'username': 'admin', 'password': 'wrong'}),
+        ('POST', '/contact', {'name': 'A', 'email': 'nope', 'subject': 'Hi', 'message': 'Short'}),
+        ('POST', '/contact', {'name': 'Parity Tester', 'email': 'parity@testing.com',
+                              'subject': 'Parity check', 'message': 'Same answer from both apps.'}),
+        ('POST', '/login', {'username': 'student', 'password': TEST_USERS['student']['password']}),
+        *pages,
+        ('GET', '/logout', None),
+        ('POST', '/login', {'username': 'admin', 'password': TEST_USERS['admin']['password']}),
+        *pages,
+        ('GET', '/logout', None)
+    ]
+
+
+def summarize(method, path, status, headers, mimetype, body):
+    """What both apps must agree on: status, redirect target, content type and flashes"""
+    location = urlsplit(headers.get('Location', '')).path
+    return f'{method} {path}', status, location, mimetype, FLASH.findall(body)
+
+
+def wsgi_walk(client, steps):
+    results = []
+    for method, path, form in steps:
+        response = client.open(path, method=method, data=form)
+        results.append(summarize(method, path, response.status_code, response.headers, response.mimetype,
+                                 response.get_data(as_text=True)))
+        if response.status_code == 302:
+            location = urlsplit(response.headers['Location']).path
+            landing = client.get(location)
+            results.append(summarize('GET', location, landing.status_code, landing.headers, landing.mimetype,
+                                     landing.get_data(as_text=True)))
+    return results
+
+
+async def asgi_walk(client, steps):
+    results = []
+    for method, path, form in steps:
+        response = await client.open(path, method=method, form=form)
+        results.append(summarize(method, path, response.status_code, response.headers, response.mimetype,
+                                 await response.get_data(as_text=True)))
+        if response.status_code == 302:
+            location = urlsplit(response.headers['Location']).path
+            landing = await client.get(location)
+            results.append(summarize('GET', location, landing.status_code, landing.headers, landing.mimetype,
+                                     await landing.get_data(as_text=True)))
+    return results
+
+
+@pytest.mark.http
+class TestParity:
+    """The ASGI variant answers every WSGI endpoint the same way"""
+
+    def test_same_routes(self, http_app, asgi_app):
+        assert routes(asgi_app) == routes(http_app)
+
+    def test_same_responses_and_flashes(self, http_app, http_client, asgi_run):
+        steps = parity_steps(http_app)
+        expected = wsgi_walk(http_client, steps)
+        assert asgi_run(lambda client: asgi_walk(client, steps)) == expected
@@ -0,0 +1,112 @@
+import gzip
+import hashlib
+import json
+import re
+
+import pytest
+from flask import Flask, render_template_string
+
+import build_assets
+from assets import Assets, choose_variant, load_manifest, resolve_asset
+
+CSS = b'body { color: #222; }\n' * 40  # over COMPRESS_MIN_BYTES
+JS = b'console.log("demo");\n'
+
+
+def fake_url_for(endpoint, **values):
+    return f"/{endpoint}/{values['filename']}"
+
+
+@pytest.fixture
+def static(tmp_path, monkeypatch):
+    """A static folder with the build sources, with build_assets pointed at it"""
+    folder = tmp_path / 'static'
+    (folder / 'css').mkdir(parents=True)
+    (folder / 'js').mkdir()
+    (folder / 'css' / 'app.css').write_bytes(CSS)
+    (folder / 'js' / 'app.js').write_bytes(JS)
+    monkeypatch.setattr(build_assets, 'STATIC', str(folder))
+    monkeypatch.setattr(build_assets, 'DIST', str(folder / 'dist'))
+    return folder
+
+
+def test_build_writes_content_hashed_files_and_manifest(static):
+    manifest = build_assets.build()
+    css_hash = hashlib.sha256(CSS).hexdigest()[:12]
+    assert manifest == {'css/app.css': f'app.{css_hash}.css',
+                        'js/app.js': f"app.{hashlib.sha256(JS).hexdigest()[:12]}.js"}
+
+    dist = static / 'dist'
+    assert json.loads((dist / 'manifest.json').read_text()) == manifest
+    assert load_manifest(str(dist)) == manifest
+    assert (dist / manifest['css/app.css']).read_bytes() == CSS
+    # Only bodies over the size threshold get a (reproducible) gzip variant
+    assert gzip.decompress((dist / (manifest['css/app.css'] + '.gz')).read_bytes()) == CSS
+    assert not (dist / (manifest['js/app.js'] + '.gz')).exists()
+
+
+def test_rebuild_renames_only_changed_files(static):
+    first = build_assets.build()
+    (static / 'js' / 'app.js').write_bytes(JS + b'console.log("changed");\n')
+    second = build_assets.build(compress_assets=False)
+    assert second['css/app.css'] == first['css/app.css']
+    assert second['js/app.js'] != first['js/app.js']
+    assert re.fullmatch(r'app\.[0-9a-f]{12}\.js', second['js/app.js'])
+    # The old build output is gone
+    assert sorted(path.name for path in (static / 'dist').iterdir()) == sorted(
+        [second['css/app.css'], second['js/app.js'], 'manifest.json'])
+
+
+def test_subset_fontawesome_keeps_used_icons():
+    css = ('.fa-solid{font-weight:900}'
+           '.fa-home::before,.fa-house::before{content:"\\f015"}'
+           '.fa-unused::before{content:"\\f000"}')
+    subset, codepoints = build_assets.subset_fontawesome(css, {'fa-home'})
+    assert subset == '.fa-solid{font-weight:900}.fa-home::before{content:"\\f015"}'
+    assert codepoints == {0xf015}
+
+
+def test_missing_or_broken_manifest_is_empty(tmp_path):
+    assert load_manifest(str(tmp_path / 'missing')) == {}
+    (tmp_path / 'manifest.json').write_text('{not json')
+    assert load_manifest(str(tmp_path)) == {}
+
+
+def test_resolve_asset_falls_back_to_source_files():
+    manifest = {'css/app.css': 'app.0123456789ab.css'}
+    assert resolve_asset(manifest, 'css/app.css', None, fake_url_for) == '/dist_asset/app.0123456789ab.css'
+    assert resolve_asset({}, 'css/app.css', None, fake_url_for) == '/static/css/app.css'
+    assert resolve_asset({}, 'vendor/fontawesome.css', 'https://cdn.example/fa.css',
+                         fake_url_for) == 'https://cdn.example/fa.css'
+
+
+def test_choose_variant_prefers_accepted_precompressed_files(tmp_path):
+    (tmp_path / 'app.css').write_bytes(CSS)
+    (tmp_path / 'app.css.gz').write_bytes(gzip.compress(CSS))
+    assert choose_variant(str(tmp_path), 'app.css', ['gzip', 'br']) == ('app.css.gz', 'gzip', 'text/css')
+    assert choose_variant(str(tmp_path), 'app.css', []) == ('app.css', None, 'text/css')
+    # No .br on disk, so br alone gets the identity file
+    assert choose_variant(str(tmp_path), 'app.css', ['br']) == ('app.css', None, 'text/css')
+
+
+def test_extension_serves_hashed_files_as_immutable(static):
+    manifest = build_assets.build()
+    app = Flask(__name__, static_folder=str(static))
+    Assets(app)
+    client = app.test_client()
+
+    with app.test_request_context():
+        url = render_template_string("{{ asset_url('css/app.css') }}")
+        assert url == f"/assets/{manifest['css/app.css']}"
+    response = client.get(url, headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(response.get_data()) == CSS
+    assert response.cache_control.immutable and response.cache_control.max_age == 31536000
+    assert 'Accept-Encoding' in response.headers['Vary']
+
+
+def test_extension_without_a_build_uses_source_files(tmp_path):
+    app = Flask(__name__, static_folder=str(tmp_path), static_url_path='/static')
+    Assets(app)
+    with app.test_request_context():
+        assert render_template_string("{{ asset_url('js/app.js') }}") == '/static/js/app.js'
@@ -0,0 +1,143 @@
+import sqlite3
+import time
+
+import pytest
+
+from contact_store import ContactMessageStore
+
+
+def message(n, user='Anonymous'):
+    return {
+        'name': f'Sender {n}',
+        'email': f'sender{n}@example.com',
+        'subject': f'Subject {n}',
+        'message': f'Message body number {n}',
+        'timestamp': '2024-01-01 12:00:00',
+        'user': user
+    }
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / 'contact.db')
+
+
+def stored_ids(path):
+    conn = sqlite3.connect(path)
+    try:
+        return [row[0] for row in conn.execute('SELECT id FROM contact_messages ORDER BY id')]
+    finally:
+        conn.close()
+
+
+def test_messages_wait_for_a_batch_or_flush(db_path):
+    store = ContactMessageStore(db_path, batch_size=3, flush_interval=60)
+    try:
+        store.add(message(1))
+        store.add(message(2))
+        assert stored_ids(db_path) == []  # still pending, no write yet
+        assert len(store) == 2
+
+        store.add(message(3))  # fills the batch and wakes the flusher
+        deadline = time.time() + 5
+        while len(stored_ids(db_path)) < 3 and time.time() < deadline:
+            time.sleep(0.01)
+        assert stored_ids(db_path) == [1, 2, 3]
+
+        store.add(message(4))
+        assert store.flush() == 1
+        assert [m['subject'] for m in store.recent(2)] == ['Subject 4', 'Subject 3']
+    finally:
+        store.close()
+
+
+def test_missing_field_is_rejected_at_add(db_path):
+    store = ContactMessageStore(db_path, flush_interval=60)
+    try:
+        with pytest.raises(KeyError):
+            store.add({'name': 'No email'})
+        assert len(store) == 0
+    finally:
+        store.close()
+
+
+def test_two_stores_on_one_file_get_distinct_ids(db_path):
+    first = ContactMessageStore(db_path, flush_interval=60)
+    second = ContactMessageStore(db_path, flush_interval=60)
+    try:
+        for n in range(3):
+            first.add(message(n))
+            second.add(message(n + 10))
+        first.flush()
+        second.flush()
+        first.add(message(99))
+        first.flush()
+        assert stored_ids(db_path) == list(range(1, 8))
+        assert len(first) == len(second) == 7
+    finally:
+        first.close()
+        second.close()
+
+
+def test_flusher_survives_a_failed_batch(db_path, caplog):
+    store = ContactMessageStore(db_path, flush_interval=0.01)
+    blocker = sqlite3.connect(db_path, timeout=0)
+    try:
+        store._conn.execute('PRAGMA busy_timeout=0')
+        blocker.execute('BEGIN IMMEDIATE')  # another writer holds the lock
+        store.add(message(1))
+        deadline = time.time() + 5
+        while 'flush failed' not in caplog.text and time.time() < deadline:
+            time.sleep(0.01)
+        assert store._flusher.is_alive()
+
+        blocker.rollback()
+        while not stored_ids(db_path) and time.time() < deadline:
+            time.sleep(0.01)
+        assert stored_ids(db_path) == [1]  # the re-queued batch was written
+    finally:
+        blocker.close()
+        store.close()
+
+
+def test_pending_queue_is_bounded(db_path, caplog):
+    store = ContactMessageStore(db_path, flush_interval=60, max_pending=2)
+    try:
+        for n in range(3):
+            store.add(message(n))
+        assert store.dropped == 1
+        assert 'dropping a message' in caplog.text
+        store.flush()
+        assert stored_ids(db_path) == [1, 2]
+    finally:
+        store.close()
+
+
+def test_retention_keeps_newest_messages(db_path):
+    first = ContactMessageStore(db_path, flush_interval=60, max_messages=3)
+    second = ContactMessageStore(db_path, flush_interval=60, max_messages=3)
+    try:
+        for n in range(4):
+            first.add(message(n))
+        first.flush()
+        for n in range(2):
+            second.add(message(n + 10))
+        second.flush()
+        assert stored_ids(db_path) == [4, 5, 6]
+        assert len(first) == 3
+    finally:
+        first.close()
+        second.close()
+
+
+def test_retention_drops_old_messages(db_path):
+    store = ContactMessageStore(db_path, flush_interval=60, max_age_days=1)
+    try:
+        store.add(message(1))
+        store.flush()
+        store._conn.execute('UPDATE contact_messages SET created_at = created_at - 2 * 86400')
+        store.add(message(2))
+        store.flush()  # retention runs after every batch
+        assert [m['subject'] for m in store.recent()] == ['Subject 2']
+    finally:
+        store.close()
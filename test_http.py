@@ -0,0 +1,361 @@
+import gzip
+import json
+
+import pytest
+from flask import session
+
+import flashes
+from app import create_app
+from flashes import flash_errors, flash_message, get_flashed_messages
+
+from scenarios import (CONTACT_FORM_SCENARIOS, INVALID_LOGIN_SCENARIOS, NAVIGATION_PAGES,
+                       TEST_USERS, XSS_USERNAME)
+
+
+def login(client, username, password):
+    return client.post('/login', data={'username': username, 'password': password})
+
+
+@pytest.mark.http
+class TestHTTPTier:
+    """
+    Fast HTTP-level tier: the server-side half of the Selenium scenarios,
+    run against the Flask test client in milliseconds (no browser needed)
+    """
+
+    @pytest.mark.parametrize('page_name, link_text, path', NAVIGATION_PAGES,
+                             ids=[page[0] for page in NAVIGATION_PAGES])
+    def test_02_pages_load(self, http_client, page_name, link_text, path):
+        """TC002: Every navigation target renders with the site title and its nav link"""
+        response = http_client.get(path)
+        body = response.get_data(as_text=True)
+        assert response.status_code == 200
+        assert 'Selenium Testing Demo' in body
+        assert f'href="{path}"' in body
+
+    @pytest.mark.parametrize('username', list(TEST_USERS))
+    def test_03_valid_login(self, http_client, username):
+        """TC003: Valid credentials redirect to a dashboard showing the user's name and role"""
+        user_data = TEST_USERS[username]
+        response = login(http_client, username, user_data['password'])
+        assert response.status_code == 302
+        assert response.headers['Location'].endswith('/dashboard')
+
+        body = http_client.get('/dashboard').get_data(as_text=True)
+        assert user_data['name'] in body
+        assert user_data['role'] in body
+        assert f'Logout ({username})' in body
+
+    @pytest.mark.parametrize('username, password, description, flash', INVALID_LOGIN_SCENARIOS,
+                             ids=[scenario[2] for scenario in INVALID_LOGIN_SCENARIOS])
+    def test_04_invalid_login(self, http_client, username, password, description, flash):
+        """TC004: Invalid credentials stay on the login page with an error flash"""
+        response = login(http_client, username, password)
+        body = response.get_data(as_text=True)
+        assert response.status_code == 200
+        assert 'flash-error' in body
+        assert flash in body
+        assert http_client.get('/dashboard').status_code == 302
+
+    def test_04_login_throttled_after_free_attempts(self, http_app, http_client):
+        """TC004: The failure beyond the free attempts is answered with 429 and Retry-After"""
+        free = http_app.config['LOGIN_USER_FREE_ATTEMPTS']
+        for _ in range(free):
+            assert login(http_client, 'admin', 'wrongpass').status_code == 200
+        response = login(http_client, 'admin', 'wrongpass')
+        assert response.status_code == 429
+        assert int(response.headers['Retry-After']) >= 1
+        assert 'Too many invalid login attempts' in response.get_data(as_text=True)
+        # Even the right password is refused until the backoff expires
+        assert login(http_client, 'admin', TEST_USERS['admin']['password']).status_code == 429
+
+    def test_04_successful_login_resets_throttle(self, http_app, http_client):
+        """TC004: A successful login clears the username's failure count"""
+        free = http_app.config['LOGIN_USER_FREE_ATTEMPTS']
+        for _ in range(free - 1):
+            login(http_client, 'student', 'wrongpass')
+        assert login(http_client, 'student', TEST_USERS['student']['password']).status_code == 302
+        for _ in range(free):
+            assert login(http_client, 'student', 'wrongpass').status_code == 200
+
+    def test_04_ip_throttle_uses_trusted_forwarded_for(self, http_app, http_client, monkeypatch):
+        """TC004: Behind a trusted proxy, clients get separate IP throttle buckets"""
+        monkeypatch.setattr(http_app.extensions['ip_throttle'], 'free_attempts', 1)
+        first = {'X-Forwarded-For': '203.0.113.1'}
+        second = {'X-Forwarded-For': '203.0.113.2'}
+
+        def fail(username, headers):
+            return http_client.post('/login', data={'username': username, 'password': 'x'},
+                                    headers=headers).status_code
+
+        # Untrusted: the header is ignored and every client shares the proxy's bucket
+        assert fail('nobody1', first) == 200
+        assert fail('nobody2', second) == 429
+        http_app.extensions['ip_throttle'].clear()
+
+        monkeypatch.setitem(http_app.config, 'TRUSTED_PROXIES', 1)
+        assert fail('nobody1', first) == 200
+        assert fail('nobody2', first) == 429
+        assert fail('nobody3', second) == 200
+
+    @pytest.mark.parametrize('scenario', CONTACT_FORM_SCENARIOS,
+                             ids=[scenario['description'] for scenario in CONTACT_FORM_SCENARIOS])
+    def test_05_contact_form(self, http_client, scenario):
+        """TC005: Contact form accepts valid submissions and reports each validation error"""
+        form = {field: scenario[field] for field in ('name', 'email', 'subject', 'message')}
+        response = http_client.post('/contact', data=form, follow_redirects=True)
+        body = response.get_data(as_text=True)
+        assert response.status_code == 200
+        assert f"flash-{scenario['expected']}" in body
+        assert scenario['flash'] in body
+
+    def test_06_session_lifecycle(self, http_client):
+        """TC006: Session persists across pages and logout blocks the dashboard"""
+        login(http_client, 'admin', TEST_USERS['admin']['password'])
+        for _, _, path in NAVIGATION_PAGES:
+            assert 'Logout (admin)' in http_client.get(path).get_data(as_text=True)
+
+        http_client.get('/logout')
+        response = http_client.get('/dashboard')
+        assert response.status_code == 302
+        assert response.headers['Location'].endswith('/login')
+
+    def test_07_health_endpoint(self, http_client):
+        """TC007: /api/health returns JSON status"""
+        response = http_client.get('/api/health')
+        assert response.status_code == 200
+        assert response.mimetype == 'application/json'
+        payload = json.loads(response.get_data())
+        assert payload['status'] == 'healthy'
+        assert 'version' in payload
+
+    def test_07_health_snapshot_etag(self, http_app, http_client):
+        """TC007: /api/health answers a matching If-None-Match with an empty 304"""
+        first = http_client.get('/api/health')
+        etag = first.headers['ETag']
+        assert first.headers['Cache-Control'] == 'no-cache'
+
+        revalidated = http_client.get('/api/health', headers={'If-None-Match': etag})
+        assert revalidated.status_code == 304
+        assert revalidated.get_data() == b''
+        assert revalidated.headers['ETag'] == etag
+
+        # A refreshed snapshot (new timestamp) gets a new validator
+        monitor = http_app.extensions['health_monitor']
+        monitor.snapshot = monitor._build()
+        changed = http_client.get('/api/health', headers={'If-None-Match': etag})
+        assert changed.status_code == 200
+        assert changed.headers['ETag'] != etag
+        assert json.loads(changed.get_data())['status'] == 'healthy'
+
+    def test_07_deep_health_report(self, http_client):
+        """TC007: /api/health/deep adds process and request-latency detail"""
+        http_client.get('/')
+        response = http_client.get('/api/health/deep')
+        assert response.status_code == 200
+        report = json.loads(response.get_data())
+        assert report['status'] == 'healthy'
+        assert report['process_rss_bytes'] > 0
+        assert report['uptime_seconds'] >= 0
+        assert report['requests_total'] >= 1
+        assert set(report['latency_ms']) == {'p50', 'p95', 'p99'}
+        assert report['latency_ms']['p50'] is not None
+
+    def test_07_metrics_endpoint(self, http_client):
+        """TC007: /metrics exposes per-endpoint request and render histograms"""
+        http_client.get('/about')
+        response = http_client.get('/metrics')
+        assert response.status_code == 200
+        assert response.mimetype == 'text/plain'
+        text = response.get_data(as_text=True)
+        assert 'http_request_duration_seconds_bucket{endpoint="about",le="+Inf"}' in text
+        assert 'http_request_duration_seconds_count{endpoint="about"}' in text
+        assert '# TYPE template_render_duration_seconds histogram' in text
+
+    def test_09_not_found(self, http_client):
+        """TC009: Unknown URLs return a 404 page"""
+        response = http_client.get('/nonexistent-page')
+        assert response.status_code == 404
+        assert response.mimetype == 'text/html'
+        body = response.get_data(as_text=True).lower()
+        assert '404' in body or 'not found' in body
+        # The cached page was not rendered as if it were the home page
+        assert 'class="active"' not in body
+
+    def test_09_api_not_found_is_json(self, http_client):
+        """TC009: Unknown /api/ URLs (or JSON clients) get a compact JSON error"""
+        for path, headers in (('/api/nonexistent', {}),
+                              ('/nonexistent-page', {'Accept': 'application/json'})):
+            response = http_client.get(path, headers=headers)
+            assert response.status_code == 404
+            assert response.mimetype == 'application/json'
+            assert json.loads(response.get_data()) == {
+                'error': 'not_found', 'message': 'The requested URL was not found on the server.', 'status': 404
+            }
+
+    def test_10_dashboard_requires_login(self, http_client):
+        """TC010: Dashboard and profile redirect anonymous users to login"""
+        for path in ('/dashboard', '/profile'):
+            response = http_client.get(path)
+            assert response.status_code == 302
+            assert response.headers['Location'].endswith('/login')
+
+    def test_10_login_input_is_escaped(self, http_client):
+        """TC010: Script input in the login form is rejected and never echoed raw"""
+        response = login(http_client, XSS_USERNAME, 'password123')
+        assert response.status_code == 200
+        assert XSS_USERNAME not in response.get_data(as_text=True)
+
+    def test_10_session_revoked_after_logout(self, http_app, http_client):
+        """TC010: A session cookie captured before logout no longer grants access"""
+        login(http_client, 'admin', TEST_USERS['admin']['password'])
+        cookie_name = http_app.config['SESSION_COOKIE_NAME']
+        stolen = http_client.get_cookie(cookie_name).value
+
+        http_client.get('/logout')
+
+        replay = http_app.test_client()
+        replay.set_cookie(cookie_name, stolen)
+        assert replay.get('/dashboard').status_code == 302
+
+    def test_production_start_precompiles_and_warms_up(self, tmp_path):
+        """Production start compiles every template to the bytecode cache and warms routes"""
+        app = create_app({'CONTACT_DB_PATH': ':memory:', 'SESSION_BACKEND': 'memory',
+                          'TEMPLATE_PRECOMPILE': True, 'TEMPLATE_CACHE_DIR': str(tmp_path),
+                          'WARM_UP': True})
+        try:
+            precompiler = app.extensions['template_precompiler']
+            assert {'base.html', 'index.html', '404.html'} <= set(precompiler.compiled)
+            assert app.jinja_env.auto_reload is False
+            assert len(list(tmp_path.iterdir())) == len(precompiler.compiled)
+            # Warm-up filled the render cache but left no trace in the request metrics
+            assert app.extensions['render_cache'].misses > 0
+            assert app.extensions['metrics'].collect() == {}
+            assert app.test_client().get('/').status_code == 200
+        finally:
+            app.extensions['health_monitor'].stop()
+            app.extensions['contact_messages'].close()
+
+    def test_flash_payload_is_capped(self, http_app):
+        """Flashes are stored as short codes, clipped to a fixed session budget"""
+        with http_app.test_request_context('/'):
+            flash_message('contact_sent', 'x' * 500, 'subject')
+            for _ in range(50):
+                flash_errors(['email_invalid'])
+            stored = session[flashes.SESSION_KEY]
+            assert len(json.dumps(stored, separators=(',', ':'))) <= flashes.MAX_PAYLOAD_BYTES
+            assert stored[-1] == ['email_invalid']
+
+            messages = get_flashed_messages(with_categories=True)
+            assert messages[-1] == ('error', 'Please enter a valid email address.')
+            assert flashes.SESSION_KEY not in session
+            assert get_flashed_messages() == [text for _, text in messages]
+
+    def test_admin_inbox_search_and_pagination(self, http_client):
+        """Admins page through and full-text search contact messages"""
+        for number in range(3):
+            http_client.post('/contact', data={
+                'name': 'Inbox Tester', 'email': 'inbox@testing.com',
+                'subject': f'Quokka report {number}', 'message': 'Checking the admin inbox search.'
+            })
+        login(http_client, 'admin', TEST_USERS['admin']['password'])
+
+        first = json.loads(http_client.get('/api/admin/messages?q=quok&limit=2').get_data())
+        assert [m['subject'] for m in first['messages']] == ['Quokka report 2', 'Quokka report 1']
+        second = json.loads(http_client.get(
+            f"/api/admin/messages?q=quok&limit=2&before={first['next_cursor']}").get_data())
+        assert [m['subject'] for m in second['messages']] == ['Quokka report 0']
+        assert second['next_cursor'] is None
+
+        page = http_client.get('/admin/messages?q=quokka&user=Anonymous')
+        assert page.status_code == 200
+        assert 'Quokka report 2' in page.get_data(as_text=True)
+
+    def test_admin_inbox_requires_administrator(self, http_client):
+        """The inbox redirects anonymous users and forbids other roles"""
+        assert http_client.get('/admin/messages').headers['Location'].endswith('/login')
+        login(http_client, 'student', TEST_USERS['student']['password'])
+        assert http_client.get('/admin/messages').status_code == 403
+        response = http_client.get('/api/admin/messages')
+        assert response.status_code == 403
+        assert json.loads(response.get_data())['error'] == 'forbidden'
+
+    def test_contact_duplicates_are_not_stored(self, http_app, http_client):
+        """Replaying a contact message (modulo case/whitespace) is acknowledged, not stored"""
+        form = {'name': 'Replay Bot', 'email': 'bot@testing.com',
+                'subject': 'Buy cheap tests', 'message': 'Limited offer for test automation!'}
+        stored = len(http_app.extensions['contact_messages'])
+        assert http_client.post('/contact', data=form).status_code == 302
+        replay = dict(form, email='BOT@testing.com', message='  Limited offer   for test automation! ')
+        response = http_client.post('/contact', data=replay, follow_redirects=True)
+        assert 'We already received this message' in response.get_data(as_text=True)
+        assert len(http_app.extensions['contact_messages']) == stored + 1
+
+    def test_contact_rate_limited_per_client(self, http_app, http_client):
+        """A client exceeding the contact burst gets 429 with Retry-After, counted on /metrics"""
+        burst = http_app.config['CONTACT_BURST']
+        for number in range(burst):
+            http_client.post('/contact', data={'name': 'x'})
+        response = http_client.post('/contact', data={'name': 'x'})
+        assert response.status_code == 429
+        assert int(response.headers['Retry-After']) > 0
+        assert 'sending messages too quickly' in response.get_data(as_text=True)
+        metrics_text = http_client.get('/metrics').get_data(as_text=True)
+        assert 'contact_submissions_total{outcome="rate_limited"}' in metrics_text
+
+    def test_contact_rate_limit_uses_trusted_forwarded_for(self, http_app, http_client, monkeypatch):
+        """Behind a trusted proxy, anonymous clients get separate contact buckets"""
+        burst = http_app.config['CONTACT_BURST']
+        first = {'X-Forwarded-For': '203.0.113.1'}
+        second = {'X-Forwarded-For': '203.0.113.2'}
+
+        def post(headers):
+            return http_client.post('/contact', data={'name': 'x'}, headers=headers).status_code
+
+        # Untrusted: the header is ignored and every client shares the proxy's bucket
+        for number in range(burst):
+            post(first)
+        assert post(second) == 429
+        http_app.extensions['contact_guard'].clear()
+
+        monkeypatch.setitem(http_app.config, 'TRUSTED_PROXIES', 1)
+        for number in range(burst):
+            post(first)
+        assert post(first) == 429
+        assert post(second) == 200
+
+    def test_compressed_responses_revalidate(self, http_client):
+        """Large pages are gzipped with a per-encoding ETag and revalidate with 304"""
+        plain = http_client.get('/about')
+        assert 'Content-Encoding' not in plain.headers
+        assert 'Accept-Encoding' in plain.headers['Vary']
+        etag = plain.headers['ETag']
+
+        zipped = http_client.get('/about', headers={'Accept-Encoding': 'gzip'})
+        assert zipped.headers['Content-Encoding'] == 'gzip'
+        assert zipped.headers['ETag'] == etag[:-1] + '-gzip"'
+        assert gzip.decompress(zipped.get_data()) == plain.get_data()
+
+        revalidated = http_client.get('/about', headers={'Accept-Encoding': 'gzip',
+                                                         'If-None-Match': zipped.headers['ETag']})
+        assert revalidated.status_code == 304
+        assert revalidated.get_data() == b''
+        # The identity validator does not match the gzip representation
+        assert http_client.get('/about', headers={'Accept-Encoding': 'gzip',
+                                                  'If-None-Match': etag}).status_code == 200
+
+    def test_brotli_preferred_when_available(self, http_client):
+        """Clients accepting br get brotli when the optional module is installed"""
+        brotli = pytest.importorskip('brotli')
+        response = http_client.get('/about', headers={'Accept-Encoding': 'gzip, br'})
+        assert response.headers['Content-Encoding'] == 'br'
+        assert response.headers['ETag'].endswith('-br"')
+        assert b'Selenium Testing Demo' in brotli.decompress(response.get_data())
+
+    def test_small_bodies_are_not_compressed(self, http_app, http_client, monkeypatch):
+        """Bodies under the size threshold keep their identity encoding"""
+        monkeypatch.setattr(http_app.extensions['compression'], 'min_size', 10 ** 6)
+        response = http_client.get('/about', headers={'Accept-Encoding': 'gzip'})
+        assert response.status_code == 200
+        assert 'Content-Encoding' not in response.headers
+        assert not response.headers['ETag'].endswith('-gzip"')
@@ -0,0 +1,65 @@
+import threading
+
+from metrics import Metrics, log_linear_bounds
+
+
+def record_in_thread(metrics, series, endpoint, seconds):
+    thread = threading.Thread(target=metrics.observe, args=(series, endpoint, seconds))
+    thread.start()
+    thread.join()
+
+
+def test_log_linear_bounds_are_increasing():
+    bounds = log_linear_bounds(lowest=0.001, highest=1.0, steps_per_octave=1)
+    assert bounds[0] == 0.001 and bounds[-1] == 1.0
+    assert list(bounds) == sorted(set(bounds))
+
+
+def test_histogram_text_is_cumulative():
+    metrics = Metrics(bounds=(0.01, 0.1, 1.0))
+    for seconds in (0.005, 0.05, 0.05, 5.0):
+        metrics.observe('http_request_duration_seconds', 'index', seconds)
+    text = metrics.render()
+    assert '# TYPE http_request_duration_seconds histogram' in text
+    for line in ('http_request_duration_seconds_bucket{endpoint="index",le="0.01"} 1',
+                 'http_request_duration_seconds_bucket{endpoint="index",le="0.1"} 3',
+                 'http_request_duration_seconds_bucket{endpoint="index",le="1"} 3',
+                 'http_request_duration_seconds_bucket{endpoint="index",le="+Inf"} 4',
+                 'http_request_duration_seconds_sum{endpoint="index"} 5.105000',
+                 'http_request_duration_seconds_count{endpoint="index"} 4'):
+        assert line in text.splitlines()
+
+
+def test_shards_merge_and_exited_threads_retire():
+    metrics = Metrics(bounds=(1.0,))
+    metrics.observe('http_request_duration_seconds', 'index', 0.5)
+    record_in_thread(metrics, 'http_request_duration_seconds', 'index', 0.5)
+    record_in_thread(metrics, 'http_request_duration_seconds', 'index', 2.0)
+    assert len(metrics._shards) == 3
+
+    merged = metrics.collect()
+    assert merged[('http_request_duration_seconds', 'index')] == [[2, 1], 3.0]
+    # Only this (live) thread keeps a shard; the rest were folded into _retired
+    assert len(metrics._shards) == 1
+    assert metrics.collect() == merged
+
+
+def test_counters_are_exported():
+    metrics = Metrics()
+    metrics.add_counter('contact_submissions_total', 'Contact form submissions by outcome',
+                        lambda: {'accepted': 2, 'duplicate': 1})
+    text = metrics.render()
+    assert '# TYPE contact_submissions_total counter' in text
+    assert 'contact_submissions_total{outcome="accepted"} 2' in text
+    assert 'contact_submissions_total{outcome="duplicate"} 1' in text
+
+
+def test_reset_drops_live_and_retired_samples():
+    metrics = Metrics()
+    metrics.observe('http_request_duration_seconds', 'index', 0.1)
+    record_in_thread(metrics, 'http_request_duration_seconds', 'about', 0.1)
+    metrics.collect()
+    metrics.reset()
+    assert metrics.collect() == {}
+    metrics.observe('http_request_duration_seconds', 'index', 0.1)
+    assert list(metrics.collect()) == [('http_request_duration_seconds', 'index')]
@@ -0,0 +1,84 @@
+import os
+
+import pytest
+from flask import Flask, session, template_rendered
+
+from flashes import flash_message
+from render_cache import RenderCache
+
+
+@pytest.fixture
+def cached_app(tmp_path):
+    (tmp_path / 'base.html').write_text('<title>Demo</title>{% block body %}{% endblock %}')
+    (tmp_path / 'page.html').write_text('{% extends "base.html" %}{% block body %}v1{% endblock %}')
+    app = Flask(__name__, template_folder=str(tmp_path))
+    app.secret_key = 'test'
+    app.config['TEMPLATES_AUTO_RELOAD'] = True
+    cache = RenderCache(app, check_interval=0)
+
+    @app.route('/page')
+    def page():
+        return cache.render('page.html')
+
+    @app.route('/flash')
+    def flash():
+        flash_message('contact_duplicate')
+        return ''
+
+    @app.route('/login')
+    def login():
+        session['username'] = 'ada'
+        return ''
+
+    app.extensions['render_cache'] = cache
+    return app
+
+
+@pytest.fixture
+def renders(cached_app):
+    rendered = []
+
+    def record(sender, template, context, **extra):
+        rendered.append(template.name)
+
+    template_rendered.connect(record, cached_app)
+    yield rendered
+    template_rendered.disconnect(record, cached_app)
+
+
+def test_hit_skips_jinja(cached_app, renders):
+    client = cached_app.test_client()
+    assert client.get('/page').get_data(as_text=True) == '<title>Demo</title>v1'
+    assert client.get('/page').get_data(as_text=True) == '<title>Demo</title>v1'
+    cache = cached_app.extensions['render_cache']
+    assert (cache.misses, cache.hits) == (1, 1)
+    assert renders == ['page.html']
+
+
+def test_logged_in_users_get_their_own_entry(cached_app):
+    client = cached_app.test_client()
+    client.get('/page')
+    client.get('/login')
+    client.get('/page')
+    assert cached_app.extensions['render_cache'].misses == 2
+
+
+def test_pending_flashes_bypass_the_cache(cached_app, renders):
+    client = cached_app.test_client()
+    client.get('/page')
+    client.get('/flash')
+    client.get('/page')
+    cache = cached_app.extensions['render_cache']
+    assert (cache.misses, cache.hits) == (1, 0)
+    assert renders == ['page.html', 'page.html']
+
+
+def test_parent_template_change_invalidates(cached_app, tmp_path, renders):
+    client = cached_app.test_client()
+    client.get('/page')
+    base = tmp_path / 'base.html'
+    base.write_text('<title>Changed</title>{% block body %}{% endblock %}')
+    stat = base.stat()
+    os.utime(base, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert client.get('/page').get_data(as_text=True) == '<title>Changed</title>v1'
+    assert cached_app.extensions['render_cache'].misses == 2
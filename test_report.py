@@ -0,0 +1,99 @@
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from report import StreamingReporter, main, read_results, render_html
+
+
+def phase(nodeid, when, outcome='passed', duration=0.1, message='', stdout='', user_properties=(), **extra):
+    """A stand-in for the TestReport pytest hands to pytest_runtest_logreport"""
+    return SimpleNamespace(nodeid=nodeid, when=when, outcome=outcome, duration=duration,
+                           passed=outcome == 'passed', failed=outcome == 'failed',
+                           skipped=outcome == 'skipped', longreprtext=message, capstdout=stdout,
+                           user_properties=list(user_properties), **extra)
+
+
+def run_test(reporter, nodeid, call=None, setup='passed', **teardown):
+    message = 'skip reason' if setup == 'skipped' else ''
+    reporter.pytest_runtest_logreport(phase(nodeid, 'setup', setup, message=message))
+    if call is not None:
+        reporter.pytest_runtest_logreport(call)
+    reporter.pytest_runtest_logreport(phase(nodeid, 'teardown', **teardown))
+
+
+def test_workers_stream_and_merge_into_one_report(tmp_path):
+    run_dir = str(tmp_path / 'run-1')
+    shot = tmp_path / 'run-1' / 'shots' / 'login.png'
+
+    first = StreamingReporter(run_dir, 'gw0')
+    run_test(first, 'test_a.py::test_ok', phase('test_a.py::test_ok', 'call', duration=1.0))
+    run_test(first, 'test_a.py::test_broken',
+             phase('test_a.py::test_broken', 'call', 'failed', message='assert <b> == 2', stdout='printed'),
+             user_properties=[('artifact', ('login page', str(shot))), ('wait_seconds', (0.5, 2.0))])
+    first.close()
+
+    second = StreamingReporter(run_dir, 'gw1')
+    run_test(second, 'test_b.py::test_skipped', setup='skipped')
+    run_test(second, 'test_b.py::test_known_bug',
+             phase('test_b.py::test_known_bug', 'call', 'skipped', wasxfail='bug 12'))
+    second.close()
+    # A worker killed mid-write leaves half a line behind
+    with open(os.path.join(run_dir, 'results-gw1.jsonl'), 'a', encoding='utf-8') as results:
+        results.write('{"nodeid": "test_b.py::test_cut", "outc')
+
+    records = {record['nodeid']: record for record in read_results([run_dir])}
+    assert {nodeid: record['outcome'] for nodeid, record in records.items()} == {
+        'test_a.py::test_ok': 'passed',
+        'test_a.py::test_broken': 'failed',
+        'test_b.py::test_skipped': 'skipped',
+        'test_b.py::test_known_bug': 'xfailed'
+    }
+    broken = records['test_a.py::test_broken']
+    assert (broken['phase'], broken['message'], broken['stdout']) == ('call', 'assert <b> == 2', 'printed')
+    assert broken['artifacts'] == [{'name': 'login page', 'path': str(shot)}]
+    assert broken['wait_seconds'] == [0.5, 2.0]
+    assert records['test_a.py::test_ok']['duration'] == pytest.approx(1.2)  # setup + call + teardown
+    assert records['test_b.py::test_skipped']['worker'] == 'gw1'
+
+    output = os.path.join(run_dir, 'report.html')
+    counts = render_html(records.values(), output)
+    assert counts == {'passed': 1, 'failed': 1, 'skipped': 1, 'xfailed': 1}
+    with open(output, encoding='utf-8') as page:
+        body = page.read()
+    assert '4 tests' in body
+    assert 'assert &lt;b&gt; == 2' in body
+    assert 'src="shots/login.png"' in body  # relative to the report
+    # Failures are listed first
+    assert body.index('test_a.py::test_broken') < body.index('test_a.py::test_ok')
+
+
+def test_error_outside_the_call_phase(tmp_path):
+    reporter = StreamingReporter(str(tmp_path))
+    nodeid = 'test_c.py::test_fixture_fails'
+    reporter.pytest_runtest_logreport(phase(nodeid, 'setup', 'failed', message='fixture broke'))
+    reporter.pytest_runtest_logreport(phase(nodeid, 'teardown'))
+    reporter.close()
+    [record] = read_results([str(tmp_path)])
+    assert (record['outcome'], record['phase'], record['worker']) == ('error', 'setup', 'main')
+
+
+def test_merge_later_records_win(tmp_path, capsys):
+    shard_a = tmp_path / 'a.jsonl'
+    shard_b = tmp_path / 'b.jsonl'
+    shard_a.write_text(json.dumps({'nodeid': 't::flaky', 'outcome': 'failed', 'duration': 1.0}) + '\n'
+                       + json.dumps({'nodeid': 't::stable', 'outcome': 'passed', 'duration': 1.0}) + '\n\n')
+    shard_b.write_text(json.dumps({'nodeid': 't::flaky', 'outcome': 'passed', 'duration': 2.0}) + '\n')
+
+    merged = tmp_path / 'merged.jsonl'
+    assert main(['merge', str(shard_a), str(shard_b), '-o', str(merged)]) == 0
+    records = [json.loads(line) for line in merged.read_text().splitlines()]
+    assert {record['nodeid']: record['outcome'] for record in records} == {
+        't::flaky': 'passed', 't::stable': 'passed'
+    }
+
+    output = tmp_path / 'merged.html'
+    assert main(['render', str(merged), '-o', str(output)]) == 0
+    assert '2 passed' in output.read_text(encoding='utf-8')
+    assert '2 results' in capsys.readouterr().out
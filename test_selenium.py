@@ -1,75 +1,53 @@
 import pytest
-import time
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from scenarios import (CONTACT_FORM_SCENARIOS, INVALID_LOGIN_SCENARIOS, NAVIGATION_PAGES,
+                       TEST_USERS, XSS_USERNAME)
+from timing import TimedWebDriverWait, timed_step
+from waits import flash_appeared, page_loaded, path_is
 import os
 
+@pytest.mark.ui
 class TestProfessionalWebApplication:
     """
     Professional Selenium WebDriver Test Suite
     Tests the enhanced web application with comprehensive scenarios
     """
     
-    BASE_URL = "http://localhost:5000"
+    BASE_URL = None  # set per test from the base_url fixture (see conftest.py)
     
-    # Enhanced test user data
-    TEST_USERS = {
-        'admin': {'password': 'password123', 'role': 'Administrator', 'name': 'System Admin'},
-        'student': {'password': 'student123', 'role': 'Student', 'name': 'Test Student'},
-        'test_user': {'password': 'test123', 'role': 'Test User', 'name': 'Demo User'},
-        'qa_tester': {'password': 'qa123', 'role': 'QA Tester', 'name': 'Quality Assurance'}
-    }
+    # Enhanced test user data (shared with the HTTP tier, see scenarios.py)
+    TEST_USERS = TEST_USERS
     
     @pytest.fixture(autouse=True)
-    def setup_browser(self):
-        """Enhanced browser setup with better error handling"""
+    def setup_browser(self, driver, waiter, base_url, artifacts, step_timer):
+        """Check out a clean headless browser from the shared pool (see conftest.py)"""
         print("\n🔧 Setting up browser for professional testing...")
+        self.BASE_URL = base_url
         
-        # Chrome options for stable testing
-        chrome_options = Options()
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-extensions")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--window-size=1920,1080")
-        chrome_options.add_argument("--disable-web-security")
-        chrome_options.add_argument("--allow-running-insecure-content")
-        
-        # Remove headless mode to see tests in action
-        # chrome_options.add_argument("--headless")
-        
-        try:
-            # Try using Chrome directly (works if ChromeDriver is in PATH)
-            self.driver = webdriver.Chrome(options=chrome_options)
-            print("✅ Chrome WebDriver initialized successfully")
-        except Exception as e:
-            print(f"❌ Chrome initialization failed: {e}")
-            print("💡 Ensure Chrome browser is installed and ChromeDriver is available")
-            raise
-        
-        # Configure WebDriver
-        self.driver.maximize_window()
-        self.wait = WebDriverWait(self.driver, 15)
+        # Configure WebDriver (wrapped so every call is timed per step, see timing.py)
+        self.timer = step_timer
+        self.driver = step_timer.wrap(driver)
+        self.waiter = waiter  # event-driven waits (see waits.py)
+        self.artifacts = artifacts  # deduplicated, asynchronous screenshots (see artifacts.py)
+        self.wait = TimedWebDriverWait(self.driver, 15, step_timer)
         self.driver.implicitly_wait(10)
         
         yield  # Test execution happens here
         
-        print("🧹 Cleaning up browser session...")
-        try:
-            self.driver.quit()
-        except:
-            pass
+        print("🧹 Returning browser to the pool...")
     
+    def step(self, description):
+        """Print a test step and start timing it as a named step"""
+        print(f"📝 {description}")
+        self.timer.mark(description.rstrip('.'))
+    
+    @timed_step('screenshot')
     def take_screenshot(self, name):
-        """Enhanced screenshot functionality"""
+        """Enhanced screenshot functionality (written in the background, duplicates skipped)"""
         try:
-            timestamp = int(time.time())
-            filename = f"screenshot_{name}_{timestamp}.png"
-            self.driver.save_screenshot(filename)
+            filename = self.artifacts.screenshot(self.driver, name)
             print(f"📸 Screenshot saved: {filename}")
             return filename
         except Exception as e:
@@ -79,7 +57,7 @@ class TestProfessionalWebApplication:
     def verify_page_load(self, expected_title_part="Selenium Testing Demo"):
         """Helper method to verify page load"""
         try:
-            WebDriverWait(self.driver, 10).until(
+            TimedWebDriverWait(self.driver, 10, self.timer).until(
                 lambda driver: expected_title_part.lower() in driver.title.lower()
             )
             return True
@@ -144,17 +122,11 @@ class TestProfessionalWebApplication:
         """TC002: Comprehensive navigation testing across all pages"""
         print("\n🧪 TC002: Comprehensive Navigation Test")
         
-        navigation_tests = [
-            ("Home", "🏠 Home", "/"),
-            ("Login", "🔐 Login", "/login"),
-            ("Contact", "📧 Contact", "/contact"),
-            ("Features", "⭐ Features", "/features"),
-            ("About", "ℹ️ About", "/about")
-        ]
+        navigation_tests = NAVIGATION_PAGES
         
         for page_name, link_text, expected_path in navigation_tests:
             try:
-                print(f"📝 Testing navigation to {page_name} page...")
+                self.step(f"Testing navigation to {page_name} page...")
                 
                 # Start from homepage
                 self.driver.get(self.BASE_URL)
@@ -164,16 +136,15 @@ class TestProfessionalWebApplication:
                     nav_link = self.wait.until(
                         EC.element_to_be_clickable((By.PARTIAL_LINK_TEXT, page_name))
                     )
-                    nav_link.click()
                 except:
                     # Try alternative link text
                     nav_link = self.wait.until(
                         EC.element_to_be_clickable((By.LINK_TEXT, link_text))
                     )
-                    nav_link.click()
                 
-                # Wait for page to load
-                time.sleep(2)
+                # Click and wait for the destination page to load
+                self.waiter.click_and_wait(nav_link, replaces=2)
+                self.waiter.until(path_is(self.BASE_URL, expected_path), message=f"Did not reach {expected_path}")
                 
                 # Verify URL
                 current_url = self.driver.current_url
@@ -200,7 +171,7 @@ class TestProfessionalWebApplication:
         
         for username, user_data in self.TEST_USERS.items():
             try:
-                print(f"📝 Testing login for user: {username} ({user_data['role']})")
+                self.step(f"Testing login for user: {username} ({user_data['role']})")
                 
                 # Navigate to login page
                 self.driver.get(f"{self.BASE_URL}/login")
@@ -248,8 +219,7 @@ class TestProfessionalWebApplication:
                 print(f"✅ User role verified: {user_data['role']}")
                 
                 # Logout for next test
-                logout_link.click()
-                time.sleep(2)
+                self.waiter.click_and_wait(logout_link, replaces=2)
                 
                 print(f"✅ Login test passed for {username}")
                 
@@ -264,20 +234,11 @@ class TestProfessionalWebApplication:
         """TC004: Comprehensive invalid login scenarios"""
         print("\n🧪 TC004: Comprehensive Invalid Login Test")
         
-        invalid_scenarios = [
-            ("wrong_user", "wrong_pass", "Wrong username and password"),
-            ("admin", "wrongpass", "Valid username, wrong password"),
-            ("wronguser", "password123", "Wrong username, valid password"),
-            ("", "", "Empty credentials"),
-            ("admin", "", "Username only"),
-            ("", "password123", "Password only"),
-            ("admin123", "admin123", "Non-existent user"),
-            ("admin'; DROP TABLE users;--", "password123", "SQL injection attempt")
-        ]
+        invalid_scenarios = INVALID_LOGIN_SCENARIOS
         
-        for username, password, description in invalid_scenarios:
+        for username, password, description, _ in invalid_scenarios:
             try:
-                print(f"📝 Testing: {description}")
+                self.step(f"Testing: {description}")
                 
                 # Navigate to login page
                 self.driver.get(f"{self.BASE_URL}/login")
@@ -294,12 +255,9 @@ class TestProfessionalWebApplication:
                 password_field.clear()
                 password_field.send_keys(password)
                 
-                # Submit form
+                # Submit form and wait for the response page (no request if browser validation blocks it)
                 login_button = self.driver.find_element(By.XPATH, "//button[@type='submit']")
-                login_button.click()
-                
-                # Wait for response
-                time.sleep(3)
+                self.waiter.click_and_wait(login_button, replaces=3)
                 
                 # Verify we stay on login page
                 assert "/login" in self.driver.current_url, "Should remain on login page"
@@ -329,44 +287,11 @@ class TestProfessionalWebApplication:
         """TC005: Enhanced contact form testing with validation"""
         print("\n🧪 TC005: Enhanced Contact Form Test")
         
-        form_scenarios = [
-            {
-                'name': 'John Doe',
-                'email': 'john.doe@example.com',
-                'subject': 'Test Message from Selenium',
-                'message': 'This is a comprehensive test message for the contact form validation system.',
-                'expected': 'success',
-                'description': 'Valid form submission'
-            },
-            {
-                'name': '',
-                'email': 'test@example.com',
-                'subject': 'Test Subject',
-                'message': 'Test message',
-                'expected': 'error',
-                'description': 'Empty name field'
-            },
-            {
-                'name': 'Test User',
-                'email': 'invalid-email',
-                'subject': 'Test Subject',
-                'message': 'Test message with invalid email',
-                'expected': 'error',
-                'description': 'Invalid email format'
-            },
-            {
-                'name': 'Test User',
-                'email': 'test@example.com',
-                'subject': 'Hi',
-                'message': 'Short message',
-                'expected': 'error',
-                'description': 'Subject too short'
-            }
-        ]
+        form_scenarios = CONTACT_FORM_SCENARIOS
         
         for scenario in form_scenarios:
             try:
-                print(f"📝 Testing: {scenario['description']}")
+                self.step(f"Testing: {scenario['description']}")
                 
                 # Navigate to contact page
                 self.driver.get(f"{self.BASE_URL}/contact")
@@ -387,12 +312,9 @@ class TestProfessionalWebApplication:
                 message_field.clear()
                 message_field.send_keys(scenario['message'])
                 
-                # Submit form
+                # Submit form and wait for the response page (no request if browser validation blocks it)
                 submit_button = self.driver.find_element(By.XPATH, "//button[@type='submit']")
-                submit_button.click()
-                
-                # Wait for response
-                time.sleep(3)
+                self.waiter.click_and_wait(submit_button, replaces=3)
                 
                 # Check result based on expected outcome
                 if scenario['expected'] == 'success':
@@ -424,7 +346,7 @@ class TestProfessionalWebApplication:
         
         try:
             # Test 1: Login and verify session persistence
-            print("📝 Testing session establishment...")
+            self.step("Testing session establishment...")
             
             self.driver.get(f"{self.BASE_URL}/login")
             
@@ -450,10 +372,10 @@ class TestProfessionalWebApplication:
             ]
             
             for page_url in pages_to_visit:
-                print(f"📝 Checking session persistence on: {page_url}")
+                self.step(f"Checking session persistence on: {page_url}")
                 
                 self.driver.get(page_url)
-                time.sleep(2)
+                self.waiter.settle(replaces=2)
                 
                 # Check if logout link is present (indicates active session)
                 try:
@@ -472,24 +394,22 @@ class TestProfessionalWebApplication:
                 print("✅ Dashboard accessible with correct user context")
             
             # Test 4: Test logout functionality
-            print("📝 Testing logout functionality...")
+            self.step("Testing logout functionality...")
             
             logout_link = self.wait.until(
                 EC.element_to_be_clickable((By.PARTIAL_LINK_TEXT, "Logout (admin)"))
             )
-            logout_link.click()
-            
-            time.sleep(3)
+            self.waiter.click_and_wait(logout_link, replaces=3)
             
             # Verify logout successful
             assert "/dashboard" not in self.driver.current_url
             print("✅ Successfully logged out")
             
             # Test 5: Verify dashboard is no longer accessible
-            print("📝 Testing post-logout access control...")
+            self.step("Testing post-logout access control...")
             
             self.driver.get(f"{self.BASE_URL}/dashboard")
-            time.sleep(3)
+            self.waiter.until(flash_appeared('warning'), replaces=3, message="No login-required warning")
             
             # Should be redirected away from dashboard
             assert "/dashboard" not in self.driver.current_url
@@ -509,10 +429,10 @@ class TestProfessionalWebApplication:
         
         try:
             # Test health API endpoint
-            print("📝 Testing API health endpoint...")
+            self.step("Testing API health endpoint...")
             
             self.driver.get(f"{self.BASE_URL}/api/health")
-            time.sleep(2)
+            self.waiter.until(page_loaded, replaces=2)
             
             # Check if JSON response is displayed
             page_content = self.driver.page_source
@@ -521,7 +441,7 @@ class TestProfessionalWebApplication:
             
             # Navigate back to main site
             self.driver.get(self.BASE_URL)
-            time.sleep(1)
+            self.waiter.until(page_loaded, replaces=1)
             
             print("✅ TC007 PASSED: API endpoint testing completed")
             
@@ -544,14 +464,14 @@ class TestProfessionalWebApplication:
             ]
             
             for width, height, description in window_sizes:
-                print(f"📝 Testing {description} view ({width}x{height})")
+                self.step(f"Testing {description} view ({width}x{height})")
                 
                 # Set window size
                 self.driver.set_window_size(width, height)
                 
-                # Navigate to homepage
+                # Navigate to homepage and let the layout settle at this size
                 self.driver.get(self.BASE_URL)
-                time.sleep(2)
+                self.waiter.settle(replaces=2)
                 
                 # Verify key elements are still present and visible
                 header = self.driver.find_element(By.CLASS_NAME, "header")
@@ -581,10 +501,10 @@ class TestProfessionalWebApplication:
         
         try:
             # Test 404 page
-            print("📝 Testing 404 error page...")
+            self.step("Testing 404 error page...")
             
             self.driver.get(f"{self.BASE_URL}/nonexistent-page")
-            time.sleep(2)
+            self.waiter.until(page_loaded, replaces=2)
             
             # Check for 404 content or proper error handling
             page_content = self.driver.page_source.lower()
@@ -614,39 +534,38 @@ class TestProfessionalWebApplication:
         
         try:
             # Test 1: Direct dashboard access without authentication
-            print("📝 Testing unauthorized dashboard access...")
+            self.step("Testing unauthorized dashboard access...")
             
             self.driver.get(f"{self.BASE_URL}/logout")  # Ensure logged out
-            time.sleep(2)
+            self.waiter.settle(replaces=2)
             
             self.driver.get(f"{self.BASE_URL}/dashboard")
-            time.sleep(3)
+            self.waiter.until(flash_appeared('warning'), replaces=3, message="No login-required warning")
             
             assert "/dashboard" not in self.driver.current_url, "Dashboard should not be directly accessible"
             print("✅ Unauthorized dashboard access correctly blocked")
             
             # Test 2: Input sanitization (basic XSS prevention)
-            print("📝 Testing input sanitization...")
+            self.step("Testing input sanitization...")
             
             self.driver.get(f"{self.BASE_URL}/login")
             
             username_field = self.wait.until(EC.presence_of_element_located((By.ID, "username")))
             username_field.clear()
-            username_field.send_keys("<script>alert('XSS')</script>")
+            username_field.send_keys(XSS_USERNAME)
             
             password_field = self.driver.find_element(By.ID, "password")
             password_field.clear()
             password_field.send_keys("password123")
             
-            self.driver.find_element(By.XPATH, "//button[@type='submit']").click()
-            time.sleep(2)
+            self.waiter.click_and_wait(self.driver.find_element(By.XPATH, "//button[@type='submit']"), replaces=2)
             
             # Should remain on login page and not execute script
             assert "/login" in self.driver.current_url
             print("✅ Basic XSS prevention working")
             
             # Test 3: Session security after logout
-            print("📝 Testing session security...")
+            self.step("Testing session security...")
             
             # Login first
             self.driver.get(f"{self.BASE_URL}/login")
@@ -666,19 +585,16 @@ class TestProfessionalWebApplication:
             logout_link = self.wait.until(
                 EC.element_to_be_clickable((By.PARTIAL_LINK_TEXT, "Logout"))
             )
-            logout_link.click()
-            time.sleep(2)
+            self.waiter.click_and_wait(logout_link, replaces=2)
             
             # Try to access dashboard again using browser back
-            self.driver.back()
-            time.sleep(2)
+            self.waiter.navigate(self.driver.back, replaces=2)
             
             # Should not be able to access dashboard
             if "/dashboard" in self.driver.current_url:
                 # Try to interact with page
                 try:
-                    self.driver.refresh()
-                    time.sleep(2)
+                    self.waiter.navigate(self.driver.refresh, replaces=2)
                     assert "/dashboard" not in self.driver.current_url
                     print("✅ Session properly invalidated after logout")
                 except:
@@ -726,31 +642,41 @@ if __name__ == "__main__":
     print("   • Error handling & edge cases")
     print("=" * 70)
     print("🔧 Prerequisites:")
-    print("   • Flask application running on http://localhost:5000")
+    print("   • App is started automatically on an ephemeral port")
+    print("     (set SELENIUM_BASE_URL to test an already running server)")
     print("   • Chrome browser installed")
     print("   • ChromeDriver available (automatic download)")
+    print("   • Optional: pytest-xdist for parallel execution")
     print("=" * 70)
     
     # Run with pytest for enhanced reporting
     import subprocess
     import sys
     
+    import importlib.util
+    
+    command = [
+        sys.executable, "-m", "pytest", __file__, 
+        "-v", "--tb=short", "--report-dir=reports"
+    ]
+    # Run test cases concurrently when pytest-xdist is available
+    if importlib.util.find_spec("xdist"):
+        command += ["-n", os.environ.get("SELENIUM_WORKERS", "4")]
+        print(f"⚡ Running in parallel on {command[-1]} workers")
+    
     try:
-        result = subprocess.run([
-            sys.executable, "-m", "pytest", __file__, 
-            "-v", "--tb=short", "--html=professional_test_report.html", "--self-contained-html"
-        ], capture_output=False)
+        result = subprocess.run(command, capture_output=False)
         
         print("\n" + "=" * 70)
         if result.returncode == 0:
             print("🎉 ALL TESTS COMPLETED SUCCESSFULLY!")
-            print("📊 Professional test report: professional_test_report.html")
-            print("📸 Screenshots saved for verification")
+            print("📊 Test report: reports/run-<id>/report.html (results streamed to JSONL alongside)")
+            print("📸 Screenshots saved under artifacts/ (linked from the report)")
             print("✅ Ready for professional demonstration!")
         else:
             print("⚠️ Some tests encountered issues.")
-            print("📊 Check professional_test_report.html for details")
-            print("📸 Error screenshots available for debugging")
+            print("📊 Check reports/run-<id>/report.html for details")
+            print("📸 Error screenshots available under artifacts/")
         print("=" * 70)
             
     except Exception as e:
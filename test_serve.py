@@ -0,0 +1,120 @@
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from serve import PooledWSGIServer, load_config, parse_bind, process_local_stores
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_load_config_keeps_uppercase_settings(tmp_path):
+    path = tmp_path / 'production.cfg'
+    path.write_text("import os\nUSER_DB_PATH = os.path.join('data', 'users.db')\n"
+                    "CONTACT_BURST = 2 * 5\nhelper = 'ignored'\n")
+    assert load_config(str(path)) == {'USER_DB_PATH': os.path.join('data', 'users.db'), 'CONTACT_BURST': 10}
+    assert load_config(None) == {}
+
+
+def test_process_local_stores():
+    assert process_local_stores({'USER_DB_PATH': None, 'SESSION_BACKEND': 'memory',
+                                 'CONTACT_DB_PATH': ':memory:'}) == ['users', 'sessions', 'contact messages']
+    assert process_local_stores({'USER_DB_PATH': 'users.db', 'SESSION_BACKEND': 'sqlite',
+                                 'CONTACT_DB_PATH': 'contact.db'}) == []
+    # Keys the config does not set are not reported
+    assert process_local_stores({}) == []
+
+
+def test_parse_bind():
+    assert parse_bind('0.0.0.0:8000') == ('0.0.0.0', 8000)
+    assert parse_bind(':5000') == ('127.0.0.1', 5000)
+    assert parse_bind('[::1]:8001') == ('::1', 8001)
+
+
+def test_pooled_server_answers_on_its_thread_pool():
+    threads = []
+
+    def wsgi_app(environ, start_response):
+        threads.append(threading.current_thread().name)
+        start_response('200 OK', [('Content-Type', 'text/plain')])
+        return [b'pooled']
+
+    server = PooledWSGIServer('127.0.0.1', 0, wsgi_app, threads=2)
+    serving = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+    serving.start()
+    try:
+        for _ in range(3):
+            with urllib.request.urlopen(f'http://127.0.0.1:{server.server_port}/', timeout=5) as response:
+                assert response.read() == b'pooled'
+    finally:
+        server.shutdown()
+        server.server_close()
+        serving.join(timeout=5)
+    assert all(name.startswith('wsgi') for name in threads)
+
+
+def free_port():
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        return probe.getsockname()[1]
+
+
+def worker_pid(url, timeout=30.0):
+    """pid of the worker that answers /api/health/deep, waiting for the server to come up"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with urllib.request.urlopen(f'{url}/api/health/deep', timeout=2) as response:
+                return json.loads(response.read())['pid']
+        except (urllib.error.URLError, ConnectionError):
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='the pre-fork master needs os.fork')
+def test_master_starts_reloads_and_stops(tmp_path):
+    config = tmp_path / 'serve.cfg'
+    config.write_text(f"USER_DB_PATH = {str(tmp_path / 'users.db')!r}\n"
+                      f"CONTACT_DB_PATH = {str(tmp_path / 'contact.db')!r}\n"
+                      "SESSION_BACKEND = 'sqlite'\n"
+                      f"SESSION_DB_PATH = {str(tmp_path / 'sessions.db')!r}\n")
+    port = free_port()
+    url = f'http://127.0.0.1:{port}'
+    log_path = tmp_path / 'serve.log'
+    with open(log_path, 'w') as log:
+        master = subprocess.Popen(
+            [sys.executable, '-u', 'serve.py', '--bind', f'127.0.0.1:{port}', '--workers', '2',
+             '--threads', '2', '--cold', '--graceful-timeout', '5', '--config', str(config)],
+            cwd=HERE, stdout=log, stderr=subprocess.STDOUT
+        )
+    try:
+        first = {worker_pid(url) for _ in range(6)}
+        assert master.pid not in first
+
+        master.send_signal(signal.SIGHUP)
+        deadline = time.monotonic() + 30
+        while worker_pid(url) in first:
+            assert time.monotonic() < deadline, 'old workers still answering after SIGHUP'
+            time.sleep(0.1)
+        assert master.poll() is None
+
+        master.send_signal(signal.SIGTERM)
+        assert master.wait(timeout=15) == 0
+    finally:
+        if master.poll() is None:
+            master.kill()
+            master.wait()
+    output = log_path.read_text()
+    assert 'Reloaded: generation 1 started' in output
+    assert 'Shutting down workers' in output
+    # SQLite stores are shared, so workers do not warn about process-local state
+    assert 'in memory' not in output
@@ -0,0 +1,106 @@
+import pytest
+from flask import Flask, session
+
+from sessions import (MemorySessionBackend, ServerSideSessionInterface, SQLiteSessionBackend,
+                      create_session_interface)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_memory_backend_evicts_least_recently_used():
+    backend = MemorySessionBackend(max_entries=2, clock=FakeClock())
+    backend.set('a', '1')
+    backend.set('b', '2')
+    assert backend.get('a') == '1'  # 'a' is now the most recent
+    backend.set('c', '3')
+    assert backend.get('b') is None
+    assert backend.get('a') == '1' and backend.get('c') == '3'
+    assert len(backend) == 2
+
+
+def test_memory_backend_expires_after_ttl():
+    clock = FakeClock()
+    backend = MemorySessionBackend(ttl=60, clock=clock)
+    backend.set('a', '1')
+    clock.now += 60
+    assert backend.get('a') == '1'
+    clock.now += 1
+    assert backend.get('a') is None
+    assert len(backend) == 0
+
+
+def test_sqlite_backend_round_trip_and_delete(tmp_path):
+    path = str(tmp_path / 'sessions.db')
+    backend = SQLiteSessionBackend(path)
+    backend.set('a', '{"user": "ada"}')
+    backend.set('a', '{"user": "alan"}')
+    assert backend.get('a') == '{"user": "alan"}'
+    # Records survive a restart
+    assert SQLiteSessionBackend(path).get('a') == '{"user": "alan"}'
+    backend.delete('a')
+    assert backend.get('a') is None
+    assert len(backend) == 0
+
+
+def test_sqlite_backend_hides_and_purges_expired(tmp_path):
+    backend = SQLiteSessionBackend(str(tmp_path / 'sessions.db'), ttl=-1, purge_every=3)
+    backend.set('a', '1')
+    assert backend.get('a') is None  # expired rows are never returned
+    backend.set('b', '2')
+    assert len(backend) == 2
+    backend.set('c', '3')  # every third write purges expired rows
+    assert len(backend) == 0
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def session_app(request, tmp_path):
+    app = Flask(__name__)
+    app.secret_key = 'test'
+    app.session_interface = create_session_interface(request.param, path=str(tmp_path / 'sessions.db'))
+
+    @app.route('/login/<name>')
+    def login(name):
+        session.clear()
+        session['username'] = name
+        return ''
+
+    @app.route('/whoami')
+    def whoami():
+        return session.get('username', '')
+
+    @app.route('/logout')
+    def logout():
+        session.clear()
+        return ''
+
+    return app
+
+
+def test_interface_rotates_and_revokes_session_ids(session_app):
+    client = session_app.test_client()
+    client.get('/login/ada')
+    first = client.get_cookie('session').value
+    assert client.get('/whoami').get_data(as_text=True) == 'ada'
+
+    client.get('/login/alan')  # logging in again rotates the id
+    assert client.get_cookie('session').value != first
+    replay = session_app.test_client()
+    replay.set_cookie('session', first)
+    assert replay.get('/whoami').get_data(as_text=True) == ''
+
+    client.get('/logout')
+    assert client.get_cookie('session') is None
+    assert len(session_app.session_interface.backend) == 0
+
+
+def test_create_session_interface_by_name():
+    assert create_session_interface('cookie') is None
+    assert isinstance(create_session_interface('memory'), ServerSideSessionInterface)
+    with pytest.raises(ValueError):
+        create_session_interface('redis')
@@ -0,0 +1,39 @@
+import pytest
+from flask import Flask
+
+from app import DEFAULT_CONFIG
+from spam import ContactGuard, TokenBucketLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_bucket_allows_a_burst_then_the_steady_rate():
+    clock = FakeClock()
+    limiter = TokenBucketLimiter(rate=0.5, burst=2, clock=clock)
+    assert [limiter.acquire('k') for _ in range(3)] == [0, 0, 2]
+    clock.now += 2
+    assert limiter.acquire('k') == 0
+
+
+def test_zero_rate_disables_the_limit():
+    limiter = TokenBucketLimiter(rate=0, burst=1, clock=FakeClock())
+    assert [limiter.acquire('k') for _ in range(10)] == [0] * 10
+
+
+def test_negative_rate_is_rejected():
+    with pytest.raises(ValueError):
+        TokenBucketLimiter(rate=-1)
+
+
+def test_guard_with_rate_zero_never_rate_limits():
+    app = Flask(__name__)
+    app.config.update(DEFAULT_CONFIG, CONTACT_RATE_PER_MINUTE=0, CONTACT_BURST=1)
+    guard = ContactGuard(app)
+    assert [guard.retry_after('ip:203.0.113.1') for _ in range(5)] == [0] * 5
+    assert guard.stats()['rate_limited'] == 0
@@ -0,0 +1,66 @@
+from types import SimpleNamespace
+
+from throttle import LoginThrottle, client_ip
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_backoff_doubles_after_free_attempts():
+    clock = FakeClock()
+    throttle = LoginThrottle(free_attempts=2, base_delay=1.0, max_delay=5.0, clock=clock)
+    assert [throttle.record_failure('k') for _ in range(6)] == [0, 0, 1, 2, 4, 5]
+    assert throttle.retry_after('k') == 5
+    clock.now += 5
+    assert throttle.retry_after('k') == 0
+
+
+def test_backoff_stays_capped_after_thousands_of_failures():
+    throttle = LoginThrottle(free_attempts=5, base_delay=1.0, max_delay=300.0, clock=FakeClock())
+    delays = [throttle.record_failure('k') for _ in range(5000)]
+    assert delays[-1] == 300
+    assert throttle.retry_after('k') == 300
+
+
+def test_reset_and_stale_entries_forget_failures():
+    clock = FakeClock()
+    throttle = LoginThrottle(free_attempts=0, reset_after=60.0, clock=clock)
+    throttle.record_failure('k')
+    throttle.reset('k')
+    assert throttle.retry_after('k') == 0 and len(throttle) == 0
+
+    throttle.record_failure('k')
+    clock.now += 61
+    assert throttle.retry_after('k') == 0
+    assert throttle.record_failure('k') == 1  # counted from scratch
+
+
+def test_max_entries_evicts_least_recently_failing():
+    throttle = LoginThrottle(free_attempts=0, max_entries=2, clock=FakeClock())
+    for key in ('a', 'b', 'a', 'c'):
+        throttle.record_failure(key)
+    assert len(throttle) == 2
+    assert throttle.retry_after('b') == 0
+    assert throttle.retry_after('a') > 0 and throttle.retry_after('c') > 0
+
+
+def test_empty_key_is_never_throttled():
+    throttle = LoginThrottle(free_attempts=0)
+    assert throttle.record_failure('') == 0
+    assert throttle.retry_after('') == 0
+
+
+def test_client_ip_trusts_only_configured_hops():
+    request = SimpleNamespace(remote_addr='10.0.0.2',
+                              headers={'X-Forwarded-For': '1.2.3.4, 198.51.100.7, 10.0.0.1'})
+    assert client_ip(request) == '10.0.0.2'
+    assert client_ip(request, 1) == '10.0.0.1'
+    assert client_ip(request, 2) == '198.51.100.7'
+    # Fewer hops than configured means the header did not come through the proxies
+    assert client_ip(request, 4) == '10.0.0.2'
+    assert client_ip(SimpleNamespace(remote_addr='10.0.0.2', headers={}), 1) == '10.0.0.2'
@@ -0,0 +1,104 @@
+from timing import StepTimer, TimingListener, summary_lines, timed_step
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeDriver:
+    """Answers the Navigation Timing script the listener runs after driver.get"""
+
+    def __init__(self, metrics=None):
+        self.metrics = metrics
+
+    def execute_script(self, script):
+        return self.metrics
+
+
+def operation(clock, before, after, seconds):
+    """Fire a before/after event pair `seconds` apart, as EventFiringWebDriver does"""
+    before()
+    clock.now += seconds
+    after()
+
+
+def test_listener_events_accumulate_per_step_and_kind():
+    clock = FakeClock()
+    timer = StepTimer(clock=clock)
+    listener = TimingListener(timer)
+    driver = FakeDriver({'ttfb_ms': 12.5, 'load_ms': 80.0})
+
+    timer.mark('open login page')
+    operation(clock, lambda: listener.before_navigate_to('/login', driver),
+              lambda: listener.after_navigate_to('/login', driver), 0.5)
+    operation(clock, lambda: listener.before_find('id', 'username', driver),
+              lambda: listener.after_find('id', 'username', driver), 0.25)
+
+    timer.mark('submit')
+    operation(clock, lambda: listener.before_change_value_of(None, driver),
+              lambda: listener.after_change_value_of(None, driver), 0.125)
+    operation(clock, lambda: listener.before_click(None, driver),
+              lambda: listener.after_click(None, driver), 0.125)
+    # Lookups made while a wait polls are folded into the wait
+    with timer.measure('wait'):
+        for _ in range(3):
+            operation(clock, lambda: listener.before_find('id', 'flash', driver),
+                      lambda: listener.after_find('id', 'flash', driver), 0.5)
+    clock.now += 0.5  # time outside any driver call
+
+    result = timer.finish()
+    assert [step['name'] for step in result['steps']] == ['open login page', 'submit']
+    opened, submitted = result['steps']
+    assert (opened['navigation'], opened['find'], opened['operations'], opened['seconds']) == (0.5, 0.25, 2, 0.75)
+    assert (submitted['action'], submitted['wait'], submitted['find']) == (0.25, 1.5, 0.0)
+    assert submitted['operations'] == 3
+    assert submitted['seconds'] == 2.25
+    assert result['totals'] == {'navigation': 0.5, 'find': 0.25, 'action': 0.25, 'wait': 1.5,
+                                'script': 0.0, 'seconds': 3.0}
+    assert result['navigations'] == [{'step': 'open login page', 'url': '/login', 'ttfb_ms': 12.5, 'load_ms': 80.0}]
+
+
+def test_failed_operation_is_dropped():
+    clock = FakeClock()
+    timer = StepTimer(clock=clock)
+    listener = TimingListener(timer)
+    listener.before_find('id', 'missing', FakeDriver())
+    clock.now += 1
+    listener.on_exception(Exception('no such element'), FakeDriver())
+    listener.after_find('id', 'missing', FakeDriver())
+    assert timer.finish()['totals']['find'] == 0.0
+
+
+def test_nested_steps_resume_and_merge():
+    clock = FakeClock()
+
+    class Page:
+        timer = StepTimer(clock=clock)
+
+        @timed_step('fill form')
+        def fill(self):
+            clock.now += 2
+
+    page = Page()
+    page.timer.mark('test body')
+    clock.now += 1
+    page.fill()
+    clock.now += 1
+    with page.timer.step('fill form'):
+        clock.now += 3
+    steps = {step['name']: step['seconds'] for step in page.timer.finish()['steps']}
+    # 'setup' took no time and had no operations, so it is left out
+    assert steps == {'test body': 2.0, 'fill form': 5.0}
+
+
+def test_summary_lists_slowest_tests_first():
+    fast = {'navigation': 0.2, 'find': 0.1, 'action': 0.0, 'wait': 0.0, 'script': 0.0, 'seconds': 0.3}
+    slow = {'navigation': 1.0, 'find': 0.5, 'action': 0.25, 'wait': 4.0, 'script': 0.0, 'seconds': 6.0}
+    lines = summary_lines({'test_ui.py::TestUI::test_fast': fast, 'test_ui.py::TestUI::test_slow': slow})
+    assert lines[0].split() == ['test', 'navigation', 'find', 'action', 'wait', 'script', 'total']
+    assert [line.split()[0] for line in lines[1:]] == ['test_slow', 'test_fast']
+    assert lines[1].split()[1:] == ['1.00', '0.50', '0.25', '4.00', '0.00', '6.00']
@@ -0,0 +1,107 @@
+import sqlite3
+
+import pytest
+
+from user_store import InMemoryUserStore, SQLiteUserStore, UserStore, create_user_store, dummy_password_hash
+
+USERS = {
+    'ada': {'password': 'engine1', 'role': 'Student', 'name': 'Ada', 'email': 'ada@example.com'},
+    'alan': {'password': 'enigma2', 'role': 'Student', 'name': 'Alan', 'email': 'alan@example.com'}
+}
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def store(request, tmp_path):
+    if request.param == 'memory':
+        yield InMemoryUserStore()
+    else:
+        store = SQLiteUserStore(str(tmp_path / 'users.db'))
+        yield store
+        store.close()
+
+
+def test_seed_add_and_verify(store):
+    store.seed(USERS)
+    store.seed(USERS)  # already present: no duplicates
+    assert len(store) == 2
+    assert store.add('ada', 'other', 'Admin', 'Ada', 'a@example.com') is False
+    assert store.verify('ada', 'engine1')['name'] == 'Ada'
+    assert store.verify('ada', 'engine1')['role'] == 'Student'  # served from the verification cache
+    assert store.verify('ada', 'wrong') is None
+    assert store.verify('nobody', 'engine1') is None
+    assert 'alan' in store and 'nobody' not in store
+
+
+def test_online_count_counts_first_logins_only(store):
+    store.seed(USERS)
+    assert store.online_count() == 0
+    store.record_login('ada', '2026-01-01 10:00:00')
+    store.record_login('ada', '2026-01-02 10:00:00')
+    store.record_login('nobody', '2026-01-02 10:00:00')
+    assert store.online_count() == 1
+    assert store.get('ada')['last_login'] == '2026-01-02 10:00:00'
+
+
+def test_sqlite_counters_are_shared_between_processes(tmp_path):
+    """Two stores on one file (as with several workers) agree on the counters"""
+    path = str(tmp_path / 'users.db')
+    first, second = SQLiteUserStore(path), SQLiteUserStore(path)
+    try:
+        first.seed(USERS)
+        second.record_login('alan', '2026-01-01 10:00:00')
+        assert len(first) == len(second) == 2
+        assert first.online_count() == second.online_count() == 1
+    finally:
+        first.close()
+        second.close()
+
+
+def test_sqlite_counters_initialized_for_existing_database(tmp_path):
+    """A database created before the counters table gets counted once on open"""
+    path = str(tmp_path / 'users.db')
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE users (username TEXT PRIMARY KEY, password_hash TEXT NOT NULL, '
+                 'role TEXT NOT NULL, name TEXT NOT NULL, email TEXT NOT NULL, last_login TEXT)')
+    conn.executemany('INSERT INTO users VALUES (?, ?, ?, ?, ?, ?)', [
+        ('a', 'x', 'r', 'n', 'e', None), ('b', 'x', 'r', 'n', 'e', '2026-01-01 10:00:00')
+    ])
+    conn.commit()
+    conn.close()
+
+    store = SQLiteUserStore(path)
+    try:
+        assert len(store) == 2
+        assert store.online_count() == 1
+    finally:
+        store.close()
+
+
+def test_create_user_store_picks_backend(tmp_path):
+    assert isinstance(create_user_store(), InMemoryUserStore)
+    store = create_user_store(str(tmp_path / 'users.db'))
+    assert isinstance(store, SQLiteUserStore)
+    store.close()
+
+
+def test_incomplete_backend_fails_at_construction():
+    class NoLogins(UserStore):
+        def get(self, username):
+            return None
+
+        def add(self, username, password, role, name, email):
+            return False
+
+        def _password_hash(self, username):
+            return None
+
+    with pytest.raises(TypeError):
+        NoLogins()
+
+
+def test_unknown_username_still_checks_a_hash(store, monkeypatch):
+    store.seed(USERS)
+    checked = []
+    monkeypatch.setattr('user_store.check_password_hash',
+                        lambda password_hash, password: checked.append(password_hash) or False)
+    assert store.verify('nobody', 'engine1') is None
+    assert checked == [dummy_password_hash()]
@@ -0,0 +1,37 @@
+from flashes import MESSAGES
+from validation import CONTACT_FORM, LOGIN_FORM, email_is_valid
+
+
+def test_valid_contact_form_is_cleaned():
+    data, errors = CONTACT_FORM.validate({
+        'name': '  Ada  ', 'email': 'ada@example.com',
+        'subject': 'Engines', 'message': 'Analytical engine notes'
+    })
+    assert errors == []
+    assert data == {'name': 'Ada', 'email': 'ada@example.com',
+                    'subject': 'Engines', 'message': 'Analytical engine notes'}
+
+
+def test_each_field_reports_its_first_failing_rule():
+    data, errors = CONTACT_FORM.validate({'name': 'A', 'subject': 'Hi', 'message': 'Short'})
+    assert data['email'] == ''
+    # email is not also reported as invalid
+    assert errors == ['name_short', 'email_required', 'subject_short', 'message_short']
+    assert CONTACT_FORM.validate({'email': 'a@b'})[1][1] == 'email_invalid'
+
+
+def test_shared_code_is_reported_once():
+    assert LOGIN_FORM.validate({})[1] == ['credentials_missing']
+
+
+def test_every_error_code_has_a_fixed_message():
+    for form in (CONTACT_FORM, LOGIN_FORM):
+        for _, rules in form._checks:
+            for _, code in rules:
+                assert '{}' not in MESSAGES[code][1], code
+
+
+def test_email_is_valid():
+    assert email_is_valid('john.doe@example.com')
+    for email in ('', '@example.com', 'john@', 'john@localhost', 'a@b.c'):
+        assert not email_is_valid(email), email
@@ -0,0 +1,101 @@
+"""
+Failed-login throttling for the Selenium testing demo.
+
+Tracks failed attempts per key (username or client IP) and applies an
+exponential backoff once a key exceeds its free attempts. Throttled
+attempts are rejected immediately instead of sleeping in the handler.
+
+Behind a load balancer every request arrives from the proxy's address, so
+client_ip() takes the client from X-Forwarded-For when the app is told how
+many proxy hops to trust (TRUSTED_PROXIES); otherwise the header is ignored,
+since any client can set it.
+"""
+import math
+import threading
+import time
+from collections import OrderedDict
+
+
+def client_ip(request, trusted_proxies=0):
+    """Client address for throttling keys, trusting `trusted_proxies` X-Forwarded-For hops"""
+    if trusted_proxies:
+        # Each trusted proxy appends the address it received the request from
+        forwarded = [addr.strip() for addr in request.headers.get('X-Forwarded-For', '').split(',')]
+        forwarded = [addr for addr in forwarded if addr]
+        if len(forwarded) >= trusted_proxies:
+            return forwarded[-trusted_proxies]
+    return request.remote_addr
+
+
+class LoginThrottle:
+    """Bounded, thread-safe failed-attempt tracker with exponential backoff"""
+
+    def __init__(self, free_attempts=5, base_delay=1.0, max_delay=300.0,
+                 reset_after=600.0, max_entries=10000, clock=time.monotonic):
+        self.free_attempts = free_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.reset_after = reset_after
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> [failures, blocked_until, last_failure]
+        self._entries = OrderedDict()
+
+    def _live_entry(self, key, now):
+        """Return the entry for key, dropping it if it has gone stale"""
+        entry = self._entries.get(key)
+        if entry is not None and now - entry[2] > self.reset_after:
+            del self._entries[key]
+            return None
+        return entry
+
+    def retry_after(self, key):
+        """Seconds until key may attempt again (0 when not throttled)"""
+        if not key:
+            return 0
+        now = self._clock()
+        with self._lock:
+            entry = self._live_entry(key, now)
+            if entry is None:
+                return 0
+            return max(0, math.ceil(entry[1] - now))
+
+    def record_failure(self, key):
+        """Count a failed attempt and return the resulting backoff in seconds"""
+        if not key:
+            return 0
+        now = self._clock()
+        with self._lock:
+            entry = self._live_entry(key, now)
+            if entry is None:
+                entry = self._entries[key] = [0, 0.0, now]
+            else:
+                self._entries.move_to_end(key)
+            entry[0] += 1
+            entry[2] = now
+
+            excess = entry[0] - self.free_attempts
+            delay = 0.0
+            if excess > 0:
+                # Capped exponent: an unbounded 2 ** n overflows float after ~1000 failures
+                delay = min(self.max_delay, self.base_delay * (2 ** min(excess - 1, 32)))
+                entry[1] = now + delay
+
+            # Evict least recently failing keys so a flood cannot grow memory
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return math.ceil(delay)
+
+    def reset(self, key):
+        """Forget all failures for key (e.g. after a successful login)"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Forget every tracked key"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,228 @@
+"""
+Per-step timing for the Selenium suite.
+
+A StepTimer splits a test into named steps (`timer.mark(name)`,
+`with timer.step(name):` or the `@timed_step()` decorator) and records
+how long each step spends on:
+
+    navigation   driver.get / back / forward (plus Navigation Timing metrics)
+    find         find_element(s)
+    action       click / send_keys / clear
+    wait         explicit waits (WebDriverWait, waits.Waiter)
+    script       execute_script
+
+Driver calls are observed through Selenium's EventFiringWebDriver, so the
+test code is unchanged apart from naming its steps. Element lookups and
+scripts issued *inside* a wait are attributed to the wait, not counted
+twice. Every driver.get also records the browser's Navigation Timing
+entry (TTFB, DOMContentLoaded, load, transfer size).
+"""
+import functools
+import threading
+import time
+from contextlib import contextmanager
+
+from selenium.webdriver.support.events import AbstractEventListener, EventFiringWebDriver
+from selenium.webdriver.support.ui import WebDriverWait
+
+KINDS = ('navigation', 'find', 'action', 'wait', 'script')
+
+_NAVIGATION_TIMING = """
+var entry = performance.getEntriesByType('navigation')[0];
+if (!entry) { return null; }
+return {
+    ttfb_ms: entry.responseStart,
+    response_end_ms: entry.responseEnd,
+    dom_content_loaded_ms: entry.domContentLoadedEventEnd,
+    load_ms: entry.loadEventEnd,
+    transfer_bytes: entry.transferSize
+};
+"""
+
+
+class StepTimer:
+    """Accumulates durations per step and per kind of browser operation"""
+
+    def __init__(self, clock=time.perf_counter):
+        self._clock = clock
+        self.steps = []
+        self.navigations = []
+        self._current = None
+        self._suppressed = 0
+        self._started = {}
+        self._lock = threading.Lock()
+        self.mark('setup')
+
+    def mark(self, name):
+        """Start a new step; the previous one ends here"""
+        now = self._clock()
+        if self._current is not None:
+            self._current['seconds'] = now - self._current.pop('_started')
+        self._current = {'name': name, '_started': now, 'seconds': 0.0,
+                         **{kind: 0.0 for kind in KINDS}, 'operations': 0}
+        self.steps.append(self._current)
+
+    @contextmanager
+    def step(self, name):
+        """Time a block as its own step, then resume the enclosing one"""
+        previous = self._current['name'] if self._current else None
+        self.mark(name)
+        try:
+            yield self._current
+        finally:
+            if previous is not None:
+                self.mark(previous)
+
+    def record(self, kind, seconds):
+        with self._lock:
+            self._current[kind] += seconds
+            self._current['operations'] += 1
+
+    @contextmanager
+    def measure(self, kind):
+        """Time a block as one operation of `kind`; nested operations are folded into it"""
+        if self._suppressed:
+            yield
+            return
+        self._suppressed += 1
+        started = self._clock()
+        try:
+            yield
+        finally:
+            self._suppressed -= 1
+            self.record(kind, self._clock() - started)
+
+    def begin(self, key):
+        if not self._suppressed:
+            self._started[key] = self._clock()
+
+    def end(self, key, kind):
+        started = self._started.pop(key, None)
+        if started is not None:
+            self.record(kind, self._clock() - started)
+
+    def record_navigation(self, url, metrics):
+        self.navigations.append({'step': self._current['name'], 'url': url, **(metrics or {})})
+
+    def finish(self):
+        """Close the open step and return the structured timings"""
+        if self._current is not None and '_started' in self._current:
+            self._current['seconds'] = self._clock() - self._current.pop('_started')
+        # A step resumed after a nested `with step()` block shows up once, summed
+        merged = {}
+        for step in self.steps:
+            if step['name'] in merged:
+                target = merged[step['name']]
+                for key in ('seconds', 'operations') + KINDS:
+                    target[key] += step[key]
+            else:
+                merged[step['name']] = dict(step)
+        steps = [step for step in merged.values() if step['seconds'] or step['operations']]
+        totals = {kind: round(sum(step[kind] for step in steps), 4) for kind in KINDS}
+        totals['seconds'] = round(sum(step['seconds'] for step in steps), 4)
+        return {
+            'steps': [{key: round(value, 4) if isinstance(value, float) else value
+                       for key, value in step.items()} for step in steps],
+            'totals': totals,
+            'navigations': self.navigations
+        }
+
+    def wrap(self, driver):
+        """An EventFiringWebDriver around driver that reports into this timer"""
+        return EventFiringWebDriver(driver, TimingListener(self))
+
+
+class TimingListener(AbstractEventListener):
+    """Feeds WebDriver events into a StepTimer"""
+
+    def __init__(self, timer):
+        self.timer = timer
+
+    def before_navigate_to(self, url, driver):
+        self.timer.begin('navigation')
+
+    def after_navigate_to(self, url, driver):
+        self.timer.end('navigation', 'navigation')
+        try:
+            metrics = driver.execute_script(_NAVIGATION_TIMING)
+        except Exception:
+            metrics = None
+        self.timer.record_navigation(url, metrics)
+
+    def before_navigate_back(self, driver):
+        self.timer.begin('navigation')
+
+    def after_navigate_back(self, driver):
+        self.timer.end('navigation', 'navigation')
+
+    def before_navigate_forward(self, driver):
+        self.timer.begin('navigation')
+
+    def after_navigate_forward(self, driver):
+        self.timer.end('navigation', 'navigation')
+
+    def before_find(self, by, value, driver):
+        self.timer.begin('find')
+
+    def after_find(self, by, value, driver):
+        self.timer.end('find', 'find')
+
+    def before_click(self, element, driver):
+        self.timer.begin('action')
+
+    def after_click(self, element, driver):
+        self.timer.end('action', 'action')
+
+    def before_change_value_of(self, element, driver):
+        self.timer.begin('action')
+
+    def after_change_value_of(self, element, driver):
+        self.timer.end('action', 'action')
+
+    def before_execute_script(self, script, driver):
+        self.timer.begin('script')
+
+    def after_execute_script(self, script, driver):
+        self.timer.end('script', 'script')
+
+    def on_exception(self, exception, driver):
+        # Drop the half-open operation; the failure itself is reported by the test
+        self.timer._started.clear()
+
+
+class TimedWebDriverWait(WebDriverWait):
+    """WebDriverWait whose polls count as one 'wait' operation"""
+
+    def __init__(self, driver, timeout, timer, **kwargs):
+        super().__init__(driver, timeout, **kwargs)
+        self.timer = timer
+
+    def until(self, method, message=''):
+        with self.timer.measure('wait'):
+            return super().until(method, message)
+
+    def until_not(self, method, message=''):
+        with self.timer.measure('wait'):
+            return super().until_not(method, message)
+
+
+def summary_lines(totals_by_test):
+    """Terminal table of StepTimer.finish() totals per test, slowest first"""
+    lines = [f"{'test':<45}" + ''.join(f'{kind:>11}' for kind in KINDS) + f"{'total':>9}"]
+    for nodeid, totals in sorted(totals_by_test.items(), key=lambda item: (-item[1]['seconds'], item[0])):
+        lines.append(f"{nodeid.rsplit('::', 1)[-1]:<45}" + ''.join(f'{totals[kind]:>11.2f}' for kind in KINDS)
+                     + f"{totals['seconds']:>9.2f}")
+    return lines
+
+
+def timed_step(name=None):
+    """Decorator for test-class helpers: run the method as its own step (uses self.timer)"""
+    def decorator(method):
+        step_name = name or method.__name__
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.timer.step(step_name):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
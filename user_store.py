@@ -0,0 +1,281 @@
+"""
+User account storage for the Selenium testing demo.
+
+Passwords are stored as salted hashes. Two backends share the UserStore
+interface: an in-memory store for demos and tests, and a SQLite store with
+a small connection pool for larger account sets. Both keep maintained
+counters so the dashboard and health endpoint never scan every account:
+in memory for the in-memory store, and in a table updated by triggers for
+SQLite, so every process sharing the database reads the same numbers.
+
+Unknown usernames are checked against a dummy hash, so a failed login
+takes as long whether or not the account exists.
+"""
+import functools
+import hashlib
+import hmac
+import os
+import queue
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+PROFILE_FIELDS = ('role', 'name', 'email', 'last_login')
+
+
+@functools.lru_cache(maxsize=None)
+def dummy_password_hash():
+    """Hash of a random password, made with the same method as real accounts"""
+    return generate_password_hash(os.urandom(16).hex())
+
+
+class VerificationCache:
+    """LRU of recently verified credentials.
+
+    Hash checks are deliberately slow, so repeat logins for the same
+    account skip the hash when the (stored hash, password) pair was already
+    verified. Entries are HMAC digests keyed with a per-process secret, so
+    no plaintext password is ever held in memory.
+    """
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._key = os.urandom(32)
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def _digest(self, password_hash, password):
+        message = f'{password_hash}\0{password}'.encode('utf-8')
+        return hmac.new(self._key, message, hashlib.sha256).digest()
+
+    def check(self, password_hash, password):
+        """Verify password against password_hash, using the cache when possible"""
+        digest = self._digest(password_hash, password)
+        with self._lock:
+            if digest in self._entries:
+                self._entries.move_to_end(digest)
+                return True
+        if not check_password_hash(password_hash, password):
+            return False
+        with self._lock:
+            self._entries[digest] = True
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return True
+
+
+class UserStore(ABC):
+    """Interface shared by all user store backends"""
+
+    def __init__(self, cache_size=1024):
+        self._verifier = VerificationCache(cache_size)
+        self._lock = threading.Lock()
+        self._total = 0
+        self._online = 0
+
+    @abstractmethod
+    def get(self, username):
+        """Return the public profile for username, or None"""
+
+    @abstractmethod
+    def add(self, username, password, role, name, email):
+        """Create an account; returns False if username already exists"""
+
+    @abstractmethod
+    def record_login(self, username, when):
+        """Record a successful login timestamp for username"""
+
+    @abstractmethod
+    def _password_hash(self, username):
+        """Stored password hash for username, or None"""
+
+    def verify(self, username, password):
+        """Return the profile when the credentials are valid, otherwise None"""
+        password_hash = self._password_hash(username)
+        if password_hash is None:
+            # Spend the same hashing time as a wrong password, so timing does not reveal the account
+            check_password_hash(dummy_password_hash(), password)
+            return None
+        if not self._verifier.check(password_hash, password):
+            return None
+        return self.get(username)
+
+    def seed(self, users):
+        """Add accounts from a {username: {'password': ..., ...}} mapping if missing"""
+        for username, data in users.items():
+            if username not in self:
+                self.add(username, data['password'], data['role'], data['name'], data['email'])
+
+    def online_count(self):
+        """Number of users that have logged in at least once (O(1))"""
+        return self._online
+
+    def __len__(self):
+        return self._total
+
+    def __contains__(self, username):
+        return self.get(username) is not None
+
+
+class InMemoryUserStore(UserStore):
+    """Dictionary-backed user store"""
+
+    def __init__(self, cache_size=1024):
+        super().__init__(cache_size)
+        self._users = {}
+
+    def get(self, username):
+        record = self._users.get(username)
+        if record is None:
+            return None
+        return {field: record[field] for field in PROFILE_FIELDS}
+
+    def _password_hash(self, username):
+        record = self._users.get(username)
+        return record['password_hash'] if record else None
+
+    def add(self, username, password, role, name, email):
+        record = {
+            'password_hash': generate_password_hash(password),
+            'role': role,
+            'name': name,
+            'email': email,
+            'last_login': None
+        }
+        with self._lock:
+            if username in self._users:
+                return False
+            self._users[username] = record
+            self._total += 1
+        return True
+
+    def record_login(self, username, when):
+        with self._lock:
+            record = self._users.get(username)
+            if record is None:
+                return
+            if record['last_login'] is None:
+                self._online += 1
+            record['last_login'] = when
+
+
+class SQLiteUserStore(UserStore):
+    """SQLite-backed user store with a fixed-size connection pool"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS users (
+            username TEXT PRIMARY KEY,
+            password_hash TEXT NOT NULL,
+            role TEXT NOT NULL,
+            name TEXT NOT NULL,
+            email TEXT NOT NULL,
+            last_login TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_users_last_login ON users (last_login);
+        CREATE TABLE IF NOT EXISTS user_counters (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        );
+        -- Counted from the existing rows the first time (databases created before the counters)
+        INSERT OR IGNORE INTO user_counters SELECT 'total', COUNT(*) FROM users;
+        INSERT OR IGNORE INTO user_counters
+            SELECT 'online', COUNT(*) FROM users WHERE last_login IS NOT NULL;
+        -- Maintained in the same statement as the change, whichever process makes it
+        CREATE TRIGGER IF NOT EXISTS users_count_insert AFTER INSERT ON users BEGIN
+            UPDATE user_counters SET value = value + 1 WHERE name = 'total';
+            UPDATE user_counters SET value = value + 1
+                WHERE name = 'online' AND new.last_login IS NOT NULL;
+        END;
+        CREATE TRIGGER IF NOT EXISTS users_count_delete AFTER DELETE ON users BEGIN
+            UPDATE user_counters SET value = value - 1 WHERE name = 'total';
+            UPDATE user_counters SET value = value - 1
+                WHERE name = 'online' AND old.last_login IS NOT NULL;
+        END;
+        CREATE TRIGGER IF NOT EXISTS users_count_first_login AFTER UPDATE OF last_login ON users
+        WHEN old.last_login IS NULL AND new.last_login IS NOT NULL BEGIN
+            UPDATE user_counters SET value = value + 1 WHERE name = 'online';
+        END;
+    """
+
+    def __init__(self, path, pool_size=4, cache_size=1024):
+        super().__init__(cache_size)
+        self.path = path
+        self._pool = queue.Queue()
+        for _ in range(pool_size):
+            conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._pool.put(conn)
+
+        with self._connection() as conn:
+            # One transaction, so no process can insert between the initial count and the triggers
+            try:
+                conn.executescript(f'BEGIN IMMEDIATE; {self.SCHEMA} COMMIT;')
+            except Exception:
+                if conn.in_transaction:
+                    conn.execute('ROLLBACK')
+                raise
+
+    @contextmanager
+    def _connection(self):
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def get(self, username):
+        with self._connection() as conn:
+            row = conn.execute(
+                'SELECT role, name, email, last_login FROM users WHERE username = ?',
+                (username,)
+            ).fetchone()
+        return dict(zip(PROFILE_FIELDS, row)) if row else None
+
+    def _counter(self, name):
+        with self._connection() as conn:
+            return conn.execute('SELECT value FROM user_counters WHERE name = ?', (name,)).fetchone()[0]
+
+    def online_count(self):
+        """Number of users that have logged in at least once (one primary-key lookup)"""
+        return self._counter('online')
+
+    def __len__(self):
+        return self._counter('total')
+
+    def _password_hash(self, username):
+        with self._connection() as conn:
+            row = conn.execute(
+                'SELECT password_hash FROM users WHERE username = ?', (username,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def add(self, username, password, role, name, email):
+        password_hash = generate_password_hash(password)
+        with self._connection() as conn:
+            cursor = conn.execute(
+                'INSERT OR IGNORE INTO users (username, password_hash, role, name, email) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (username, password_hash, role, name, email)
+            )
+        return cursor.rowcount == 1
+
+    def record_login(self, username, when):
+        with self._connection() as conn:
+            conn.execute('UPDATE users SET last_login = ? WHERE username = ?', (when, username))
+
+    def close(self):
+        """Close every pooled connection"""
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
+
+
+def create_user_store(path=None, **kwargs):
+    """Build a SQLite store when a database path is given, else an in-memory store"""
+    if path:
+        return SQLiteUserStore(path, **kwargs)
+    return InMemoryUserStore(**kwargs)
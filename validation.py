@@ -0,0 +1,86 @@
+"""
+Declarative form validation for the Selenium testing demo.
+
+Forms are declared once at import time. Each Field turns its options into a
+tuple of (check, code) rules up front, so checking a request is a single
+pass over the submitted values calling prebuilt functions. Errors are flash
+message codes (texts live in flashes.MESSAGES), so rewording a message
+never touches the rules.
+"""
+
+
+def email_is_valid(email):
+    """Single-pass email check (local part, '@', dotted domain of 4+ chars)"""
+    local, at, rest = email.partition('@')
+    if not at or not local:
+        return False
+    domain = rest.partition('@')[0]
+    last_segment = rest.rpartition('@')[2]
+    return '.' in last_segment and len(domain) >= 4
+
+
+class Field:
+    """A single form field and the rules it must satisfy"""
+
+    def __init__(self, name, min_length=0, code=None, required_code=None,
+                 email=False, email_code=None):
+        self.name = name
+        self.min_length = min_length
+        self.code = code
+        self.required_code = required_code
+        self.email = email
+        self.email_code = email_code
+        self.rules = self._rules()
+
+    def _rules(self):
+        """(failure check, error code) pairs, checked in order until one fails"""
+        rules = []
+        if self.required_code:
+            rules.append((is_blank, self.required_code))
+        if self.min_length:
+            min_length = self.min_length
+            rules.append((lambda value: len(value) < min_length, self.code))
+        if self.email:
+            rules.append((lambda value: not email_is_valid(value), self.email_code))
+        return tuple(rules)
+
+
+def is_blank(value):
+    return not value
+
+
+class Form:
+    """An ordered set of fields validated together"""
+
+    def __init__(self, *fields):
+        self.fields = fields
+        # Flattened once: (field name, rules) for a single pass per request
+        self._checks = tuple((field.name, field.rules) for field in fields)
+
+    def validate(self, form):
+        """Return (cleaned_data, error codes) for the submitted form"""
+        get = form.get
+        data = {}
+        errors = []
+        for name, rules in self._checks:
+            value = data[name] = get(name, '').strip()
+            for failed, code in rules:
+                if failed(value):
+                    # Fields sharing a code report it only once
+                    if code not in errors:
+                        errors.append(code)
+                    break
+        return data, errors
+
+
+CONTACT_FORM = Form(
+    Field('name', min_length=2, code='name_short'),
+    Field('email', required_code='email_required', email=True, email_code='email_invalid'),
+    Field('subject', min_length=5, code='subject_short'),
+    Field('message', min_length=10, code='message_short')
+)
+
+LOGIN_FORM = Form(
+    Field('username', min_length=1, code='credentials_missing'),
+    Field('password', min_length=1, code='credentials_missing')
+)
@@ -0,0 +1,106 @@
+"""
+View decisions shared by the WSGI (app.py) and ASGI (asgi.py) apps.
+
+Each app keeps its own thin views for I/O, awaiting and rendering; what a
+request means (whether a login may be tried, what a contact submission
+turns into, which inbox filters apply, who may see a page) is decided here
+once, so the two variants cannot drift apart.
+"""
+from datetime import datetime
+
+from validation import CONTACT_FORM
+
+
+def timestamp():
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+def health_payload(users_online):
+    """Health payload, rebuilt in the background by the health monitor"""
+    return {
+        'status': 'healthy',
+        'timestamp': datetime.now().isoformat(),
+        'version': '2.0.0',
+        'users_online': users_online
+    }
+
+
+def login_retry_after(username, address, user_throttle, ip_throttle):
+    """Seconds a login attempt must wait before it is even checked (0: go ahead)"""
+    return max(user_throttle.retry_after(username), ip_throttle.retry_after(address))
+
+
+def login_failed(username, address, user_throttle, ip_throttle):
+    """Count a failed login; returns the backoff it earned (0: none yet)"""
+    return max(user_throttle.record_failure(username), ip_throttle.record_failure(address))
+
+
+def start_session(session, username, user):
+    """Log username in (clearing first rotates a server-side session id)"""
+    session.clear()
+    session['username'] = username
+    session['user_role'] = user['role']
+    session['user_name'] = user['name']
+    session['login_time'] = timestamp()
+
+
+def dashboard_context(session, user_data, total_users):
+    return {
+        'total_users': total_users,
+        'user_role': session.get('user_role', 'User'),
+        'login_time': session.get('login_time', 'Unknown'),
+        'last_login': user_data.get('last_login', 'First login'),
+        'session_duration': 'Active'
+    }
+
+
+def contact_client(session, address):
+    """Rate-limit key for a contact submission: the logged-in user, else the client
+    address (throttle.client_ip, so clients behind a trusted proxy are told apart)"""
+    return f"user:{session['username']}" if 'username' in session else f'ip:{address}'
+
+
+def contact_submission(form, guard, session):
+    """Decide a contact POST (after its rate-limit token) as (outcome, detail):
+
+        ('invalid', errors)      re-render the form with the errors
+        ('duplicate', data)      acknowledge without storing
+        ('accepted', record)     store record
+    """
+    data, errors = CONTACT_FORM.validate(form)
+    if errors:
+        return 'invalid', errors
+    if guard.is_duplicate(data['email'], data['subject'], data['message']):
+        return 'duplicate', data
+    return 'accepted', dict(data, timestamp=timestamp(), user=session.get('username', 'Anonymous'))
+
+
+# Query-string filters accepted by the contact inbox (HTML and JSON)
+INBOX_FILTERS = ('q', 'user', 'since', 'until', 'before')
+INBOX_PAGE_SIZE = 25
+INBOX_MAX_PAGE_SIZE = 100
+
+
+def is_admin(session):
+    return session.get('user_role') == 'Administrator'
+
+
+def inbox_query(args):
+    """(filters to echo back, ContactMessageStore.page() arguments) from the query string"""
+    filters = {name: args[name].strip() for name in INBOX_FILTERS if args.get(name, '').strip()}
+    before = args.get('before', type=int)
+    if before is None:
+        filters.pop('before', None)
+    limit = min(max(args.get('limit', INBOX_PAGE_SIZE, type=int), 1), INBOX_MAX_PAGE_SIZE)
+    page_args = {
+        'limit': limit, 'before': before, 'user': filters.get('user'),
+        'since': filters.get('since'), 'until': filters.get('until'), 'query': filters.get('q')
+    }
+    return filters, page_args
+
+
+def inbox_links(filters, next_cursor, url_for):
+    """(newest page URL, older page URL or None) keeping the active filters"""
+    newer = {name: value for name, value in filters.items() if name != 'before'}
+    older = url_for('admin_messages', **newer, before=next_cursor) if next_cursor else None
+    return url_for('admin_messages', **newer), older
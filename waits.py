@@ -0,0 +1,147 @@
+"""
+Event-driven wait helpers for the Selenium suite.
+
+The conditions below replace fixed time.sleep() pauses: they return as soon
+as the page reaches the state a test needs (URL changed, new document
+loaded, flash message shown, DOM or network quiet). They query the page
+through JavaScript rather than find_element, so an implicit wait never
+stretches a poll.
+
+A Waiter wraps WebDriverWait and also keeps count of how long each wait
+actually took versus the sleep it replaced; conftest.py reports the
+difference per test case.
+"""
+import time
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+FLASH_SELECTOR = '.flash-success, .flash-error, .flash-info, .flash-warning'
+
+# Records the time of the most recent DOM mutation on the current document
+_TRACK_MUTATIONS = """
+if (!window.__lastMutation) {
+    window.__lastMutation = performance.now();
+    new MutationObserver(function() { window.__lastMutation = performance.now(); })
+        .observe(document, {subtree: true, childList: true, attributes: true, characterData: true});
+}
+return performance.now() - window.__lastMutation;
+"""
+
+# Milliseconds since the last resource finished loading (or since navigation start)
+_NETWORK_QUIET = """
+var entries = performance.getEntriesByType('resource');
+var last = entries.length ? Math.max.apply(null, entries.map(function(e) { return e.responseEnd; })) : 0;
+return performance.now() - last;
+"""
+
+
+def page_loaded(driver):
+    """document.readyState is 'complete'"""
+    return driver.execute_script("return document.readyState") == 'complete'
+
+
+def path_is(base_url, path):
+    """Current URL is base_url + path (with or without a trailing slash for '/')"""
+    expected = {base_url + path}
+    if path == '/':
+        expected.add(base_url)
+
+    def condition(driver):
+        return driver.current_url.split('?')[0] in expected
+    return condition
+
+
+def flash_appeared(category=None):
+    """A flash message (optionally of one category) is in the page; returns the element"""
+    selector = f'.flash-{category}' if category else FLASH_SELECTOR
+
+    def condition(driver):
+        if not page_loaded(driver):
+            return False
+        return driver.execute_script("return document.querySelector(arguments[0])", selector) or False
+    return condition
+
+
+def dom_stable(quiet=0.2):
+    """Page loaded and no DOM mutations for `quiet` seconds"""
+    def condition(driver):
+        return page_loaded(driver) and driver.execute_script(_TRACK_MUTATIONS) >= quiet * 1000
+    return condition
+
+
+def network_idle(quiet=0.3):
+    """Page loaded and no resource has finished loading for `quiet` seconds"""
+    def condition(driver):
+        return page_loaded(driver) and driver.execute_script(_NETWORK_QUIET) >= quiet * 1000
+    return condition
+
+
+def new_page_loaded(old_html):
+    """The document that owned old_html was replaced and the new one finished loading"""
+    staleness = EC.staleness_of(old_html)
+
+    def condition(driver):
+        return staleness(driver) and page_loaded(driver)
+    return condition
+
+
+class Waiter:
+    """WebDriverWait front-end that tracks time waited vs the sleeps it replaces"""
+
+    def __init__(self, driver, timeout=15, poll_frequency=0.05, timer=None):
+        self.driver = driver
+        self.timer = timer  # optional timing.StepTimer; waits are recorded as 'wait' operations
+        self.timeout = timeout
+        self.poll_frequency = poll_frequency
+        self.waited = 0.0
+        self.replaced = 0.0
+
+    @property
+    def saved(self):
+        return self.replaced - self.waited
+
+    def _account(self, started, replaces):
+        self.waited += time.perf_counter() - started
+        self.replaced += replaces
+
+    def until(self, condition, replaces=0, timeout=None, message=''):
+        """Wait for condition; `replaces` is the fixed sleep this wait stands in for"""
+        started = time.perf_counter()
+        try:
+            wait = WebDriverWait(self.driver, timeout or self.timeout, poll_frequency=self.poll_frequency)
+            if self.timer is None:
+                return wait.until(condition, message)
+            with self.timer.measure('wait'):
+                return wait.until(condition, message)
+        finally:
+            self._account(started, replaces)
+
+    def settle(self, replaces=0, quiet=0.2):
+        """Wait for the current page to finish loading and stop changing"""
+        return self.until(dom_stable(quiet), replaces, message='page did not settle')
+
+    def click_and_wait(self, element, replaces=0):
+        """Click element and wait for the page load it triggers.
+
+        Returns False without waiting when the click is a submit that the
+        browser's own form validation will block (no request is sent).
+        """
+        will_submit = self.driver.execute_script(
+            "var form = arguments[0].form; return !form || form.checkValidity();",
+            getattr(element, 'wrapped_element', element)  # unwrap EventFiringWebElement
+        )
+        old_html = self.driver.find_element(By.TAG_NAME, 'html')
+        element.click()
+        if not will_submit:
+            self._account(time.perf_counter(), replaces)
+            return False
+        self.until(new_page_loaded(old_html), replaces, message='no page load after click')
+        return True
+
+    def navigate(self, action, replaces=0):
+        """Run a navigation callable (e.g. driver.back) and wait for the new document"""
+        old_html = self.driver.find_element(By.TAG_NAME, 'html')
+        action()
+        return self.until(new_page_loaded(old_html), replaces, message='navigation did not load a page')
@@ -0,0 +1,80 @@
+"""
+Template precompilation and startup warm-up for the Selenium testing demo.
+
+By default Jinja compiles each template on its first render, and with
+auto-reload on (debug mode) it stats the source file on every render. In
+production (serve.py without --dev) workers instead:
+
+  * compile every template at boot, optionally loading/storing the compiled
+    bytecode in an on-disk cache so later workers skip the compile step,
+  * turn off auto-reload, so renders never touch the filesystem (templates
+    change only with a SIGHUP reload, which builds fresh workers), and
+  * GET every parameterless route once before accepting traffic, so the
+    first real visitor does not pay for lazy imports, url_for adapters,
+    render-cache fills or compressor setup.
+"""
+import os
+import time
+
+from jinja2 import FileSystemBytecodeCache
+
+
+class TemplatePrecompiler:
+    """Compiles all templates at startup and disables per-render mtime checks"""
+
+    def __init__(self, app=None, cache_dir=None):
+        self.cache_dir = cache_dir
+        self.compiled = []
+        self.seconds = 0.0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        # Kept False even if debug is switched on later (Flask only re-enables it when None)
+        app.config['TEMPLATES_AUTO_RELOAD'] = False
+        env = app.jinja_env
+        env.auto_reload = False
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            env.bytecode_cache = FileSystemBytecodeCache(self.cache_dir)
+        self.compile_all(env)
+
+    def compile_all(self, env):
+        """Load every template into the environment's cache; returns their names"""
+        started = time.perf_counter()
+        names = env.list_templates()
+        capacity = getattr(env.cache, 'capacity', None)
+        if capacity is not None and len(names) > capacity:
+            print(f"⚠️ {len(names)} templates exceed the Jinja cache size ({capacity})")
+        for name in names:
+            env.get_template(name)
+        self.compiled = names
+        self.seconds = time.perf_counter() - started
+        return names
+
+
+def warm_up_paths(app):
+    """Paths of every GET route that takes no URL arguments (static files excluded)"""
+    paths = []
+    for rule in app.url_map.iter_rules():
+        if rule.endpoint == 'static' or rule.arguments or 'GET' not in rule.methods:
+            continue
+        paths.append(rule.rule)
+    return sorted(paths)
+
+
+def warm_up(app, paths=None):
+    """Request each path once through the test client; returns {path: (status, seconds)}
+
+    Redirects are followed so a flash set by e.g. /dashboard is consumed
+    straight away instead of bypassing the render cache for the next path.
+    """
+    client = app.test_client()
+    results = {}
+    for path in paths if paths is not None else warm_up_paths(app):
+        started = time.perf_counter()
+        response = client.get(path, headers={'Accept-Encoding': 'gzip, br'}, follow_redirects=True)
+        response.close()
+        status = response.history[0].status_code if response.history else response.status_code
+        results[path] = (status, time.perf_counter() - started)
+    return results